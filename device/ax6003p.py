@@ -1,6 +1,12 @@
 import pyvisa
+import threading
 import time
 
+from device.status import decode_status
+
+MEAS_QUERIES = ("MEAS:VOLT?", "MEAS:CURR?", "MEAS:POW?")
+STATUS_QUERIES = ("STAT:OPER:COND?", "STAT:QUES:COND?")
+
 class AX6003PDevice:
     def __init__(
         self, 
@@ -19,6 +25,12 @@ class AX6003PDevice:
         self.data_bits = data_bits
         self.instrument = None
         self.connected = False
+        # serialises instrument I/O between the Tk thread and worker threads (sequencer)
+        self.io_lock = threading.RLock()
+        self._compound_meas = None  # None = untested, else whether "MEAS:...?;..." works
+        self._status_supported = None  # same for the STAT:...:COND? registers
+        # last state written to / read back from the instrument ("VOLT", "CURR", "OUTP" -> value text)
+        self._shadow = {}
         self._connect()
 
     def _connect(self):
@@ -45,6 +57,9 @@ class AX6003PDevice:
                 self.instrument.data_bits = int(self.data_bits)
 
             self.connected = True
+            self._compound_meas = None
+            self._status_supported = None
+            self._shadow = {}
         except Exception as e:
             self.instrument = None
             self.connected = False
@@ -79,75 +94,207 @@ class AX6003PDevice:
             self.connected = False
             return False
 
+    def _require(self, action):
+        """Cheap guard for commands: no *IDN? round trip, a failing write raises anyway."""
+        if not self.instrument:
+            raise RuntimeError(f"Cannot {action} — device not connected.")
+
     # ------------------- Core I/O -------------------
     def query(self, cmd):
         if not self.instrument:
             raise RuntimeError("Device not connected.")
         try:
-            return self.instrument.query(cmd)
+            with self.io_lock:
+                return self.instrument.query(cmd)
         except Exception as e:
+            self._shadow = {}  # the device may have reset or been replaced
             raise RuntimeError(f"Query failed: {cmd} — {e}")
 
     def write(self, cmd):
+        """Raw SCPI write. Commands that may change the output state drop the shadow."""
+        head = cmd.strip().lstrip(":").upper()
+        if head.startswith(("*RST", "*RCL", "SYST", "VOLT", "CURR", "OUTP", "APPL", "SOUR")):
+            self._shadow = {}
+        self._write(cmd)
+
+    def _write(self, cmd):
         if not self.instrument:
             raise RuntimeError("Device not connected.")
         try:
-            self.instrument.write(cmd)
+            with self.io_lock:
+                self.instrument.write(cmd)
         except Exception as e:
+            self._shadow = {}
             raise RuntimeError(f"Write failed: {cmd} — {e}")
 
+    # ------------------- State shadow -------------------
+    def _set_state(self, key, value, force=False):
+        """Write `key value` unless the shadow says the instrument already has it (or `force`)."""
+        with self.io_lock:
+            if not force and self._shadow.get(key) == value:
+                return False
+            self._shadow.pop(key, None)   # unknown until the write went through
+            self._write(f"{key} {value}")
+            self._shadow[key] = value
+            return True
+
+    def invalidate_shadow(self):
+        """Forget the shadowed state (after *RST, reconnect or a front-panel change)."""
+        self._shadow = {}
+
+    def verify_shadow(self):
+        """
+        Read the shadowed settings back and drop those the instrument no
+        longer has (external change). Returns the keys that differed.
+        """
+        changed = []
+        with self.io_lock:
+            for key, value in list(self._shadow.items()):
+                actual = self.query(f"{key}?").strip()
+                if key == "OUTP":
+                    same = (actual in ("1", "ON")) == (value == "ON")
+                else:
+                    try:
+                        same = abs(float(actual) - float(value)) < 1e-4
+                    except ValueError:
+                        same = False
+                if not same:
+                    self._shadow.pop(key, None)
+                    changed.append(key)
+        return changed
+
     # ------------------- Measurements -------------------
     def read_voltage(self):
-        if not self.is_connected():
-            raise RuntimeError("Device not reachable for voltage measurement.")
+        self._require("measure voltage")
         msg=float(self.query("MEAS:VOLT?"))
         return float(f"{msg:.5g}")
         
 
     def read_current(self):
-        if not self.is_connected():
-            raise RuntimeError("Device not reachable for current measurement.")
+        self._require("measure current")
         msg=float(self.query("MEAS:CURR?"))
         return float(f"{msg:.5g}")
 
     def read_power(self):
-        if not self.is_connected():
-            raise RuntimeError("Device not reachable for power measurement.")
+        self._require("measure power")
         msg=float(self.query("MEAS:POW?"))
         return float(f"{msg:.5g}")
+
+    def _batched_query(self, cmds):
+        """
+        Answers to several queries, in one compound SCPI round trip
+        ("A?;:B?") when the instrument accepts it, else one by one.
+        """
+        with self.io_lock:
+            if self._compound_meas is not False:
+                try:
+                    answers = self.query(";:".join(cmds)).strip().split(";")
+                    if len(answers) == len(cmds):
+                        self._compound_meas = True
+                        return answers
+                except RuntimeError:
+                    if self._compound_meas:
+                        raise
+                # not supported: clear any half-answer / error and stop trying
+                self._compound_meas = False
+                try:
+                    self._write("*CLS")
+                except RuntimeError:
+                    pass
+            return [self.query(cmd) for cmd in cmds]
+
+    def read_all(self):
+        """
+        (voltage, current, power) in one round trip when the instrument
+        accepts a compound SCPI query, else three queries. No *IDN? guard:
+        a failed query raises, so the caller still learns of a lost device.
+        """
+        self._require("measure")
+        return tuple(float(f"{float(x):.5g}") for x in self._batched_query(MEAS_QUERIES))
+
+    def read_all_with_status(self):
+        """
+        (voltage, current, power, operation, questionable) with the status
+        condition registers in the same batch as the measurements. The
+        registers are None when the instrument does not implement them.
+        """
+        self._require("measure")
+        if self._status_supported is False:
+            return (*self.read_all(), None, None)
+        with self.io_lock:
+            try:
+                answers = self._batched_query(MEAS_QUERIES + STATUS_QUERIES)
+                v, i, p = (float(f"{float(x):.5g}") for x in answers[:3])
+                oper, ques = (int(float(x)) for x in answers[3:])
+                self._status_supported = True
+                # output dropped by the instrument (front panel, hardware OVP/OCP/OTP):
+                # the shadowed "ON" is stale and must not elide the next OUTP ON
+                if self._shadow.get("OUTP") == "ON":
+                    mode, faults = decode_status(oper, ques)
+                    if mode == "OFF" or faults:
+                        self._shadow.pop("OUTP", None)
+                return v, i, p, oper, ques
+            except (RuntimeError, ValueError):
+                if self._status_supported:
+                    raise
+                # no status registers: measure without them from now on
+                self._status_supported = False
+                self._compound_meas = None
+                try:
+                    self._write("*CLS")
+                except RuntimeError:
+                    pass
+            return (*self.read_all(), None, None)
+
+    def read_status_bytes(self):
+        """(STB, ESR) in one batch. Reading *ESR? clears it on the instrument."""
+        self._require("read status")
+        stb, esr = self._batched_query(("*STB?", "*ESR?"))
+        return int(float(stb)), int(float(esr))
+
+    def read_errors(self, limit=10):
+        """Drain up to `limit` entries of the error queue as (code, message) tuples."""
+        self._require("read errors")
+        errors = []
+        with self.io_lock:
+            for _ in range(limit):
+                code, _, message = self.query("SYST:ERR?").strip().partition(",")
+                if int(code) == 0:
+                    break
+                errors.append((int(code), message.strip().strip('"')))
+        return errors
+
     # ------------------- Control -------------------
-    def set_output(self, state: bool):
-        if not self.is_connected():
-            raise RuntimeError("Cannot set output — device not connected.")
-        self.write("OUTP ON" if state else "OUTP OFF")
+    def set_output(self, state: bool, force=False):
+        self._require("set output")
+        self._set_state("OUTP", "ON" if state else "OFF", force)
 
     def get_id(self):
         return self.query("*IDN?")
 
     def is_output_on(self):
-        if not self.is_connected():
+        if not self.instrument:
             return False
-        return self.query("OUTP?").strip() == '1'
+        if "OUTP" not in self._shadow:
+            self._shadow["OUTP"] = "ON" if self.query("OUTP?").strip() in ("1", "ON") else "OFF"
+        return self._shadow["OUTP"] == "ON"
 
-    def set_voltage(self, voltage: float):
-        if not self.is_connected():
-            raise RuntimeError("Cannot set voltage — device not connected.")
-        self.write(f"VOLT {voltage:6.4f}")
+    def set_voltage(self, voltage: float, force=False):
+        self._require("set voltage")
+        self._set_state("VOLT", f"{voltage:6.4f}".strip(), force)
 
-    def set_current(self, current: float):
-        if not self.is_connected():
-            raise RuntimeError("Cannot set current — device not connected.")
-        self.write(f"CURR {current:5.4f}")
+    def set_current(self, current: float, force=False):
+        self._require("set current")
+        self._set_state("CURR", f"{current:5.4f}".strip(), force)
 
         # ------------------- Device Control -------------------
     def clear(self):
         """Clear the device status (*CLS)."""
-        if not self.is_connected():
-            raise RuntimeError("Cannot clear — device not connected.")
-        self.write("*CLS")
+        self._require("clear")
+        self._write("*CLS")
 
     def reset(self):
         """Reset the device (*RST)."""
-        if not self.is_connected():
-            raise RuntimeError("Cannot reset — device not connected.")
-        self.write("*RST")
+        self._require("reset")
+        self.invalidate_shadow()
+        self._write("*RST")
@@ -0,0 +1,145 @@
+# device/discovery.py
+"""
+Port discovery: list serial / VISA resources and find out which of them
+answers *IDN? (and at which baud rate), probing all ports in parallel.
+
+Both the port list and the probe results are cached for a few seconds,
+so pressing refresh repeatedly or reopening the config page does not go
+back to the bus. One pyvisa ResourceManager is shared (creating one is
+the slow part of listing resources).
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pyvisa
+import serial.tools.list_ports
+
+CACHE_SECONDS = 10.0
+PROBE_TIMEOUT_MS = 300
+# most likely rates first; the configured rate is tried before all of them
+LIKELY_BAUD_RATES = (19200, 9600, 115200, 38400, 57600, 14400, 28800)
+
+_lock = threading.Lock()
+_rm = None
+_ports_cache = (0.0, [])      # (monotonic time, [address])
+_probe_cache = {}             # address -> (monotonic time, (baud, idn) or None)
+
+
+def resource_manager():
+    """The shared pyvisa ResourceManager, created on first use."""
+    global _rm
+    with _lock:
+        if _rm is None:
+            _rm = pyvisa.ResourceManager()
+        return _rm
+
+
+def serial_resource(port):
+    """VISA resource name of an OS serial port ("COM3", "/dev/ttyUSB0")."""
+    if port.upper().startswith("COM") and port[3:].isdigit():
+        return f"ASRL{port[3:]}::INSTR"
+    return f"ASRL{port}::INSTR"
+
+
+def resource_name(address):
+    """`address` as list_ports() reports it: OS serial port names become ASRL resources."""
+    address = address.strip()
+    if "::" in address:
+        return address
+    return serial_resource(address)
+
+
+def list_ports(max_age=CACHE_SECONDS):
+    """Serial ports and VISA resources as VISA addresses, cached for `max_age` s."""
+    global _ports_cache
+    stamp, ports = _ports_cache
+    if time.monotonic() - stamp < max_age:
+        return list(ports)
+    found = {serial_resource(p.device) for p in serial.tools.list_ports.comports()}
+    try:
+        found.update(resource_manager().list_resources())
+    except Exception as e:
+        print(f"[WARN] Could not list VISA resources: {e}")
+    ports = sorted(found)
+    _ports_cache = (time.monotonic(), ports)
+    return list(ports)
+
+
+def parse_idn(idn):
+    """'Manufacturer Model' from an *IDN? answer (the answer itself if not comma separated)."""
+    fields = [f.strip() for f in idn.split(",")]
+    return " ".join(fields[:2]) if len(fields) >= 2 else idn.strip()
+
+
+def probe(address, baud_rates=LIKELY_BAUD_RATES, timeout_ms=PROBE_TIMEOUT_MS):
+    """
+    (baud, idn) of the first baud rate at which `address` answers *IDN?,
+    or None. Non-serial resources are asked once (baud None).
+    """
+    is_serial = address.upper().startswith("ASRL")
+    try:
+        inst = resource_manager().open_resource(address)
+    except Exception:
+        return None
+    try:
+        inst.timeout = timeout_ms
+        inst.read_termination = "\n"
+        inst.write_termination = "\n"
+        for baud in (baud_rates if is_serial else (None,)):
+            try:
+                if baud is not None:
+                    inst.baud_rate = baud
+                    inst.clear()  # drop what a wrong rate left in the buffers
+                idn = inst.query("*IDN?").strip()
+            except Exception:
+                continue
+            if idn and idn.isprintable():
+                return baud, idn
+        return None
+    finally:
+        try:
+            inst.close()
+        except Exception:
+            pass
+
+
+def discover(preferred_baud=None, skip=(), max_age=CACHE_SECONDS, max_workers=8):
+    """
+    {address: (baud, idn) or None} for every port, probing the ports in
+    parallel. `preferred_baud` is tried first; addresses in `skip` (e.g.
+    the one the app is connected to, as VISA resource or OS port name)
+    are listed but not opened.
+    """
+    skip = {resource_name(a) for a in skip}
+    baud_rates = list(LIKELY_BAUD_RATES)
+    if preferred_baud in baud_rates:
+        baud_rates.remove(preferred_baud)
+    if preferred_baud:
+        baud_rates.insert(0, preferred_baud)
+
+    now = time.monotonic()
+    results = {}
+    to_probe = []
+    for address in list_ports(max_age):
+        cached = _probe_cache.get(address)
+        if address in skip:
+            results[address] = None
+        elif cached is not None and now - cached[0] < max_age:
+            results[address] = cached[1]
+        else:
+            to_probe.append(address)
+
+    if to_probe:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(to_probe))) as pool:
+            for address, found in zip(to_probe, pool.map(lambda a: probe(a, baud_rates), to_probe)):
+                results[address] = found
+                _probe_cache[address] = (time.monotonic(), found)
+    return results
+
+
+def invalidate():
+    """Forget cached ports and probe results (next discover() goes to the bus)."""
+    global _ports_cache
+    _ports_cache = (0.0, [])
+    _probe_cache.clear()
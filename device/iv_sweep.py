@@ -0,0 +1,136 @@
+# device/iv_sweep.py
+import threading
+import time
+
+import numpy as np
+
+# columns of the result table
+COLUMNS = ("setpoint", "voltage", "current", "power", "settle_s", "reads")
+COMPLIANCE_MARGIN = 0.99  # current within 1 % of the compliance counts as limited
+
+
+def sweep_points(start, stop, step):
+    """Setpoints from start to stop (inclusive) in steps of |step|."""
+    start, stop, step = float(start), float(stop), float(step)
+    if step == 0:
+        raise ValueError("Step must not be zero")
+    n = int(np.floor(abs(stop - start) / abs(step) + 1e-9))
+    points = start + np.sign(stop - start or 1) * abs(step) * np.arange(n + 1)
+    if abs(points[-1] - stop) > 1e-9:
+        points = np.append(points, stop)
+    return points
+
+
+class IVSweep:
+    """
+    Voltage-stepped I-V curve tracer on a worker thread.
+
+    For each setpoint the voltage is written and read_all() is repeated
+    until two consecutive readings agree within the tolerances (or
+    `settle_max` s pass). The wait before the first read adapts: it starts
+    at zero and follows the settle time the previous points needed, so a
+    fast DUT runs at about one write plus two read round trips per point.
+    With `compliance` (A) the current limit is set first, and the sweep
+    stops at the first point that runs into it if `stop_at_compliance`.
+
+    Rows (see COLUMNS) are stored in a preallocated NumPy table; on_point
+    (index, row) and on_done(error or None) run on the sweep thread.
+    """
+
+    def __init__(self, device):
+        self.device = device
+        self.table = np.empty((0, len(COLUMNS)))
+        self.count = 0
+        self.compliance_hit = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def results(self):
+        """The measured rows so far (a view of the table)."""
+        return self.table[:self.count]
+
+    def start(self, points, compliance=None, stop_at_compliance=True,
+              tol_v=0.002, tol_i=0.0005, settle_max=2.0, restore=None,
+              on_point=None, on_done=None):
+        if self.running:
+            raise RuntimeError("Sweep already running")
+        points = np.asarray(points, dtype=float)
+        if not len(points):
+            raise ValueError("No sweep points")
+        self.table = np.full((len(points), len(COLUMNS)), np.nan)
+        self.count = 0
+        self.compliance_hit = False
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(points, compliance, stop_at_compliance, tol_v, tol_i, settle_max, restore, on_point, on_done),
+            name="IVSweep", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # ---------- sweep thread ----------
+    def _settle(self, lock, tol_v, tol_i, settle_max, t_write):
+        """Read until two readings agree; returns (v, i, p, settle s, reads)."""
+        # the lock is taken per read, so acquisition (Tk thread) is never held up for long
+        with lock:
+            prev = self.device.read_all()
+        reads = 1
+        while not self._stop.is_set():
+            with lock:
+                cur = self.device.read_all()
+            reads += 1
+            elapsed = time.perf_counter() - t_write
+            if (abs(cur[0] - prev[0]) <= tol_v and abs(cur[1] - prev[1]) <= tol_i) or elapsed >= settle_max:
+                return (*cur, elapsed, reads)
+            prev = cur
+        return (*prev, time.perf_counter() - t_write, reads)
+
+    def _run(self, points, compliance, stop_at_compliance, tol_v, tol_i, settle_max, restore, on_point, on_done):
+        lock = getattr(self.device, "io_lock", None) or threading.RLock()
+        error = None
+        wait = 0.0  # adaptive pre-read delay
+        try:
+            if compliance is not None:
+                with lock:
+                    self.device.set_current(compliance)
+            for k, setpoint in enumerate(points):
+                if self._stop.is_set():
+                    break
+                with lock:
+                    self.device.set_voltage(float(setpoint))
+                t_write = time.perf_counter()
+                if wait > 0 and self._stop.wait(wait):
+                    break
+                v, i, p, settle, reads = self._settle(lock, tol_v, tol_i, settle_max, t_write)
+                # converged on the second read: the delay was long enough, try shorter;
+                # otherwise wait about as long as this point needed
+                wait = wait * 0.5 if reads <= 2 else min(settle, settle_max) * 0.8
+                row = (setpoint, v, i, p, settle, reads)
+                self.table[k] = row
+                self.count = k + 1
+                if on_point:
+                    on_point(k, row)
+                if compliance is not None and i >= compliance * COMPLIANCE_MARGIN:
+                    self.compliance_hit = True
+                    if stop_at_compliance:
+                        break
+        except Exception as e:
+            print(f"[ERROR] I-V sweep stopped: {e}")
+            error = e
+        finally:
+            if restore is not None:
+                try:
+                    with lock:
+                        self.device.set_voltage(restore[0])
+                        self.device.set_current(restore[1])
+                except Exception as e:
+                    print(f"[WARN] Could not restore setpoints after sweep: {e}")
+            if on_done:
+                on_done(error)
@@ -0,0 +1,91 @@
+# device/scpi_script.py
+import threading
+import time
+
+
+def parse_script(text):
+    """
+    Commands of a multi-line SCPI script: one per line, blank lines and
+    `#` comments skipped ("*IDN?" keeps its star, only a leading `#` or
+    one after whitespace starts a comment).
+    """
+    commands = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        cmd, sep, _ = line.partition(" #")
+        commands.append(cmd.strip() if sep else line)
+    return commands
+
+
+def is_query(cmd):
+    """A command that returns an answer (`?` in its header, e.g. *OPC?, MEAS:VOLT?)."""
+    return "?" in cmd.split(None, 1)[0]
+
+
+class ScriptRunner:
+    """
+    Runs a list of SCPI commands on a worker thread.
+
+    Writes go out back-to-back with no read-back in between; the run only
+    synchronises with the instrument at a query (use *OPC? to wait for
+    preceding writes to complete). The I/O lock is held from the first
+    write of a chunk to the query that ends it, so the measurement loop
+    cannot interleave its reads into a pipelined chunk, and is released
+    between chunks.
+
+    on_result(index, cmd, answer or None, seconds, error or None) runs on
+    the worker thread for every command; seconds is the time from sending
+    the command to it being written (writes) or answered (queries).
+    on_done(total seconds) follows the last command or stop().
+    """
+
+    def __init__(self, device):
+        self.device = device
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, commands, on_result=None, on_done=None, stop_on_error=True):
+        if self.running:
+            raise RuntimeError("Script already running")
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(list(commands), on_result, on_done, stop_on_error),
+            name="ScriptRunner", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, commands, on_result, on_done, stop_on_error):
+        lock = getattr(self.device, "io_lock", None) or threading.RLock()
+        started = time.perf_counter()
+        k = 0
+        while k < len(commands) and not self._stop.is_set():
+            # one chunk: consecutive writes plus the query that closes them
+            with lock:
+                while k < len(commands):
+                    cmd = commands[k]
+                    t0 = time.perf_counter()
+                    answer = error = None
+                    try:
+                        if is_query(cmd):
+                            answer = self.device.query(cmd).strip()
+                        else:
+                            self.device.write(cmd)
+                    except Exception as e:
+                        error = e
+                    if on_result:
+                        on_result(k, cmd, answer, time.perf_counter() - t0, error)
+                    k += 1
+                    if error is not None and stop_on_error:
+                        self._stop.set()
+                    if self._stop.is_set() or answer is not None or error is not None:
+                        break
+        if on_done:
+            on_done(time.perf_counter() - started)
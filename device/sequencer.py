@@ -0,0 +1,186 @@
+# device/sequencer.py
+import csv
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# One program entry: at `t` seconds after the start, write the setpoints
+# that are not None (voltage and current None = end marker, nothing written).
+Step = namedtuple("Step", "t voltage current")
+
+SPIN_SECONDS = 0.002  # busy-wait the last part of each wait for sub-ms accuracy
+
+
+# ------------------- Program builders -------------------
+def _program(times, values, channel):
+    if channel not in ("voltage", "current"):
+        raise ValueError(f"Unknown channel: {channel}")
+    return [Step(float(t), float(x), None) if channel == "voltage" else Step(float(t), None, float(x))
+            for t, x in zip(times, values)]
+
+
+def step_program(levels, dwell, channel="voltage"):
+    """Each level held for `dwell` seconds, e.g. [0, 5] for a step response."""
+    steps = _program(np.arange(len(levels)) * dwell, levels, channel)
+    return steps + [Step(len(levels) * dwell, None, None)]
+
+
+def ramp_program(start, stop, duration, interval, channel="voltage"):
+    """Linear ramp from start to stop over `duration` s, updated every `interval` s."""
+    n = max(1, int(round(duration / interval)))
+    return _program(np.linspace(0.0, duration, n + 1), np.linspace(start, stop, n + 1), channel)
+
+
+def staircase_program(start, step, count, dwell, channel="voltage"):
+    """`count` + 1 levels start, start + step, ... each held for `dwell` s."""
+    return step_program([start + k * step for k in range(count + 1)], dwell, channel)
+
+
+def load_waveform_csv(path):
+    """
+    Waveform table from a CSV with a `time` column (s) and a `voltage`
+    and/or `current` column. Empty cells leave that setpoint unchanged.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = [row for row in csv.reader(f) if row and not row[0].lstrip().startswith("#")]
+    if not rows:
+        raise ValueError("Empty waveform file")
+    header = [name.strip().lower() for name in rows[0]]
+    if "time" not in header or not ({"voltage", "current"} & set(header)):
+        raise ValueError("Waveform CSV needs a 'time' column and a 'voltage' and/or 'current' column")
+    cols = {name: header.index(name) for name in ("time", "voltage", "current") if name in header}
+
+    def cell(row, name):
+        k = cols.get(name)
+        if k is None or k >= len(row) or not row[k].strip():
+            return None
+        return float(row[k])
+
+    program = []
+    for line, row in enumerate(rows[1:], start=2):
+        try:
+            program.append(Step(cell(row, "time"), cell(row, "voltage"), cell(row, "current")))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid waveform row {line}: {row}")
+    program.sort(key=lambda s: s.t)
+    return program
+
+
+def program_duration(program):
+    return program[-1].t if program else 0.0
+
+
+def schedule(program, repeat=1):
+    """
+    (index, offset s, step) for every write of `repeat` runs of the
+    program; index counts program steps over all runs. Steps due at the
+    same time - a ramp's last step and the next run's first step, or
+    repeated times in a waveform table - are merged into one write, the
+    later step's values winning.
+    """
+    duration = program_duration(program)
+    pending = None
+    for rep in range(repeat):
+        for k, step in enumerate(program):
+            index, offset = rep * len(program) + k, rep * duration + step.t
+            if pending is not None:
+                if abs(offset - pending[1]) < 1e-9:
+                    prev = pending[2]
+                    step = Step(step.t,
+                                prev.voltage if step.voltage is None else step.voltage,
+                                prev.current if step.current is None else step.current)
+                    offset = pending[1]
+                else:
+                    yield pending
+            pending = (index, offset, step)
+    if pending is not None:
+        yield pending
+
+
+# ------------------- Sequencer -------------------
+class Sequencer:
+    """
+    Host-timed setpoint sequencer on its own thread.
+
+    Every step is scheduled against an absolute deadline (start time +
+    step offset, perf_counter clock), so late steps never push the rest of
+    the program back. The thread sleeps until shortly before a deadline and
+    busy-waits the last SPIN_SECONDS. Each step's writes happen under the
+    device's io_lock, so a voltage/current pair never interleaves with the
+    measurement reads, and the achieved timing error is recorded.
+
+    on_step(index, wall_time, error_s, step) and on_done(error or None) are
+    called on the sequencer thread; GUI users hand them over to Tk.
+    """
+
+    def __init__(self, device):
+        self.device = device
+        self.timing = []        # (step index, deadline offset s, error s)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, program, repeat=1, on_step=None, on_done=None):
+        if self.running:
+            raise RuntimeError("Sequencer already running")
+        if not program:
+            raise ValueError("Empty program")
+        self.timing = []
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(list(program), max(1, int(repeat)), on_step, on_done),
+            name="Sequencer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def timing_summary(self):
+        """dict(steps, mean_ms, max_ms) of the absolute timing errors so far."""
+        errors = np.abs([e for _, _, e in self.timing]) * 1000.0
+        if not len(errors):
+            return dict(steps=0, mean_ms=0.0, max_ms=0.0)
+        return dict(steps=len(errors), mean_ms=float(errors.mean()), max_ms=float(errors.max()))
+
+    # ---------- timing thread ----------
+    def _wait_until(self, deadline):
+        """Sleep (interruptible by stop()) and spin until deadline; False if stopped."""
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return not self._stop.is_set()
+            if remaining > SPIN_SECONDS:
+                if self._stop.wait(remaining - SPIN_SECONDS):
+                    return False
+            elif self._stop.is_set():
+                return False
+
+    def _run(self, program, repeat, on_step, on_done):
+        lock = getattr(self.device, "io_lock", None) or threading.RLock()
+        error = None
+        start = time.perf_counter()
+        try:
+            for index, offset, step in schedule(program, repeat):
+                if not self._wait_until(start + offset):
+                    return
+                if step.voltage is not None or step.current is not None:
+                    with lock:
+                        late = time.perf_counter() - (start + offset)
+                        if step.voltage is not None:
+                            self.device.set_voltage(step.voltage)
+                        if step.current is not None:
+                            self.device.set_current(step.current)
+                    self.timing.append((index, offset, late))
+                    if on_step:
+                        on_step(index, time.time(), late, step)
+        except Exception as e:
+            print(f"[ERROR] Sequencer stopped: {e}")
+            error = e
+        finally:
+            if on_done:
+                on_done(error)
@@ -1,6 +1,9 @@
 import random
+import threading
 import time
 
+from device.status import OPER_CC_BIT, OPER_CV_BIT
+
 
 class SimulationDevice:
     """
@@ -14,6 +17,7 @@ class SimulationDevice:
         self.current_setpoint = 0.0
         self.output_enabled = False
         self.connected = True
+        self.io_lock = threading.RLock()  # same interface as AX6003PDevice
 
         # Resistor load
         self.load_resistance = 10.0  # Ohms
@@ -26,15 +30,15 @@ class SimulationDevice:
         """Return connection state (always True in simulation)."""
         return self.connected
 
-    def set_voltage(self, voltage: float):
+    def set_voltage(self, voltage: float, force=False):
         """Set the simulated output voltage setpoint."""
         self.voltage_setpoint = voltage
 
-    def set_current(self, current: float):
+    def set_current(self, current: float, force=False):
         """Set the simulated current limit."""
         self.current_setpoint = current
 
-    def set_output(self, state: bool):
+    def set_output(self, state: bool, force=False):
         """Turn simulated output ON or OFF."""
         self.output_enabled = state
 
@@ -50,6 +54,65 @@ class SimulationDevice:
         """Return simulated measured power."""
         return self._simulate_resistor_load()[2] if self.output_enabled else 0.0
 
+    def read_all(self):
+        """Return simulated (voltage, current, power) from one evaluation."""
+        return self._simulate_resistor_load() if self.output_enabled else (0.0, 0.0, 0.0)
+
+    def read_all_with_status(self):
+        """read_all() plus simulated operation / questionable condition registers."""
+        v, i, p = self.read_all()
+        oper = 0
+        if self.output_enabled:
+            limited = self.voltage_setpoint / max(self.load_resistance, 0.1) > self.current_setpoint
+            oper = 1 << (OPER_CC_BIT if limited else OPER_CV_BIT)
+        return v, i, p, oper, 0
+
+    def read_status_bytes(self):
+        """Simulated (STB, ESR): nothing pending."""
+        return 0, 0
+
+    def read_errors(self, limit=10):
+        """Simulated error queue (always empty)."""
+        return []
+
+    # ---------- Minimal SCPI (console) ----------
+    def query(self, cmd):
+        """Answer the common queries the console may send."""
+        head = cmd.strip().lstrip(":").upper()
+        v, i, p = self.read_all()
+        answers = {
+            "*IDN?": "SIMULATION,AX6003P,0,1.0",
+            "*OPC?": "1",
+            "*STB?": "0",
+            "*ESR?": "0",
+            "SYST:ERR?": '0,"No error"',
+            "MEAS:VOLT?": f"{v:.3f}",
+            "MEAS:CURR?": f"{i:.4f}",
+            "MEAS:POW?": f"{p:.3f}",
+            "VOLT?": f"{self.voltage_setpoint:.3f}",
+            "CURR?": f"{self.current_setpoint:.4f}",
+            "OUTP?": "1" if self.output_enabled else "0",
+        }
+        if head not in answers:
+            raise RuntimeError(f"Query failed: {cmd} — not simulated")
+        return answers[head]
+
+    def write(self, cmd):
+        """Apply VOLT / CURR / OUTP / *RST writes; other commands are accepted and ignored."""
+        head, _, arg = cmd.strip().lstrip(":").upper().partition(" ")
+        try:
+            if head == "VOLT":
+                self.set_voltage(float(arg))
+            elif head == "CURR":
+                self.set_current(float(arg))
+            elif head == "OUTP":
+                self.set_output(arg.strip() in ("ON", "1"))
+            elif head == "*RST":
+                self.set_output(False)
+                self.voltage_setpoint = self.current_setpoint = 0.0
+        except ValueError:
+            raise RuntimeError(f"Write failed: {cmd} — bad parameter")
+
     # ---------- Simulation Logic ----------
     def _simulate_resistor_load(self):
         """
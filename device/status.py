@@ -0,0 +1,33 @@
+# device/status.py
+"""
+Decoding of the SCPI operation / questionable condition registers
+(STAT:OPER:COND?, STAT:QUES:COND?) into regulation mode and faults.
+"""
+
+OPER_CV_BIT = 8    # output regulating voltage
+OPER_CC_BIT = 10   # output regulating current
+
+# questionable condition bits -> fault name
+QUES_FAULTS = {
+    0: "OV",   # over-voltage
+    1: "OC",   # over-current
+    4: "OT",   # over-temperature
+}
+
+
+def decode_status(oper, ques):
+    """
+    (mode, faults) from the two condition registers. mode is "CC", "CV",
+    "OFF" (output off / not regulating) or None when the registers are
+    unknown; faults is a tuple of QUES_FAULTS names.
+    """
+    if oper is None:
+        return None, ()
+    if oper & (1 << OPER_CC_BIT):
+        mode = "CC"
+    elif oper & (1 << OPER_CV_BIT):
+        mode = "CV"
+    else:
+        mode = "OFF"
+    faults = tuple(name for bit, name in QUES_FAULTS.items() if (ques or 0) & (1 << bit))
+    return mode, faults
@@ -0,0 +1,71 @@
+# device/status_poller.py
+import threading
+import time
+
+EQ_BIT = 2  # STB "error queue not empty"
+
+
+class StatusPoller:
+    """
+    Background poller of the status byte and standard event register.
+
+    Every `interval` seconds STB and ESR are read in one batch
+    (read_status_bytes). The error queue is only drained when STB reports
+    entries, so an idle instrument costs one round trip per poll.
+    on_change(timestamp, stb, esr, errors) is called on the poller thread,
+    and only when STB changed or ESR / the error queue had something:
+    the consumer never sees repeats.
+    """
+
+    def __init__(self, device, on_change, interval=0.5):
+        self.device = device
+        self.on_change = on_change
+        self.interval = interval
+        self._last_stb = None
+        self._failing = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running and not self._stop.is_set():
+            return
+        # a stopped thread may still be inside _poll(); it keeps its own stop
+        # event and exits on its own, the new thread gets a fresh one
+        self._stop = threading.Event()
+        self._last_stb = None
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="StatusPoller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def set_interval(self, seconds):
+        self.interval = max(0.05, float(seconds))
+
+    def _run(self, stop):
+        while not stop.is_set():
+            started = time.monotonic()
+            # no is_connected() here: on hardware that is one more *IDN? per poll,
+            # and a disconnected device fails fast in read_status_bytes anyway
+            try:
+                self._poll(stop)
+                self._failing = False
+            except Exception as e:
+                if not self._failing:
+                    print(f"[WARN] Status poll failed: {e}")
+                self._failing = True
+                self._last_stb = None
+            stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def _poll(self, stop):
+        stb, esr = self.device.read_status_bytes()
+        errors = self.device.read_errors() if stb & (1 << EQ_BIT) else []
+        if stop.is_set():
+            return  # stopped (or restarted) while reading: the result belongs to no one
+        if stb != self._last_stb or esr or errors:
+            self._last_stb = stb
+            self.on_change(time.time(), stb, esr, errors)
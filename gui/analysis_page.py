@@ -0,0 +1,213 @@
+# analysis_page.py
+from tkinter import ttk
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from utils.background import BackgroundTask
+from utils.spectrum import SEGMENT_LENGTHS, SpectrumCache, analyze
+
+CHANNELS = ("voltage", "current", "power")
+UNITS = {"voltage": "V", "current": "A", "power": "W"}
+# where the analysed window comes from
+SOURCES = ("window", "view", "capture")
+
+
+class AnalysisPage(ttk.Frame):
+    """
+    Ripple and noise analysis (RMS ripple, dominant frequency, PSD and
+    spectrogram) of a window of the Graph page's measurement store or of
+    the latest trigger capture. The FFT work runs in a BackgroundTask and
+    results are cached per window, so analysing the same window again
+    (or coming back to the page) is instant.
+    """
+
+    def __init__(self, parent, controller, device, mm):
+        super().__init__(parent)
+        self.controller = controller
+        self.device = device
+        self.mm = mm
+        self.is_visible = False
+        self.cache = SpectrumCache()
+        self._task = None
+
+        t = controller.translator.t
+
+        # ---------- settings ----------
+        top = ttk.Frame(self)
+        top.pack(fill="x", padx=8, pady=6)
+
+        def add_label(key):
+            lbl = ttk.Label(top, text="")
+            lbl.trans_key = key
+            lbl.pack(side="left", padx=(8, 2))
+
+        add_label("label_analysis_source")
+        self.source_cb = ttk.Combobox(top, state="readonly", width=16,
+                                      values=[t(f"label_analysis_source_{s}") for s in SOURCES])
+        self.source_cb.trans_values = [f"label_analysis_source_{s}" for s in SOURCES]
+        self.source_cb.current(0)
+        self.source_cb.pack(side="left")
+
+        add_label("label_analysis_seconds")
+        self.seconds_entry = ttk.Entry(top, width=6)
+        self.seconds_entry.insert(0, "10")
+        self.seconds_entry.pack(side="left")
+
+        add_label("label_trigger_channel")
+        self.channel_cb = ttk.Combobox(top, state="readonly", width=9,
+                                       values=[t(f"label_{c}") for c in CHANNELS])
+        self.channel_cb.trans_values = [f"label_{c}" for c in CHANNELS]
+        self.channel_cb.current(CHANNELS.index("voltage"))
+        self.channel_cb.pack(side="left")
+
+        add_label("label_analysis_segment")
+        self.segment_cb = ttk.Combobox(top, state="readonly", width=6, values=SEGMENT_LENGTHS)
+        self.segment_cb.set(256)
+        self.segment_cb.pack(side="left")
+
+        self.analyze_btn = ttk.Button(top, text="", command=self.run_analysis)
+        self.analyze_btn.trans_key = "button_analyze"
+        self.analyze_btn.pack(side="left", padx=8)
+
+        self.result_label = ttk.Label(self, text="", anchor="w")
+        self.result_label.pack(fill="x", padx=12)
+
+        # ---------- plots ----------
+        self.fig = Figure()
+        self.ax_time, self.ax_psd, self.ax_spec = self.fig.subplots(3, 1)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=8, pady=6)
+
+    # ------------------ window selection ------------------
+    def _graph(self):
+        return self.controller.get_page("GraphPage")
+
+    def _window(self):
+        """(cache key, fetch function, title) of the selected window, or None."""
+        source = SOURCES[self.source_cb.current()]
+        channel = CHANNELS[self.channel_cb.current()]
+        k = 1 + CHANNELS.index(channel)
+        graph = self._graph()
+
+        if source == "capture":
+            captures = graph.capture_panel.captures
+            if not captures:
+                return None
+            capture = captures[-1]
+            data = (capture.t, capture.v, capture.i, capture.p)
+            return (id(capture), channel), lambda: (data[0], data[k]), capture.reason
+
+        store = graph.history
+        span = store.time_span()
+        if span is None:
+            return None
+        if source == "view" and graph.view_range is not None:
+            t0, t1 = graph.view_range
+        elif source == "view":
+            t0, t1 = span
+        else:
+            t0, t1 = span[1] - float(self.seconds_entry.get()), span[1]
+        t0, t1 = max(t0, span[0]), min(t1, span[1])
+
+        def fetch():
+            block = store.range(t0, t1)
+            return block[0], block[k]
+
+        # len(store) in the key: a window that is still filling is recomputed
+        return (id(store), len(store), t0, t1, channel), fetch, f"{t0:.3f} - {t1:.3f} s"
+
+    # ------------------ analysis ------------------
+    def run_analysis(self):
+        t = self.controller.translator.t
+        try:
+            selected = self._window()
+        except ValueError:
+            selected = None
+        if selected is None:
+            self.result_label.config(text=t("msg_analysis_no_data"), foreground="red")
+            return
+        key, fetch, title = selected
+        nperseg = int(self.segment_cb.get())
+        key = key + (nperseg,)
+        channel = CHANNELS[self.channel_cb.current()]
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._show(cached, channel, title)
+            return
+
+        if self._task is not None:
+            self._task.cancel()
+
+        def work(task):
+            times, values = fetch()
+            task.check_cancelled()
+            return times, values, analyze(times, values, nperseg)
+
+        def done(result):
+            self._task = None
+            self.analyze_btn.config(state="normal")
+            self.cache.put(key, result)
+            self._show(result, channel, title)
+
+        def failed(e):
+            self._task = None
+            self.analyze_btn.config(state="normal")
+            self.result_label.config(text=f"{t('msg_analysis_failed')}: {e}", foreground="red")
+
+        def cancelled(_):
+            self._task = None
+            self.analyze_btn.config(state="normal")
+
+        self.analyze_btn.config(state="disabled")
+        self.result_label.config(text=t("label_analysis_running"), foreground="gray")
+        self._task = BackgroundTask(self, work, on_done=done, on_error=failed, on_cancel=cancelled).start()
+
+    def _show(self, result, channel, title):
+        times, values, r = result
+        t = self.controller.translator.t
+        unit = UNITS[channel]
+        self.result_label.config(
+            foreground="black",
+            text=(
+                f"{title}  |  {r['samples']} @ {r['fs']:.4g} Hz  |  "
+                f"{t('label_avg')} {r['mean']:.5g} {unit}  |  "
+                f"{t('label_ripple_rms')} {r['rms_ripple']:.4g} {unit}  |  "
+                f"{t('label_ripple_p2p')} {r['p2p_ripple']:.4g} {unit}  |  "
+                f"{t('label_dominant_freq')} {r['dominant_freq']:.4g} Hz"
+            )
+        )
+
+        for ax in (self.ax_time, self.ax_psd, self.ax_spec):
+            ax.clear()
+        self.ax_time.plot(times, values, linewidth=0.8)
+        self.ax_time.set_ylabel(f"{t(f'label_{channel}')} ({unit})")
+        self.ax_time.set_xlabel(t("label_time_seconds"))
+        self.ax_time.grid(True)
+
+        self.ax_psd.semilogy(r["freqs"][1:], r["psd"][1:], linewidth=0.8)
+        self.ax_psd.axvline(r["dominant_freq"], color="red", linestyle="--", linewidth=1)
+        self.ax_psd.set_ylabel(f"PSD ({unit}²/Hz)")
+        self.ax_psd.set_xlabel("Hz")
+        self.ax_psd.grid(True, which="both")
+
+        spec_db = 10 * np.log10(r["spectrogram"].T + 1e-20)
+        times_c = r["spec_times"]
+        self.ax_spec.imshow(
+            spec_db, aspect="auto", origin="lower", cmap="viridis",
+            extent=(times_c[0], times_c[-1] if len(times_c) > 1 else times_c[0] + 1, 0, r["fs"] / 2),
+        )
+        self.ax_spec.set_ylabel("Hz")
+        self.ax_spec.set_xlabel(t("label_time_seconds"))
+
+        self.fig.tight_layout()
+        self.canvas.draw_idle()
+
+    # ------------------ page visibility ------------------
+    def on_show(self):
+        self.is_visible = True
+
+    def on_hide(self):
+        self.is_visible = False
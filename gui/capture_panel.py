@@ -0,0 +1,214 @@
+# capture_panel.py
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from utils.csv_export import write_csv
+from utils.session_format import SESSION_EXT, is_session_file, write_session
+from utils.trigger_capture import CHANNELS, EDGES, TRIGGER_KINDS, TriggerCapture
+
+MAX_CAPTURES = 20  # captures kept in the list (oldest dropped first)
+
+
+class CapturePanel(ttk.LabelFrame):
+    """
+    Trigger settings, arm/stop and the list of frozen captures for the
+    Graph page. Captures open in their own window and can be saved as CSV
+    or .axs.
+    """
+
+    def __init__(self, parent, controller, mm):
+        super().__init__(parent, text="")
+        self.trans_key = "label_trigger_capture"
+        self.controller = controller
+        self.trigger = TriggerCapture(mm, on_capture=self._on_capture, on_state=self._on_state)
+        self.captures = []
+        self._items = {}  # tree item id -> Capture
+
+        t = controller.translator.t
+
+        settings = ttk.Frame(self)
+        settings.pack(side="left", fill="y", padx=6, pady=4)
+
+        def add_row(trans_key):
+            row = ttk.Frame(settings)
+            row.pack(fill="x", pady=1)
+            lbl = ttk.Label(row, text="", width=12, anchor="w")
+            lbl.trans_key = trans_key
+            lbl.pack(side="left")
+            return row
+
+        # display names for the internal kind / channel / edge values
+        self.kind_cb = ttk.Combobox(add_row("label_trigger_kind"), state="readonly", width=16,
+                                    values=[t(f"label_trigger_{k}") for k in TRIGGER_KINDS])
+        self.kind_cb.trans_values = [f"label_trigger_{k}" for k in TRIGGER_KINDS]
+        self.kind_cb.current(0)
+        self.kind_cb.pack(side="left")
+
+        row = add_row("label_trigger_channel")
+        self.channel_cb = ttk.Combobox(row, state="readonly", width=9,
+                                       values=[t(f"label_{c}") for c in CHANNELS])
+        self.channel_cb.trans_values = [f"label_{c}" for c in CHANNELS]
+        self.channel_cb.current(CHANNELS.index("current"))
+        self.channel_cb.pack(side="left")
+        self.edge_cb = ttk.Combobox(row, state="readonly", width=7,
+                                    values=[t(f"label_edge_{e}") for e in EDGES])
+        self.edge_cb.trans_values = [f"label_edge_{e}" for e in EDGES]
+        self.edge_cb.current(0)
+        self.edge_cb.pack(side="left", padx=(4, 0))
+
+        self.level_entry = self._entry(add_row("label_trigger_threshold"), "1.0")
+        self.pre_entry = self._entry(add_row("label_trigger_pre"), "2")
+        self.post_entry = self._entry(add_row("label_trigger_post"), "5")
+        self.interval_entry = self._entry(add_row("label_trigger_interval"), "20")
+
+        row = ttk.Frame(settings)
+        row.pack(fill="x", pady=(4, 0))
+        self.single_var = tk.BooleanVar(value=True)
+        single_cb = ttk.Checkbutton(row, text="", variable=self.single_var)
+        single_cb.trans_key = "checkbox_trigger_single"
+        single_cb.pack(side="left")
+        self.arm_btn = ttk.Button(row, text="", command=self.arm)
+        self.arm_btn.trans_key = "button_trigger_arm"
+        self.arm_btn.pack(side="left", padx=4)
+        self.stop_btn = ttk.Button(row, text="", command=self.trigger.stop, state="disabled")
+        self.stop_btn.trans_key = "button_trigger_stop"
+        self.stop_btn.pack(side="left")
+        self.state_label = ttk.Label(row, text=t("label_trigger_idle"), foreground="gray")
+        self.state_label.pack(side="left", padx=6)
+
+        # captures
+        captures = ttk.Frame(self)
+        captures.pack(side="left", fill="both", expand=True, padx=6, pady=4)
+        self.tree = ttk.Treeview(captures, columns=("samples",), show="tree headings", height=5)
+        self.tree.heading("#0", text=t("label_trigger_reason"))
+        self.tree.heading("samples", text=t("label_log_rows"))
+        self.tree.column("#0", width=260)
+        self.tree.column("samples", width=70, anchor="center")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.bind("<Double-1>", lambda e: self.show_selected())
+
+        buttons = ttk.Frame(captures)
+        buttons.pack(side="left", fill="y", padx=(4, 0))
+        for key, command in (("button_capture_show", self.show_selected),
+                             ("button_capture_save", self.save_selected)):
+            btn = ttk.Button(buttons, text="", command=command)
+            btn.trans_key = key
+            btn.pack(fill="x", pady=2)
+
+    def _entry(self, row, default):
+        entry = ttk.Entry(row, width=8)
+        entry.insert(0, default)
+        entry.pack(side="left")
+        return entry
+
+    # ------------------ arming ------------------
+    def arm(self):
+        try:
+            settings = dict(
+                kind=TRIGGER_KINDS[self.kind_cb.current()],
+                channel=CHANNELS[self.channel_cb.current()],
+                edge=EDGES[self.edge_cb.current()],
+                level=float(self.level_entry.get()),
+                pre_seconds=max(0.0, float(self.pre_entry.get())),
+                post_seconds=max(0.0, float(self.post_entry.get())),
+                interval_ms=max(1, int(float(self.interval_entry.get()))),
+                single=self.single_var.get(),
+            )
+        except ValueError:
+            messagebox.showerror(
+                self.controller.translator.t("msg_error_title"),
+                self.controller.translator.t("msg_invalid_trigger")
+            )
+            return
+        self.trigger.configure(**settings)
+        self.trigger.arm()
+
+    def _on_state(self, state):
+        t = self.controller.translator.t
+        colors = {"idle": "gray", "armed": "orange", "triggered": "red"}
+        self.state_label.config(text=t(f"label_trigger_{state}"), foreground=colors[state])
+        self.arm_btn.config(state="normal" if state == "idle" else "disabled")
+        self.stop_btn.config(state="disabled" if state == "idle" else "normal")
+
+    def _on_capture(self, capture):
+        stamp = time.strftime("%H:%M:%S", time.localtime(capture.trigger_time))
+        item = self.tree.insert("", 0, text=f"{stamp}  {capture.reason}", values=(len(capture.t),))
+        self._items[item] = capture
+        self.captures.append(capture)
+        if len(self.captures) > MAX_CAPTURES:
+            oldest = self.captures.pop(0)
+            for key, value in list(self._items.items()):
+                if value is oldest:
+                    self.tree.delete(key)
+                    del self._items[key]
+        self.tree.selection_set(item)
+        if self.trigger.single:
+            self.show_capture(capture)
+
+    # ------------------ captures ------------------
+    def _selected(self):
+        return [self._items[item] for item in self.tree.selection() if item in self._items]
+
+    def show_selected(self):
+        for capture in self._selected():
+            self.show_capture(capture)
+
+    def show_capture(self, capture):
+        """Plot a capture in its own window, time axis relative to the trigger."""
+        t = self.controller.translator.t
+        popup = tk.Toplevel(self)
+        popup.title(f"{t('label_trigger_capture')} - {capture.reason}")
+        popup.geometry("720x520")
+
+        fig = Figure()
+        axes = fig.subplots(3, 1, sharex=True)
+        units = ("V", "A", "W")
+        for ax, y, channel, unit in zip(axes, (capture.v, capture.i, capture.p), CHANNELS, units):
+            ax.plot(capture.t, y, marker=".", markersize=3)
+            ax.axvline(0.0, color="red", linestyle="--", linewidth=1)
+            ax.set_ylabel(f"{t(f'label_{channel}')} ({unit})")
+            ax.grid(True)
+        axes[-1].set_xlabel(t("label_trigger_time_axis"))
+        axes[0].set_title(capture.reason)
+        fig.tight_layout()
+
+        canvas = FigureCanvasTkAgg(fig, master=popup)
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+        canvas.draw()
+
+        save_btn = ttk.Button(popup, text=t("button_capture_save"), command=lambda: self.save_capture(capture))
+        save_btn.pack(pady=4)
+
+    def save_selected(self):
+        for capture in self._selected():
+            self.save_capture(capture)
+
+    def save_capture(self, capture):
+        t = self.controller.translator.t
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(capture.trigger_time))
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            initialfile=f"capture_{stamp}.csv",
+            filetypes=[("CSV files", "*.csv"), ("AX session files", f"*{SESSION_EXT}")],
+            title=t("dialog_save_csv_title"))
+        if not file_path:
+            return
+
+        # files start at 0 s; the trigger position is kept in the metadata
+        times = capture.t - capture.t[0] if len(capture.t) else capture.t
+        meta = capture.metadata()
+        meta["trigger_offset"] = float(-capture.t[0]) if len(capture.t) else 0.0
+        try:
+            if is_session_file(file_path):
+                write_session(file_path, times, capture.v, capture.i, capture.p, meta)
+            else:
+                write_csv(file_path, times, capture.v, capture.i, capture.p,
+                          header_lines=[f"{k}: {v}" for k, v in meta.items()])
+        except Exception as e:
+            messagebox.showerror(t("msg_export_failed_title"), f"{t('msg_export_failed_body')}\n{e}")
+            return
+        messagebox.showinfo(t("msg_export_success_title"), f"{t('msg_export_success_body')}\n{file_path}")
@@ -3,23 +3,17 @@ import os
 from PIL import Image, ImageTk
 import tkinter as tk
 from tkinter import ttk, messagebox
-import pyvisa
-import json
-import serial.tools.list_ports
 import pyvisa.constants as visa_consts
 import sys
 
+from device import discovery
+from utils.background import BackgroundTask
+
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and PyInstaller """
     if hasattr(sys, "_MEIPASS"):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
-# ------------------ CONFIG PATH ------------------
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-DATA_DIR = os.path.join(BASE_DIR, "data")
-os.makedirs(DATA_DIR, exist_ok=True)
-CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
-
 COMMON_BAUD_RATES = [9600, 14400, 19200, 28800, 38400, 57600, 115200]
 STOPBITS_MAP = {"1": visa_consts.StopBits.one, "2": visa_consts.StopBits.two}
 
@@ -38,6 +32,8 @@ class ConfigPage(ttk.Frame):
         self.selected_stopbits = tk.StringVar()
         self.selected_databits = tk.StringVar()
         self.simulation_mode = tk.BooleanVar(value=False)  # default OFF
+        self._port_choices = {}   # combobox text -> (address, baud or None)
+        self._discovery = None
 
         # ---------- Build UI ----------
         self.sim_frame = ttk.LabelFrame(self, text="")
@@ -77,12 +73,16 @@ class ConfigPage(ttk.Frame):
         port_frame.trans_key = "label_port_frame"
         port_frame.pack(fill="x", padx=10, pady=5)
 
-        self.port_combo = ttk.Combobox(port_frame, textvariable=self.selected_port, width=25)
+        self.port_combo = ttk.Combobox(port_frame, textvariable=self.selected_port, width=45)
+        self.port_combo.bind("<<ComboboxSelected>>", self._on_port_selected)
         self.port_combo.pack(side="left", padx=5, pady=5)
 
-        refresh_btn = ttk.Button(port_frame, text="", command=self.refresh_ports)
-        refresh_btn.trans_key = "button_refresh"
-        refresh_btn.pack(side="left", padx=5)
+        self.refresh_btn = ttk.Button(port_frame, text="", command=self.refresh_ports)
+        self.refresh_btn.trans_key = "button_refresh"
+        self.refresh_btn.pack(side="left", padx=5)
+
+        self.discovery_label = ttk.Label(port_frame, text="", foreground="gray")
+        self.discovery_label.pack(side="left", padx=5)
 
         # Baud Rate
         baud_frame = ttk.LabelFrame(container, text="")
@@ -193,31 +193,72 @@ class ConfigPage(ttk.Frame):
 
     # ------------------ Methods ------------------
     def refresh_ports(self):
-        ports = list(serial.tools.list_ports.comports())
-        port_list = [p.device for p in ports]
+        """List the ports and probe them for *IDN? in the background (device.discovery)."""
+        if self._discovery is not None and self._discovery.running:
+            return
+        t = self.controller.translator.t
         try:
-            rm = pyvisa.ResourceManager()
-            visa_ports = rm.list_resources()
-        except Exception:
-            visa_ports = []
-        all_ports = list(set(port_list + list(visa_ports)))
-        self.port_combo['values'] = all_ports
-        if all_ports:
-            self.selected_port.set(all_ports[0])
+            preferred = int(self.selected_baud.get())
+        except ValueError:
+            preferred = None
+        # never open the port the app is talking to
+        real = getattr(self.device, "real_device", self.device)
+        skip = {discovery.resource_name(real.address)} if getattr(real, "instrument", None) else set()
+
+        self.refresh_btn.config(state="disabled")
+        self.discovery_label.config(text=t("label_discovering"), foreground="gray")
+        self._discovery = BackgroundTask(
+            self, lambda task: discovery.discover(preferred_baud=preferred, skip=skip),
+            on_done=lambda found: self._show_ports(found, skip),
+            on_error=self._discovery_failed,
+        ).start()
+
+    def _show_ports(self, found, skip):
+        t = self.controller.translator.t
+        self.refresh_btn.config(state="normal")
+        self._port_choices = {}
+        identified = []
+        for address, result in sorted(found.items(), key=lambda item: item[1] is None):
+            if address in skip:
+                text = f"{address}  [{t('label_port_in_use')}]"
+            elif result is not None:
+                baud, idn = result
+                text = f"{address}  [{discovery.parse_idn(idn)}" + (f" @ {baud}]" if baud else "]")
+                identified.append(text)
+            else:
+                text = address
+            self._port_choices[text] = (address, result[0] if result else None)
+        self.port_combo["values"] = list(self._port_choices)
+        self.discovery_label.config(
+            text=f"{len(identified)} {t('label_instruments_found')}",
+            foreground="green" if identified else "gray")
+
+        current = self.selected_port.get()
+        if identified and current not in (address for address, _ in self._port_choices.values()):
+            self.port_combo.set(identified[0])
+            self._on_port_selected()
+
+    def _discovery_failed(self, error):
+        self.refresh_btn.config(state="normal")
+        self.discovery_label.config(text=f"{self.controller.translator.t('label_discovery_failed')}: {error}",
+                                    foreground="red")
+
+    def _on_port_selected(self, event=None):
+        """Put the plain address (and the baud rate it answered at) into the settings."""
+        address, baud = self._port_choices.get(self.port_combo.get(), (self.port_combo.get(), None))
+        self.selected_port.set(address)
+        if baud:
+            self.selected_baud.set(str(baud))
 
     def load_settings(self):
-        try:
-            with open(CONFIG_FILE, "r") as f:
-                self.config = json.load(f)
-        except FileNotFoundError:
-            self.config = {}
-
-        self.selected_port.set(self.config.get("address", ""))
-        self.selected_baud.set(str(self.config.get("baud_rate", 19200)))
-        self.timeout_var.set(self.config.get("timeout", 5000))
-        self.selected_parity.set(self.config.get("parity", "NONE"))
-        self.selected_stopbits.set(str(self.config.get("stop_bits", 1)))
-        self.selected_databits.set(str(self.config.get("data_bits", 8)))
+        self.config = self.controller.settings.get("config")
+
+        self.selected_port.set(self.config["address"])
+        self.selected_baud.set(str(self.config["baud_rate"]))
+        self.timeout_var.set(self.config["timeout"])
+        self.selected_parity.set(self.config["parity"])
+        self.selected_stopbits.set(str(int(self.config["stop_bits"])))
+        self.selected_databits.set(str(self.config["data_bits"]))
 
         return self.config
 
@@ -232,9 +273,8 @@ class ConfigPage(ttk.Frame):
             "data_bits": int(self.selected_databits.get()),
             "simulation_mode": self.simulation_mode.get()  # <--- NEW
         }
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(self.config, f, indent=4)
-        self.result_label.config(text=f"Settings saved to {CONFIG_FILE}", foreground="green")
+        self.controller.settings.update("config", self.config)
+        self.result_label.config(text=f"Settings saved to {self.controller.settings.path('config')}", foreground="green")
 
 
     def test_connection(self):
@@ -1,9 +1,9 @@
 import tkinter as tk
 from tkinter import ttk
 import time
-import json
-import os
 import tkinter.font as tkfont
+
+from gui.sequencer_panel import SequencerPanel
 class ControlPage(ttk.Frame):
     SCALE = 1000
 
@@ -23,8 +23,9 @@ class ControlPage(ttk.Frame):
         self.mm.subscribe_limits(self._on_limit_update)
 
         self.auto_apply = True
-        self.presets_file = "data/presets.json"
         self.voltage_presets, self.current_presets = self.load_presets()
+        # preset changes (from this page or elsewhere) come back through the store
+        self.controller.settings.subscribe("presets", self._on_presets_changed)
         self.set_voltage = 0.0
         self.set_current = 0.0
         self.is_visible = False
@@ -98,6 +99,23 @@ class ControlPage(ttk.Frame):
         self.current_box = create_measurement_row(measured_frame, "label_current", self.meas_current_var)
         self.power_box = create_measurement_row(measured_frame, "label_power", self.meas_power_var)
 
+        # --- Energy / charge counters (integrated by MeasurementManager) ---
+        energy_frame = ttk.LabelFrame(left_frame, text="")
+        energy_frame.trans_key = "label_energy"
+        energy_frame.pack(fill="x", pady=4)
+
+        self.energy_var = tk.StringVar(value=self.mm.energy.format())
+        ttk.Label(energy_frame, textvariable=self.energy_var, font=("Courier", 11, "bold")).pack(padx=5, pady=(6, 2))
+
+        energy_buttons = ttk.Frame(energy_frame)
+        energy_buttons.pack(pady=(0, 6))
+        self.energy_pause_btn = ttk.Button(energy_buttons, text="", command=self.toggle_energy_pause)
+        self.energy_pause_btn.trans_key = "button_energy_pause"
+        self.energy_pause_btn.pack(side="left", padx=2)
+        energy_reset_btn = ttk.Button(energy_buttons, text="", command=self.reset_energy)
+        energy_reset_btn.trans_key = "button_energy_reset"
+        energy_reset_btn.pack(side="left", padx=2)
+
 
         # ---------------- OUTPUT  ----------------
         self.output_state = tk.BooleanVar(value=False)
@@ -185,6 +203,7 @@ class ControlPage(ttk.Frame):
         )
         self.mode_label.trans_key = "label_mode_text"
         self.mode_label.pack(padx=5, pady=6)
+        self.mm.subscribe_mode(self._on_mode_change)
 
        
         # --- Apply / Auto Apply ---
@@ -203,6 +222,17 @@ class ControlPage(ttk.Frame):
         )
         auto_apply_chk.trans_key = "checkbox_auto_apply"
         auto_apply_chk.pack(padx=5, pady=4)
+        sequencer_btn = ttk.Button(apply_frame, text="", width=15, command=self.toggle_sequencer)
+        sequencer_btn.trans_key = "button_sequencer"
+        sequencer_btn.pack(padx=5, pady=4)
+        iv_sweep_btn = ttk.Button(apply_frame, text="", width=15, command=self.open_iv_sweep)
+        iv_sweep_btn.trans_key = "button_iv_sweep"
+        iv_sweep_btn.pack(padx=5, pady=4)
+        self.iv_sweep_window = None
+
+        # host-timed setpoint programs, shown below the columns on demand
+        self.sequencer_panel = SequencerPanel(self, controller, device, self.mm,
+                                              on_setpoint=self._on_sequencer_setpoint)
 
        # ---------------- Voltage Presets ----------------
         self.voltage_presets_frame = ttk.LabelFrame(right_frame, text="")
@@ -357,15 +387,18 @@ class ControlPage(ttk.Frame):
             else:
                 self.device.set_current(self.current_var.get())
                 self.set_current = self.current_var.get()
+            self.mm.post_event("setpoint", voltage=self.set_voltage, current=self.set_current)
         except Exception as e:
             print(f"[ERROR] Auto apply {control}: {e}")
 
     def apply_settings(self):
+        # an explicit Apply always writes, whatever the device's state shadow says
         try:
-            self.device.set_voltage(self.voltage_var.get())
+            self.device.set_voltage(self.voltage_var.get(), force=True)
             self.set_voltage = self.voltage_var.get()
-            self.device.set_current(self.current_var.get())
+            self.device.set_current(self.current_var.get(), force=True)
             self.set_current = self.current_var.get()
+            self.mm.post_event("setpoint", voltage=self.set_voltage, current=self.set_current)
         except Exception as e:
             print(f"[ERROR] Apply settings failed: {e}")
 
@@ -380,13 +413,52 @@ class ControlPage(ttk.Frame):
             self.output_button.config(text=self.controller.translator.t("button_output_on"), bg="green", fg="white")
             # --- Trigger your actual output ON logic here ---
             print("Output ENABLED")
-            self.device.set_output(True)   # example if you have a method
+            self.device.set_output(True, force=True)
         else:
             self.output_button.config(text=self.controller.translator.t("button_output_off"), bg="red", fg="white")
             # --- Trigger your actual output OFF logic here ---
             print("Output DISABLED")
-            self.device.set_output(False)  # example if you have a method
+            self.device.set_output(False, force=True)
+        self.mm.post_event("output", state=new_state)
+
+
+    # ---------------- Sequencer ----------------
+    def toggle_sequencer(self):
+        if self.sequencer_panel.winfo_ismapped():
+            self.sequencer_panel.pack_forget()
+        else:
+            self.sequencer_panel.pack(fill="x", padx=8, pady=(0, 8))
+
+    def open_iv_sweep(self):
+        """Open (or raise) the I-V curve tracer; it restores the current setpoints when done."""
+        if self.iv_sweep_window is not None and self.iv_sweep_window.winfo_exists():
+            self.iv_sweep_window.lift()
+            return
+        from gui.iv_sweep_window import IVSweepWindow  # pulls in matplotlib; only needed here
+        self.iv_sweep_window = IVSweepWindow(
+            self, self.controller, self.device, self.mm,
+            restore=lambda: (self.set_voltage, self.set_current))
+
+    def _on_sequencer_setpoint(self, voltage, current):
+        """Keep the remembered setpoints (setpoint events, I-V sweep restore) in step with the sequencer."""
+        if voltage is not None:
+            self.set_voltage = voltage
+        if current is not None:
+            self.set_current = current
+
+    # ---------------- Energy counters ----------------
+    def toggle_energy_pause(self):
+        energy = self.mm.energy
+        if energy.paused:
+            energy.resume()
+        else:
+            energy.pause()
+        self.energy_pause_btn.trans_key = "button_energy_resume" if energy.paused else "button_energy_pause"
+        self.energy_pause_btn.config(text=self.controller.translator.t(self.energy_pause_btn.trans_key))
 
+    def reset_energy(self):
+        self.mm.energy.reset()
+        self.energy_var.set(self.mm.energy.format())
 
     # ---------------- Auto-Measure ----------------
     def on_new_data(self, v, i, p):
@@ -394,6 +466,7 @@ class ControlPage(ttk.Frame):
         self.meas_voltage_var.set(f"{v:.4f} V")
         self.meas_current_var.set(f"{i:.4f} A")
         self.meas_power_var.set(f"{p:.4f} W")
+        self.energy_var.set(self.mm.energy.format())
                 # Reflect protection status from MeasurementManager
         t = self.controller.translator.t
 
@@ -404,44 +477,28 @@ class ControlPage(ttk.Frame):
             self.protection_status_var.set(t("label_safe"))
             self.protection_status_label.config(foreground="green")
 
-        self._update_mode_indicator(v, i)
-
     # ---------------- CV/CC detection ----------------
 
-    def _update_mode_indicator(self, v_meas, i_meas):
-            
+    def _on_mode_change(self, mode, faults):
+        """Mode / faults from the instrument status registers (pushed only on change)."""
         try:
-                if not self.output_state.get():  # Output OFF → gray
-                    self.mode_label.config(text="Mode: ---", foreground="gray")
-                    return
-
-                tolerance = 0.005  # 5 mA / 5 mV tolerance
-
-                # Check CC first
-                if v_meas < self.set_voltage - tolerance and abs(i_meas - self.set_current) < tolerance:
-                    self.mode_label.config(text="Mode: CC", foreground="red")
-                else:
-                    # Else CV
-                    self.mode_label.config(text="Mode: CV", foreground="blue")
-
+            if mode == "CC":
+                text, color = "Mode: CC", "red"
+            elif mode == "CV":
+                text, color = "Mode: CV", "blue"
+            else:  # output off, not regulating or status unknown
+                text, color = "Mode: ---", "gray"
+            if faults:
+                text, color = f"{text}  ({', '.join(faults)})", "orange"
+            self.mode_label.config(text=text, foreground=color)
         except Exception as e:
-                print(f"[ERROR] Mode detection failed: {e}")    
+            print(f"[ERROR] Mode display failed: {e}")
 
 
         # ---------------- Presets ----------------
     def load_presets(self):
-            if not os.path.exists(self.presets_file):
-                default_data = {
-                    "voltage_presets": [3.3,5.0,9.0,12.0,24.0],
-                    "current_presets": [0.1,0.5,1.0,2.0,3.0]
-                }
-                os.makedirs(os.path.dirname(self.presets_file), exist_ok=True)
-                with open(self.presets_file,"w") as f:
-                    json.dump(default_data, f, indent=4)
-                return default_data["voltage_presets"], default_data["current_presets"]
-            with open(self.presets_file,"r") as f:
-                data = json.load(f)
-                return data.get("voltage_presets", []), data.get("current_presets", [])
+            data = self.controller.settings.get("presets")
+            return data["voltage_presets"], data["current_presets"]
 
             # ---------------- Preset handlers ----------------
     def set_voltage_preset(self, value: float):
@@ -478,8 +535,13 @@ class ControlPage(ttk.Frame):
             "voltage_presets": self.voltage_presets,
             "current_presets": self.current_presets
         }
-        with open(self.presets_file, "w") as f:
-            json.dump(data, f, indent=4)
+        self.controller.settings.update("presets", data)
+
+    def _on_presets_changed(self, data):
+        """Settings store subscriber: show the stored presets."""
+        self.voltage_presets = data["voltage_presets"]
+        self.current_presets = data["current_presets"]
+        self.refresh_presets_buttons()
 
     def add_voltage_preset(self):
         try:
@@ -488,7 +550,6 @@ class ControlPage(ttk.Frame):
                 self.voltage_presets.append(val)
                 self.voltage_presets.sort()
                 self.save_presets()
-                self.refresh_presets_buttons()
         except ValueError:
             print("[ERROR] Invalid voltage value")
 
@@ -499,7 +560,6 @@ class ControlPage(ttk.Frame):
                 self.current_presets.append(val)
                 self.current_presets.sort()
                 self.save_presets()
-                self.refresh_presets_buttons()
         except ValueError:
             print("[ERROR] Invalid current value")
 
@@ -509,7 +569,6 @@ class ControlPage(ttk.Frame):
             if val in self.voltage_presets:
                 self.voltage_presets.remove(val)
                 self.save_presets()
-                self.refresh_presets_buttons()
         except ValueError:
             print("[ERROR] Invalid voltage value")
 
@@ -519,7 +578,6 @@ class ControlPage(ttk.Frame):
             if val in self.current_presets:
                 self.current_presets.remove(val)
                 self.save_presets()
-                self.refresh_presets_buttons()
         except ValueError:
             print("[ERROR] Invalid current value")
 
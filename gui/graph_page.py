@@ -1,7 +1,6 @@
 # graph_page.py
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv
 import time
 import os
 from collections import deque
@@ -10,12 +9,41 @@ matplotlib.use("TkAgg")
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+from gui.capture_panel import CapturePanel
+from gui.overlay_panel import OverlayPanel
+from gui.strip_chart import StripChart
+from utils.autoscale import AutoScaler
+from utils.background import BackgroundTask, TaskCancelled
+from utils.csv_export import write_csv
+from utils.event_log import EVENT_COLORS, EventLog
+from utils.history_store import HistoryStore
+from utils.live_logger import LiveLogger
+from utils.log_reader import LOG_FILETYPES, iter_log_chunks
+from utils.range_loader import RangeLoader
+from utils.quantile_sketch import DEFAULT_QUANTILES, QuantileRollup
+from utils.running_stats import SessionStats
+from utils.session_format import SESSION_EXT, is_session_file, write_session
+
+# live-log rotation choices: label -> (rotate_bytes, rotate_seconds)
+LOG_ROTATION_OPTIONS = {
+    "Off": (None, None),
+    "10 MB": (10 * 1024 * 1024, None),
+    "100 MB": (100 * 1024 * 1024, None),
+    "1 h": (None, 3600),
+    "24 h": (None, 24 * 3600),
+}
+
+# live view renderers; the strip chart draws on a plain Tk Canvas for high sample rates
+RENDERERS = ("Matplotlib", "Strip chart")
+STRIP_DEFAULT_WINDOW = 60.0  # seconds shown by the strip chart when the time window is "All"
+
 
 class GraphPage(ttk.Frame):
     
 
     def __init__(self, parent, controller, device, mm,
-                 max_points=10000, draw_interval=20):
+                 max_points=10000, draw_interval=20,
+                 log_durability="flush", log_flush_interval=1.0):
        
         super().__init__(parent)
         self.controller = controller
@@ -25,18 +53,41 @@ class GraphPage(ttk.Frame):
         # subscribe to measurement manager callbacks
         # measurement callback signature expected: callback(v, i, p)
         self.mm.subscribe(self.on_new_data)
+        self.mm.subscribe_events(self.on_event)
 
         # runtime flags
         self.running = False
         self.paused = False
         self.combined = True
+        self.use_strip_chart = False
+        # rendering is suspended while another page is raised
+        self.is_visible = False
+        self._render_pending = False
 
         # storage (bounded)
         self.max_points = max_points
-        self.time_data = deque(maxlen=self.max_points)     # integer seconds
+        self.time_data = deque(maxlen=self.max_points)     # seconds since start (float)
         self.voltage_data = deque(maxlen=self.max_points)
         self.current_data = deque(maxlen=self.max_points)
         self.power_data = deque(maxlen=self.max_points)
+        # full session archive with decimation pyramid (plots read from here)
+        self.history = HistoryStore()
+        # trips / setpoint changes / output toggles, indexed by session time
+        self.events = EventLog()
+        self._event_artists = []
+        # O(1) per-sample statistics for the session and the selected time window
+        self.stats = SessionStats()
+        # constant-memory p50 / p99 / p99.9 for the session and per hour
+        self.quantiles = QuantileRollup()
+        self._last_stats_update = 0.0
+        # y-limits from sliding-window extrema, with hysteresis
+        self.autoscale = AutoScaler()
+        self._task = None  # running BackgroundTask (import/export)
+        # zoom / pan: (t0, t1) shown instead of the live time window, fetched by range_loader
+        self.view_range = None
+        self._drag = None
+        self.range_loader = RangeLoader(self)
+        self._overlay_lines = []  # matplotlib artists of overlays / difference
 
         # start / timing
         self.start_time = None   # wall-clock time when graph started
@@ -50,9 +101,11 @@ class GraphPage(ttk.Frame):
         self.prev_voltage = None
         self.prev_current = None
 
-        # CSV logging
-        self.live_file = None
-        self.live_writer = None
+        # CSV / .axs logging (rows are written by a background LiveLogger)
+        self.live_logger = None
+        self.log_durability = log_durability        # "buffered" | "flush" | "fsync"
+        self.log_flush_interval = log_flush_interval  # seconds between batch writes
+        self._log_poll_id = None
 
         # scaling
         self.auto_scale_var = tk.BooleanVar(value=True)
@@ -82,6 +135,7 @@ class GraphPage(ttk.Frame):
         # top controls
         top_frame = ttk.Frame(self)
         top_frame.pack(fill="x", padx=8, pady=6)
+        self.top_frame = top_frame
 
         self.start_btn = ttk.Button(top_frame, text="", command=self.toggle_graph)
         self.start_btn.trans_key = "button_start_graph"
@@ -97,12 +151,20 @@ class GraphPage(ttk.Frame):
 
         self.export_btn = ttk.Button(top_frame, text="", command=self.export_csv, state="disabled")
         self.export_btn.trans_key = "button_export_csv"
-        # self.export_btn.pack(side="left", padx=4)
+        self.export_btn.pack(side="left", padx=4)
 
         self.view_btn = ttk.Button(top_frame, text="", command=self.toggle_view)
         self.view_btn.trans_key = "button_toggle_view"
         self.view_btn.pack(side="left", padx=8)
 
+        renderer_label = ttk.Label(top_frame, text="")
+        renderer_label.trans_key = "label_renderer"
+        renderer_label.pack(side="left", padx=(12, 4))
+        self.renderer_cb = ttk.Combobox(top_frame, values=list(RENDERERS), width=11, state="readonly")
+        self.renderer_cb.set(RENDERERS[0])
+        self.renderer_cb.pack(side="left", padx=(0, 10))
+        self.renderer_cb.bind("<<ComboboxSelected>>", lambda e: self._on_renderer_selected())
+
         time_label = ttk.Label(top_frame, text="")
         time_label.trans_key = "label_time_window"
         time_label.pack(side="left", padx=(12,4))
@@ -110,12 +172,38 @@ class GraphPage(ttk.Frame):
         self.time_window_cb = ttk.Combobox(top_frame, values=["All", "10", "30", "60"], width=5, state="readonly")
         self.time_window_cb.set("All")
         self.time_window_cb.pack(side="left", padx=(0,10))
-        self.time_window_cb.bind("<<ComboboxSelected>>", lambda e: self.force_full_redraw())
+        self.time_window_cb.bind("<<ComboboxSelected>>", lambda e: self._on_time_window_selected())
+
+        self.live_view_btn = ttk.Button(top_frame, text="", command=self.follow_live, state="disabled")
+        self.live_view_btn.trans_key = "button_live_view"
+        self.live_view_btn.pack(side="left", padx=4)
 
         self.import_btn = ttk.Button(top_frame, text="", command=self.import_csv)
         self.import_btn.trans_key = "button_import_csv"
         self.import_btn.pack(side="left", padx=4)
 
+        self.compare_btn = ttk.Button(top_frame, text="", command=self.toggle_overlay_panel)
+        self.compare_btn.trans_key = "button_compare"
+        self.compare_btn.pack(side="left", padx=4)
+
+        self.trigger_btn = ttk.Button(top_frame, text="", command=self.toggle_capture_panel)
+        self.trigger_btn.trans_key = "button_trigger"
+        self.trigger_btn.pack(side="left", padx=4)
+
+        # recorded sessions overlaid for comparison / trigger captures (shown on demand)
+        self.overlay_panel = OverlayPanel(self, self)
+        self.capture_panel = CapturePanel(self, self.controller, self.mm)
+
+        # background task progress (shown only while a task runs)
+        self.task_frame = ttk.Frame(self)
+        self.task_label = ttk.Label(self.task_frame, text="", width=24)
+        self.task_label.pack(side="left", padx=4)
+        self.task_progress = ttk.Progressbar(self.task_frame, mode="determinate", maximum=1.0)
+        self.task_progress.pack(side="left", fill="x", expand=True, padx=4)
+        self.task_cancel_btn = ttk.Button(self.task_frame, text="", command=self.cancel_task)
+        self.task_cancel_btn.trans_key = "button_cancel"
+        self.task_cancel_btn.pack(side="left", padx=4)
+
         # protection label
         self.protection_status_var = tk.StringVar(value="SAFE")
         self.protection_status_label = ttk.Label(self, textvariable=self.protection_status_var, font=("Arial", 14, "bold"))
@@ -148,6 +236,16 @@ class GraphPage(ttk.Frame):
         self.delta_label = ttk.Label(row2, text="ΔV: -- V   ΔI: -- A", font=("Helvetica", 9, "italic"))
         self.delta_label.pack(side="left", padx=8)
 
+        self.log_status_label = ttk.Label(row2, text="", font=("Helvetica", 9, "italic"))
+        self.log_status_label.pack(side="right", padx=8)
+
+        self.log_rotation_cb = ttk.Combobox(row2, values=list(LOG_ROTATION_OPTIONS), width=7, state="readonly")
+        self.log_rotation_cb.set("Off")
+        self.log_rotation_cb.pack(side="right", padx=(0, 8))
+        rotation_label = ttk.Label(row2, text="")
+        rotation_label.trans_key = "label_log_rotation"
+        rotation_label.pack(side="right", padx=(8, 4))
+
         # stats area
         stats_frame = ttk.LabelFrame(self, text="")
         stats_frame.trans_key = "label_statistics"
@@ -157,6 +255,9 @@ class GraphPage(ttk.Frame):
         self.stats_label.trans_key = "label_stats_values"
         self.stats_label.pack(padx=8, pady=4)
 
+        self.energy_label = ttk.Label(stats_frame, text="")
+        self.energy_label.pack(padx=8, pady=(0, 4))
+
         scale_frame = ttk.Frame(self)
         scale_frame.pack(side="left", fill="y", padx=8, pady=6)
 
@@ -207,6 +308,16 @@ class GraphPage(ttk.Frame):
         self.canvas = FigureCanvasTkAgg(self.fig, master=canvas_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
 
+        # alternative live renderer, packed instead of the matplotlib canvas when selected
+        self.strip_chart = StripChart(canvas_frame, self._strip_source, self._strip_titles(),
+                                      markers=self._strip_markers)
+
+        # mouse wheel zooms the time axis, left drag pans, double click returns to live
+        self.canvas.mpl_connect("scroll_event", self._on_scroll)
+        self.canvas.mpl_connect("button_press_event", self._on_press)
+        self.canvas.mpl_connect("motion_notify_event", self._on_motion)
+        self.canvas.mpl_connect("button_release_event", self._on_release)
+
     # ------------------ controls ------------------
     def toggle_graph(self):
         if not self.running:
@@ -221,6 +332,8 @@ class GraphPage(ttk.Frame):
             self.pause_btn.config(state="normal", text="⏸ Pause")
             self.reset_btn.config(state="normal")
             self.export_btn.config(state="normal")
+            # an import would replace the history under the live samples
+            self.import_btn.config(state="disabled")
             # initialize time base
             self.start_time = time.time()
             self.start_timestamp = self.start_time
@@ -231,21 +344,31 @@ class GraphPage(ttk.Frame):
                 title="Save Live CSV Data As",
                 defaultextension=".csv",
                 initialfile=default_name,
-                filetypes=[("CSV files", "*.csv")]
+                filetypes=[("CSV files", "*.csv"), ("Compressed CSV files", "*.csv.gz"),
+                           ("AX session files", f"*{SESSION_EXT}"),
+                           ("Compressed AX session files", f"*{SESSION_EXT}.gz")]
             )
             if not file_path:
                 file_path = default_name
+            rotate_bytes, rotate_seconds = LOG_ROTATION_OPTIONS[self.log_rotation_cb.get()]
             try:
-                self.live_file = open(file_path, mode='w', newline='')
-                self.live_writer = csv.writer(self.live_file)
-                # header with HH:MM:SS times
-                self.live_writer.writerow(["Time (HH:MM:SS)", "Voltage (V)", "Current (A)", "Power (W)"])
-                if self.live_file:
-                    print(f"[INFO] Live CSV logging to: {os.path.abspath(file_path)}")
+                self.live_logger = LiveLogger(
+                    file_path,
+                    flush_interval=self.log_flush_interval,
+                    durability=self.log_durability,
+                    fmt="binary" if is_session_file(file_path) else "csv",
+                    metadata=self._session_metadata(),
+                    compress=file_path.lower().endswith(".gz"),
+                    rotate_bytes=rotate_bytes,
+                    rotate_seconds=rotate_seconds
+                )
+                print(f"[INFO] Live CSV logging to: {os.path.abspath(file_path)} ({self.log_durability})")
+                if self._log_poll_id is not None:
+                    self.after_cancel(self._log_poll_id)
+                self._poll_logger()
             except Exception as e:
                 messagebox.showerror("File Error", f"Could not create log file:\n{e}")
-                self.live_file = None
-                self.live_writer = None
+                self.live_logger = None
             self.toggle_view()
             self.toggle_view()
         else:
@@ -258,13 +381,12 @@ class GraphPage(ttk.Frame):
             self.pause_btn.config(state="disabled", text=self.controller.translator.t(self.pause_btn.trans_key))
             self.reset_btn.config(state="normal")
             self.export_btn.config(state="normal" if len(self.time_data) else "disabled")
-            if self.live_file:
-                try:
-                    self.live_file.close()
-                except Exception:
-                    pass
-                self.live_file = None
-                self.live_writer = None
+            if self._task is None:
+                self.import_btn.config(state="normal")
+            if self.live_logger:
+                # the logger drains its backlog in the background; _poll_logger
+                # keeps reporting until it is done
+                self.live_logger.close(wait=False)
                 print("[INFO] Live CSV logging stopped.")
 
     def toggle_pause(self):
@@ -299,14 +421,18 @@ class GraphPage(ttk.Frame):
             self._last_full_redraw = self.start_time
             self.draw_interval = 20  # seconds
 
-        # --- Timestamp (integer seconds) ---
-        ts = int(time.time() - self.start_time)
+        # --- Timestamp (seconds since start, full resolution) ---
+        ts = time.time() - self.start_time
 
         # Append new data
         self.time_data.append(ts)
         self.voltage_data.append(v)
         self.current_data.append(i)
         self.power_data.append(p)
+        self.history.append(ts, v, i, p)
+        self.stats.add(ts, v, i, p)
+        self.quantiles.add(ts, v, i, p)
+        scale_changed = self.autoscale.add(ts, v, i, p)
 
         if self.mm.protection_tripped:
             self.protection_status_var.set(
@@ -318,44 +444,229 @@ class GraphPage(ttk.Frame):
             self.protection_status_label.config(foreground="green")
 
 
-        # --- CSV logging ---
-        if self.live_writer:
-            try:
-                hh = ts // 3600
-                mm = (ts % 3600) // 60
-                ss = ts % 60
-                hhmmss = f"{hh:02}:{mm:02}:{ss:02}"
-                self.live_writer.writerow([hhmmss, f"{v:.6f}", f"{i:.6f}", f"{p:.6f}"])
-                self.live_file.flush()
-            except Exception:
-                pass
+        # --- CSV logging (queued, written by the logger thread) ---
+        if self.live_logger and not self.live_logger.closed:
+            self.live_logger.log(ts, v, i, p)
+
+        # --- Hidden page: keep recording, catch up in on_show() ---
+        if not self.is_visible:
+            self._render_pending = True
+            return
+
+        # --- Statistics label, at most once per second ---
+        now = time.time()
+        if now - self._last_stats_update >= 1.0:
+            self._update_stats()
+            self._last_stats_update = now
+
+        # --- Strip chart: only the new segment is drawn ---
+        if self.use_strip_chart:
+            self.strip_chart.push(ts, v, i, p)
+            return
+
+        # --- Zoomed / panned: the view stays put until follow_live() ---
+        if self.view_range is not None:
+            return
 
         # --- Lightweight append update (lines only) ---
+        t_plot, v_plot, c_plot, p_plot = self._plot_data()
         if self.combined:
-            self.voltage_line.set_data(self.time_data, self.voltage_data)
-            self.current_line.set_data(self.time_data, self.current_data)
-            self._update_axes_limits(ts, v, i)
+            self.voltage_line.set_data(t_plot, v_plot)
+            self.current_line.set_data(t_plot, c_plot)
+            self._update_axes_limits(ts)
         else:
-            # Ensure separate lines exist
-            if not hasattr(self, "vol_line_sep"):
-                self.vol_line_sep, = self.ax_voltage.plot([], [], color="blue")
-                self.cur_line_sep, = self.ax_current.plot([], [], color="orange")
-                self.pow_line_sep, = self.ax_power.plot([], [], color="green")
+            # Ensure separate axes exist
+            if not self.sep_axes_created:
+                self._create_separate_axes()
 
-            self.vol_line_sep.set_data(self.time_data, self.voltage_data)
-            self.cur_line_sep.set_data(self.time_data, self.current_data)
-            self.pow_line_sep.set_data(self.time_data, self.power_data)
-            self._update_axes_limits(ts, v, i)
+            self.vol_line_sep.set_data(t_plot, v_plot)
+            self.cur_line_sep.set_data(t_plot, c_plot)
+            self.pow_line_sep.set_data(t_plot, p_plot)
+            self._update_axes_limits(ts)
 
         self.canvas.draw_idle()
 
-        # --- Full redraw every 20 seconds ---
+        # --- Full redraw every 20 seconds, or when data left the autoscale band ---
         now = time.time()
-        if now - self._last_full_redraw >= self.draw_interval:
+        if now - self._last_full_redraw >= self.draw_interval or (scale_changed and self.auto_scale_var.get()):
             self.redraw(full=True)
             self._last_full_redraw = now
 
 
+    def on_event(self, kind, ts, info):
+        """Record a MeasurementManager event on the session timeline."""
+        if not self.running or self.start_time is None:
+            return
+        t = ts - self.start_time
+        self.events.add(t, kind, info)
+        if self.live_logger and not self.live_logger.closed:
+            self.live_logger.log_event(t, kind, info)
+
+        if self.use_strip_chart:
+            self.strip_chart.add_marker(t, EVENT_COLORS.get(kind, "gray"))
+        else:
+            # markers are drawn by the full redraw on the next sample
+            self._last_full_redraw = 0.0
+
+    def on_show(self):
+        """Called by the controller when this page becomes visible."""
+        self.is_visible = True
+        if self._render_pending:
+            self._render_pending = False
+            self.force_full_redraw()
+
+    def on_hide(self):
+        """Called by the controller when this page is hidden."""
+        self.is_visible = False
+
+    # ------------------ zoom / pan ------------------
+    def _time_axes(self):
+        if self.sep_axes_created:
+            return (self.ax_voltage, self.ax_current, self.ax_power)
+        return (self.ax1,)
+
+    def _on_scroll(self, event):
+        if event.inaxes not in self._time_axes() or event.xdata is None:
+            return
+        shown = self.view_range or self._plot_range()
+        if shown is None:
+            return
+        t0, t1 = shown
+        factor = 0.8 if event.button == "up" else 1.25
+        x = event.xdata
+        self.set_view_range(x - (x - t0) * factor, x + (t1 - x) * factor)
+
+    def _on_press(self, event):
+        if event.button != 1 or event.inaxes not in self._time_axes():
+            return
+        if event.dblclick:
+            self.follow_live()
+            return
+        shown = self.view_range or self._plot_range()
+        if shown is not None:
+            self._drag = (event.x, shown, event.inaxes.bbox.width)
+
+    def _on_motion(self, event):
+        if self._drag is None or event.x is None:
+            return
+        x0, (t0, t1), width = self._drag
+        dt = (event.x - x0) / max(width, 1) * (t1 - t0)
+        self.set_view_range(t0 - dt, t1 - dt)
+
+    def _on_release(self, event):
+        self._drag = None
+
+    def set_view_range(self, t0, t1):
+        """Show [t0, t1] (seconds) and fetch it at screen resolution in the background."""
+        span = self._data_span()
+        if span is None or t1 - t0 <= 1e-3:
+            return
+        if t0 <= span[0] and t1 >= span[1] and self.time_window_cb.get() == "All":
+            # zoomed out past the whole session: back to the live view
+            self.follow_live()
+            return
+
+        self.view_range = (t0, t1)
+        self.live_view_btn.config(state="normal")
+        for ax in self._time_axes():
+            ax.set_xlim(t0, t1)
+        self.canvas.draw_idle()
+        self.range_loader.request(self.history, t0, t1, self._plot_points(), self._on_view_data)
+
+    def _on_view_data(self, data):
+        if self.view_range is None:
+            return
+        self.redraw(full=True, data=tuple(c.tolist() for c in data))
+
+    def _on_time_window_selected(self):
+        self._reset_window_state()
+        self.follow_live()
+
+    def _reset_window_state(self):
+        """Match the windowed statistics and autoscale to the time window, refilled from the history."""
+        tw = self.time_window_cb.get()
+        try:
+            window = None if tw == "All" else float(tw)
+        except ValueError:
+            window = None
+        span = self.history.time_span()
+        samples = self.history.range(span[1] - window, span[1]) if window and span else None
+        self.stats.set_window(window, samples)
+        if window is None and span:
+            # min/max decimation keeps the extremes, which is all the autoscale needs
+            samples = self.history.query(span[0], span[1], max_points=self._plot_points())
+        self.autoscale.set_window(window, samples)
+
+    def follow_live(self):
+        """Drop any zoom / pan and follow the selected time window again."""
+        self.view_range = None
+        self._drag = None
+        self.live_view_btn.config(state="disabled")
+        self.force_full_redraw()
+
+    # ------------------ strip chart ------------------
+    def _on_renderer_selected(self):
+        use_strip = self.renderer_cb.get() == RENDERERS[1]
+        if use_strip == self.use_strip_chart:
+            return
+        self.use_strip_chart = use_strip
+        if use_strip:
+            self.canvas.get_tk_widget().pack_forget()
+            self.strip_chart.pack(fill="both", expand=True)
+        else:
+            self.strip_chart.pack_forget()
+            self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.force_full_redraw()
+
+    def _strip_titles(self):
+        t = self.controller.translator.t
+        return [f"{t('label_voltage')} (V)", f"{t('label_current')} (A)", f"{t('label_power')} (W)"]
+
+    def _strip_source(self, window, points):
+        """Last `window` seconds of the session for a strip chart rebuild."""
+        span = self.history.time_span()
+        if span is None:
+            return self.history.tail(0)
+        return self.history.query(span[1] - window, span[1], points)
+
+    def _strip_markers(self, t_min, t_max):
+        return [(t, EVENT_COLORS.get(kind, "gray")) for t, kind, info in self.events.range(t_min, t_max)]
+
+    def _strip_window(self):
+        tw = self.time_window_cb.get()
+        try:
+            return STRIP_DEFAULT_WINDOW if tw == "All" else float(tw)
+        except ValueError:
+            return STRIP_DEFAULT_WINDOW
+
+    def _poll_logger(self):
+        """Show live-log progress, backlog and write errors."""
+        self._log_poll_id = None
+        logger = self.live_logger
+        if logger is None:
+            return
+
+        t = self.controller.translator.t
+        status = logger.status()
+        text = f"{t('label_log')}: {status['written']} {t('label_log_rows')}"
+        if status["segments"] > 1:
+            text += f" | {t('label_log_segments')}: {status['segments']}"
+        if status["backlog"]:
+            text += f" | {t('label_log_backlog')}: {status['backlog']}"
+        if status["dropped"]:
+            text += f" | {t('label_log_dropped')}: {status['dropped']}"
+        if status["error"]:
+            text += f" | {t('label_log_error')}: {status['error']}"
+        self.log_status_label.config(
+            text=text,
+            foreground="red" if status["error"] or status["dropped"] else "gray"
+        )
+
+        if logger.closed:
+            self.live_logger = None
+            return
+        self._log_poll_id = self.after(500, self._poll_logger)
+
     # ------------------ axes / view helpers ------------------
     def _create_separate_axes(self):
         """Create 3 subplots for separate view. Called once lazily."""
@@ -406,58 +717,94 @@ class GraphPage(ttk.Frame):
 
     def force_full_redraw(self):
         """Force immediate full redraw (used when user changes time window or view)."""
+        if not self.is_visible:
+            self._render_pending = True
+            return
         self._last_full_redraw = 0.0
         self.redraw(full=True)
         self._last_full_redraw = time.time()
 
-    def redraw(self, full=False):
+    def _data_span(self):
+        """(first, last) over the live session and the shown overlays, or None."""
+        spans = [s for s in [self.history.time_span()] + self.overlay_panel.time_spans() if s]
+        if not spans:
+            return None
+        return min(s[0] for s in spans), max(s[1] for s in spans)
+
+    def _plot_range(self):
+        """(t_min, t_max) of the selected live time window, or None without data."""
+        span = self._data_span()
+        if span is None:
+            return None
+        t_min, t_max = span
+
+        tw = self.time_window_cb.get()
+        if tw != "All":
+            try:
+                t_min = max(t_min, t_max - int(float(tw)))
+            except ValueError:
+                pass
+        return t_min, t_max
+
+    def _plot_points(self):
+        """About two points per pixel of canvas width."""
+        return 2 * max(self.canvas.get_tk_widget().winfo_width(), 500)
+
+    def _plot_data(self):
+        """
+        Samples for the zoomed range (or the selected time window) from the
+        history store, decimated to screen resolution. Returns (t, v, i, p) lists.
+        """
+        shown = self.view_range or self._plot_range()
+        if shown is None:
+            return [], [], [], []
+        t, v, c, p = self.history.query(shown[0], shown[1], max_points=self._plot_points())
+        return t.tolist(), v.tolist(), c.tolist(), p.tolist()
+
+    def redraw(self, full=False, data=None):
         """
         Full/partial redraw. When full=True (or called by timer), we:
-          - apply time window (All/10/30/60) to determine t_plot slice
+          - apply time window (All/10/30/60) or zoom range and read a decimated t_plot slice
           - compute ~5-6 evenly spaced tick positions and HH:MM:SS labels
           - apply manual scale if requested (manual True usually passed)
+        `data` are already fetched (t, v, i, p) lists (see set_view_range).
         If full=False, function can be used to lightly refresh layout (not used heavily here).
         """
-        if not self.time_data:
+        if self.use_strip_chart:
+            self.strip_chart.titles = self._strip_titles()
+            self.strip_chart.set_window(self._strip_window(), rebuild=False)
+            manual = not self.auto_scale_var.get() and self.manual_scale
+            self.strip_chart.set_fixed_ranges(
+                [self.manual_scale["v"], self.manual_scale["i"], self.manual_scale["p"]] if manual else None,
+                rebuild=False,
+            )
+            self.strip_chart.rebuild()
+            self._update_stats()
             return
 
-        # read full lists
-        t_list = list(self.time_data)
-        v_list = list(self.voltage_data)
-        c_list = list(self.current_data)
-        p_list = list(self.power_data)
+        if not self.time_data and not self.overlay_panel.visible_series():
+            return
 
-        # determine time window selection
-        tw = self.time_window_cb.get()
-        if tw != "All":
-            try:
-                window = int(float(tw))
-                # show last 'window' seconds
-                t_max = t_list[-1]
-                t_min = t_max - window
-                # find first index >= t_min
-                start_idx = 0
-                for idx, t in enumerate(t_list):
-                    if t >= t_min:
-                        start_idx = idx
-                        break
-                t_plot = t_list[start_idx:]
-                v_plot = v_list[start_idx:]
-                c_plot = c_list[start_idx:]
-                p_plot = p_list[start_idx:]
-            except Exception:
-                t_plot, v_plot, c_plot, p_plot = t_list, v_list, c_list, p_list
-        else:
-            t_plot, v_plot, c_plot, p_plot = t_list, v_list, c_list, p_list
+        # plotted samples for the selected time window / zoom range
+        t_plot, v_plot, c_plot, p_plot = data if data is not None else self._plot_data()
 
-        if not t_plot:
+        # x-range: the zoom range, or the time window over live data and overlays
+        shown = self.view_range or self._plot_range()
+        if shown is None:
             return
+        x_min, x_max = shown
 
-        # choose tick positions ~5-6 ticks evenly spaced across t_plot
+        # overlays and difference, each decimated on its own
+        overlays, extra_y = self._overlay_data(x_min, x_max)
+
+        # choose tick positions ~5-6 ticks evenly spaced across the x-range
         n_ticks = min(6, max(2, len(t_plot)))
-        tick_indices = [int(round(i * (len(t_plot) - 1) / (n_ticks - 1))) for i in range(n_ticks)]
-        tick_values = [t_plot[i] for i in tick_indices]
-        tick_labels = [self._seconds_to_hhmmss(tv) for tv in tick_values]
+        tick_values = [x_min + k * (x_max - x_min) / (n_ticks - 1) for k in range(n_ticks)]
+        if x_max - x_min < 2 * n_ticks:
+            # sub-second zoom: whole seconds would repeat
+            tick_labels = [f"{self._seconds_to_hhmmss(tv)}.{int(tv * 100) % 100:02d}" for tv in tick_values]
+        else:
+            tick_labels = [self._seconds_to_hhmmss(tv) for tv in tick_values]
 
         if self.combined:
             # if needed recreate axes
@@ -477,7 +824,7 @@ class GraphPage(ttk.Frame):
             self.ax1.legend()
 
             # x-limits: show exactly the time window (or full range)
-            self.ax1.set_xlim(min(t_plot), max(t_plot))
+            self.ax1.set_xlim(x_min, x_max)
 
             # xticks / labels
             try:
@@ -498,13 +845,10 @@ class GraphPage(ttk.Frame):
                 except Exception:
                     pass
             elif self.auto_scale_var.get():
-                # autoscale based on data in view
-                y_all = v_plot + c_plot if (v_plot and c_plot) else v_plot or c_plot
-                if y_all:
-                    ymin, ymax = min(y_all), max(y_all)
-                    pad = (ymax - ymin) * 0.05 if ymax != ymin else 0.5
+                limits = self._auto_limits("combined", v_plot + c_plot, extra_y[0] + extra_y[1] + extra_y[2])
+                if limits:
                     try:
-                        self.ax1.set_ylim(ymin - pad, ymax + pad)
+                        self.ax1.set_ylim(*limits)
                     except Exception:
                         pass
         else:
@@ -519,7 +863,7 @@ class GraphPage(ttk.Frame):
             # set x-limits and ticks for each subplot
             try:
                 for ax in (self.ax_voltage, self.ax_current, self.ax_power):
-                    ax.set_xlim(min(t_plot), max(t_plot))
+                    ax.set_xlim(x_min, x_max)
                     ax.set_xticks(tick_values)
                     ax.set_xticklabels(tick_labels, rotation=0)
             except Exception:
@@ -534,57 +878,144 @@ class GraphPage(ttk.Frame):
                 except Exception:
                     pass
             elif self.auto_scale_var.get():
-                # autoscale each axis to its plotted data
-                if v_plot:
-                    ymin, ymax = min(v_plot), max(v_plot)
-                    pad = (ymax - ymin) * 0.05 if ymax != ymin else 0.5
-                    try:
-                        self.ax_voltage.set_ylim(ymin - pad, ymax + pad)
-                    except Exception:
-                        pass
-                if c_plot:
-                    ymin, ymax = min(c_plot), max(c_plot)
-                    pad = (ymax - ymin) * 0.05 if ymax != ymin else 0.5
-                    try:
-                        self.ax_current.set_ylim(ymin - pad, ymax + pad)
-                    except Exception:
-                        pass
-                if p_plot:
-                    ymin, ymax = min(p_plot), max(p_plot)
-                    pad = (ymax - ymin) * 0.05 if ymax != ymin else 0.5
-                    try:
-                        self.ax_power.set_ylim(ymin - pad, ymax + pad)
-                    except Exception:
-                        pass
+                # autoscale each axis to its own channel
+                for ax, band, plotted, extra in (
+                        (self.ax_voltage, "voltage", v_plot, extra_y[0]),
+                        (self.ax_current, "current", c_plot, extra_y[1]),
+                        (self.ax_power, "power", p_plot, extra_y[2])):
+                    limits = self._auto_limits(band, plotted, extra)
+                    if limits:
+                        try:
+                            ax.set_ylim(*limits)
+                        except Exception:
+                            pass
+
+        self._draw_overlays(overlays)
+        self._draw_event_markers(x_min, x_max)
+
+        self._update_stats()
 
-        # update statistics label
+        # final draw
         try:
-            vmin = min(v_list) if v_list else 0
-            vmax = max(v_list) if v_list else 0
-            vavg = sum(v_list) / len(v_list) if v_list else 0
-            imin = min(c_list) if c_list else 0
-            imax = max(c_list) if c_list else 0
-            iavg = sum(c_list) / len(c_list) if c_list else 0
-            t = self.controller.translator.t
-            self.stats_label.config(
-                text=(
-                    f"{t('label_voltage')} - {t('label_min')}: {vmin:.4g} V | "
-                    f"{t('label_max')}: {vmax:.4g} V | "
-                    f"{t('label_avg')}: {vavg:.4g} V    ||    "
-                    f"{t('label_current')} - {t('label_min')}: {imin:.4g} A | "
-                    f"{t('label_max')}: {imax:.4g} A | "
-                    f"{t('label_avg')}: {iavg:.4g} A"
-                )
-            )
+            self.canvas.draw_idle()
         except Exception:
             pass
 
-        # final draw
+    def _update_stats(self):
+        """Show the running statistics (kept up to date in on_new_data, no rescan)."""
+        t = self.controller.translator.t
+        units = {"voltage": "V", "current": "A", "power": "W"}
+
+        def line(title, summary):
+            parts = [
+                f"{t('label_' + c)}: {t('label_avg')} {s['mean']:.4g} ± {s['std']:.3g} | "
+                f"{t('label_min')} {s['min']:.4g} | {t('label_max')} {s['max']:.4g} | "
+                f"RMS {s['rms']:.4g} | p-p {s['p2p']:.3g} {units[c]}"
+                for c, s in summary.items()
+            ]
+            return f"{title}  " + "    ||    ".join(parts)
+
+        lines = []
+        if self.stats.window is not None:
+            lines.append(line(f"{t('label_stats_window')} ({self.stats.window:g} s)", self.stats.summary(windowed=True)))
+        lines.append(line(t("label_stats_session"), self.stats.summary()))
+        if len(self.quantiles):
+            parts = []
+            for c, unit in (("voltage", "V"), ("current", "A")):
+                values = self.quantiles.quantiles(c)
+                parts.append(f"{t('label_' + c)}: " + " | ".join(
+                    f"p{q * 100:g} {x:.4g}" for q, x in zip(DEFAULT_QUANTILES, values)) + f" {unit}")
+            lines.append(f"{t('label_stats_quantiles')}  " + "    ||    ".join(parts))
         try:
-            self.canvas.draw_idle()
+            self.stats_label.config(text="\n".join(lines))
+            self.energy_label.config(text=f"{t('label_energy')}: {self.mm.energy.format()}")
         except Exception:
             pass
 
+    # ------------------ overlays ------------------
+    def toggle_overlay_panel(self):
+        self._toggle_panel(self.overlay_panel)
+
+    def toggle_capture_panel(self):
+        self._toggle_panel(self.capture_panel)
+
+    def _toggle_panel(self, panel):
+        if panel.winfo_ismapped():
+            panel.pack_forget()
+        else:
+            panel.pack(fill="x", padx=8, pady=(0, 6), after=self.top_frame)
+
+    def _overlay_data(self, x_min, x_max):
+        """
+        Decimated data of the shown overlays and the difference series in
+        [x_min, x_max]. Returns (curves, extra_y) where curves are
+        (channel, label, style, t, y) and extra_y the overlay values per
+        channel for autoscaling.
+        """
+        points = self._plot_points()
+        curves = []
+        for series in self.overlay_panel.visible_series():
+            t, *values = series.query(x_min, x_max, points)
+            for channel, y in enumerate(values):
+                curves.append((channel, f"{series.label} ({'VAP'[channel]})", "--", t, y))
+
+        diff = self.overlay_panel.difference_data(x_min, x_max, points)
+        if diff is not None:
+            channel, label, t, y = diff
+            curves.append((channel, label, ":", t, y))
+
+        extra_y = ([], [], [])
+        for channel, label, style, t, y in curves:
+            if channel < 2 or not self.combined:
+                extra_y[channel].extend(y.tolist())
+        return curves, extra_y
+
+    def _draw_overlays(self, curves):
+        """Replace the overlay artists (combined view shows V and I only, like the live lines)."""
+        for line in self._overlay_lines:
+            try:
+                line.remove()
+            except (ValueError, NotImplementedError):
+                pass  # axes were recreated, the artist is already gone
+        self._overlay_lines = []
+
+        if self.combined:
+            axes = (self.ax1, self.ax1, None)
+        else:
+            axes = (self.ax_voltage, self.ax_current, self.ax_power)
+        for channel, label, style, t, y in curves:
+            ax = axes[channel]
+            if ax is None:
+                continue
+            line, = ax.plot(t, y, style, linewidth=1, alpha=0.8, label=label)
+            self._overlay_lines.append(line)
+        for ax in set(a for a in axes if a is not None):
+            ax.legend()
+
+    def _draw_event_markers(self, x_min, x_max, limit=200):
+        """Dotted vertical lines for the events in [x_min, x_max] (at most `limit`)."""
+        for artist in self._event_artists:
+            try:
+                artist.remove()
+            except (ValueError, NotImplementedError):
+                pass  # axes were recreated, the artist is already gone
+        self._event_artists = []
+
+        events = self.events.range(x_min, x_max)
+        if len(events) > limit:
+            step = len(events) / limit
+            events = [events[int(k * step)] for k in range(limit)]
+        t = self.controller.translator.t
+        axes = self._time_axes()
+        for t_event, kind, info in events:
+            color = EVENT_COLORS.get(kind, "gray")
+            for ax in axes:
+                self._event_artists.append(ax.axvline(t_event, color=color, linestyle=":", linewidth=1))
+            self._event_artists.append(axes[0].text(
+                t_event, 1.0, t(f"label_event_{kind}"), transform=axes[0].get_xaxis_transform(),
+                rotation=90, va="top", ha="right", fontsize=7, color=color
+            ))
+
     # ------------------ utility / export / scale ------------------
     def _seconds_to_hhmmss(self, seconds_int):
         """Convert integer seconds to HH:MM:SS string (zero-padded)."""
@@ -613,6 +1044,14 @@ class GraphPage(ttk.Frame):
         self.voltage_data.clear()
         self.current_data.clear()
         self.power_data.clear()
+        self.history.clear()
+        self.events.clear()
+        self.stats.clear()
+        self.autoscale.clear()
+        self.quantiles.clear()
+        self.range_loader.clear()
+        self.view_range = None
+        self.live_view_btn.config(state="disabled")
         self.start_time = time.time()
         self.start_timestamp = self.start_time
         self._last_full_redraw = self.start_time
@@ -633,12 +1072,20 @@ class GraphPage(ttk.Frame):
                 pass
 
         self.canvas.draw_idle()
+        if self.use_strip_chart:
+            self.strip_chart.rebuild()
         self.update_text_labels(0.0, 0.0, 0.0)
 
 
     def export_csv(self):
-        """Export stored data to CSV using HH:MM:SS for time column (relative)."""
-        if not self.time_data:
+        """
+        Export the whole archived session (not just the visible window) to
+        CSV or .axs. Snapshot and formatting run in a worker, so acquisition
+        and plotting continue meanwhile.
+        """
+        if self._task is not None:
+            return
+        if not len(self.history):
             messagebox.showinfo(
                 self.controller.translator.t("msg_no_data_title"),
                 self.controller.translator.t("msg_no_data_body")
@@ -647,27 +1094,61 @@ class GraphPage(ttk.Frame):
 
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv")],
+            filetypes=[("CSV files", "*.csv"), ("AX session files", f"*{SESSION_EXT}")],
             title=self.controller.translator.t("dialog_save_csv_title"))
         if not file_path:
             return
-        try:
-            with open(file_path, mode='w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(["Time (HH:MM:SS)", "Time (s)", "Voltage (V)", "Current (A)", "Power (W)"])
-                for t, v, c, p in zip(self.time_data, self.voltage_data, self.current_data, self.power_data):
-                    hh = self._seconds_to_hhmmss(t)
-                    writer.writerow([hh, str(int(t)), f"{v:.6f}", f"{c:.6f}", f"{p:.6f}"])
+
+        metadata = self._session_metadata()
+        metadata["stats"] = self.stats.summary()
+        metadata["quantiles"] = self.quantiles.to_dict()
+        stats_lines = self.stats.header_lines() + self.quantiles.header_lines()
+        history = self.history
+        events = self.events.all()
+
+        def save(task):
+            t, v, c, p = history.snapshot()
+            try:
+                if is_session_file(file_path):
+                    write_session(file_path, t, v, c, p, metadata, events=events)
+                else:
+                    write_csv(file_path, t, v, c, p, header_lines=stats_lines, task=task, events=events)
+            except TaskCancelled:
+                os.remove(file_path)
+                raise
+            return len(t)
+
+        def done(count):
+            self._end_task()
             messagebox.showinfo(
                 self.controller.translator.t("msg_export_success_title"),
                 f"{self.controller.translator.t('msg_export_success_body')}\n{file_path}"
             )
-        except Exception as e:
+
+        def failed(e):
+            self._end_task()
             messagebox.showerror(
-                self.translator.t("msg_export_failed_title"),
+                self.controller.translator.t("msg_export_failed_title"),
                 f"{self.controller.translator.t('msg_export_failed_body')}\n{e}"
             )
 
+        self._start_task(save, done, failed, "label_exporting")
+
+    def _session_metadata(self):
+        """Metadata stored in the header of .axs session files."""
+        meta = {
+            "format": "ax6003p-session",
+            "start_time": self.start_timestamp,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "interval_ms": self.mm.interval,
+            "ovp": self.mm.get_ovp(),
+            "ocp": self.mm.get_ocp(),
+        }
+        control = getattr(self.controller, "frames", {}).get("ControlPage")
+        if control is not None:
+            meta["setpoints"] = {"voltage": control.set_voltage, "current": control.set_current}
+        return meta
+
     def apply_manual_scale(self):
         """Read numeric inputs and apply as manual scales (and disable autoscale)."""
         try:
@@ -724,69 +1205,134 @@ class GraphPage(ttk.Frame):
         except Exception:
             pass
 
-    def _update_axes_limits(self, x, y_v, y_c):
-        """Incrementally expand axes limits so new points appear immediately."""
-        if self.combined:
-            # X-axis
-            xmin, xmax = self.ax1.get_xlim()
+    def _update_axes_limits(self, x):
+        """
+        Expand the x-axis so new points appear immediately. Y-limits are
+        left alone; they change with the full redraw forced when the
+        autoscale band moves.
+        """
+        for ax_ in ((self.ax1,) if self.combined else (self.ax_voltage, self.ax_current, self.ax_power)):
+            xmin, xmax = ax_.get_xlim()
             if x > xmax:
-                self.ax1.set_xlim(xmin, x + 1)
-            # Y-axis auto-scale
-            if self.auto_scale_var.get():
-                ymin, ymax = self.ax1.get_ylim()
-                new_min = min(ymin, y_v, y_c)
-                new_max = max(ymax, y_v, y_c)
-                self.ax1.set_ylim(new_min, new_max)
-        else:
-            for ax_, y in zip([self.ax_voltage, self.ax_current, self.ax_power],
-                            [y_v, y_c, y_v*y_c]):
-                xmin, xmax = ax_.get_xlim()
-                if x > xmax:
-                    ax_.set_xlim(xmin, x + 1)
-                if self.auto_scale_var.get():
-                    ymin, ymax = ax_.get_ylim()
-                    new_min = min(ymin, y)
-                    new_max = max(ymax, y)
-                    ax_.set_ylim(new_min, new_max)
+                ax_.set_xlim(xmin, x + 1)
+
+    def _auto_limits(self, band, plotted, extra):
+        """
+        Autoscale y-limits for a band. While following live data they come
+        from the running window extrema (O(1)); zoomed views use the plotted,
+        screen-sized data. Overlay values in `extra` are always included.
+        """
+        limits = self.autoscale.limits(band) if self.view_range is None else None
+        if limits is not None:
+            if not extra:
+                return limits
+            return min(limits[0], min(extra)), max(limits[1], max(extra))
+        y_all = plotted + extra
+        if not y_all:
+            return None
+        ymin, ymax = min(y_all), max(y_all)
+        pad = (ymax - ymin) * 0.05 if ymax != ymin else 0.5
+        return ymin - pad, ymax + pad
 
 
     def import_csv(self):
-        """Import a CSV file and plot its data on the graph."""
+        """
+        Import a CSV / .axs file (optionally gzip'ed) or a rotated-log
+        manifest in a worker and plot its data on the graph.
+        """
+        # importing replaces the history; live samples would then land before
+        # the imported ones and break the store's time order
+        if self._task is not None or self.running:
+            return
+
         file_path = filedialog.askopenfilename(
             title=self.controller.translator.t("dialog_open_csv_title"),
-            filetypes=[("CSV files", "*.csv")]
+            filetypes=LOG_FILETYPES
         )
         if not file_path:
             return
 
-        try:
-            time_list, voltage_list, current_list, power_list = [], [], [], []
-            with open(file_path, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Expect columns: Time (HH:MM:SS), Voltage (V), Current (A), Power (W)
-                    hh, mm, ss = map(int, row["Time (HH:MM:SS)"].split(":"))
-                    seconds = hh*3600 + mm*60 + ss
-                    time_list.append(seconds)
-                    voltage_list.append(float(row["Voltage (V)"]))
-                    current_list.append(float(row["Current (A)"]))
-                    power_list.append(float(row["Power (W)"]))
-
-            # Replace current graph data
-            self.time_data = deque(time_list, maxlen=self.max_points)
-            self.voltage_data = deque(voltage_list, maxlen=self.max_points)
-            self.current_data = deque(current_list, maxlen=self.max_points)
-            self.power_data = deque(power_list, maxlen=self.max_points)
+        rows_label = self.controller.translator.t("label_log_rows")
+
+        def load(task):
+            # parse into a fresh store so a cancelled import leaves the current data intact
+            store = HistoryStore()
+            events = EventLog()
+            stats = SessionStats()
+            quantiles = QuantileRollup()
+            recorded = []
+            for t, v, c, p, fraction in iter_log_chunks(file_path, events=recorded):
+                task.check_cancelled()
+                store.extend(t, v, c, p)
+                stats.extend(t, v, c, p)
+                quantiles.extend(t, v, c, p)
+                task.progress(fraction, f"{len(store)} {rows_label}")
+            events.extend(recorded)
+            return store, events, stats, quantiles
+
+        def done(result):
+            self._end_task()
+            if self.running:
+                # acquisition was started while the file was loading
+                messagebox.showerror(
+                    self.controller.translator.t("msg_import_failed_title"),
+                    self.controller.translator.t("msg_import_while_running"))
+                return
+            # Replace current graph data; the deques keep the most recent tail
+            store, self.events, self.stats, self.quantiles = result
+            self.history = store
+            self._reset_window_state()
+            self.range_loader.clear()
+            self.view_range = None
+            self.live_view_btn.config(state="disabled")
+            t_tail, v_tail, c_tail, p_tail = store.tail(self.max_points)
+            self.time_data = deque(t_tail.tolist(), maxlen=self.max_points)
+            self.voltage_data = deque(v_tail.tolist(), maxlen=self.max_points)
+            self.current_data = deque(c_tail.tolist(), maxlen=self.max_points)
+            self.power_data = deque(p_tail.tolist(), maxlen=self.max_points)
 
             # Force redraw
             self.force_full_redraw()
-       
+
             messagebox.showinfo(
                 self.controller.translator.t("msg_import_success_title"),
                 f"{self.controller.translator.t('msg_import_success_body')}\n{file_path}"
             )
-        except Exception as e:
+
+        def failed(e):
+            self._end_task()
             messagebox.showerror(
                 self.controller.translator.t("msg_import_failed_title"),
                 f"{self.controller.translator.t('msg_import_failed_body')}\n{e}"
             )
+
+        self._start_task(load, done, failed, "label_importing")
+
+    # ------------------ background tasks ------------------
+    def _start_task(self, fn, on_done, on_error, label_key):
+        """Run fn in a worker and show a progress bar with a Cancel button."""
+        self.task_label.config(text=self.controller.translator.t(label_key))
+        self.task_progress.config(value=0.0)
+        self.task_frame.pack(fill="x", padx=8, after=self.top_frame)
+        self.import_btn.config(state="disabled")
+        self.export_btn.config(state="disabled")
+
+        def progress(fraction, text):
+            self.task_progress.config(value=fraction)
+            if text:
+                self.task_label.config(text=f"{self.controller.translator.t(label_key)} {text}")
+
+        self._task = BackgroundTask(
+            self, fn, on_done=on_done, on_error=on_error,
+            on_progress=progress, on_cancel=lambda _: self._end_task()
+        ).start()
+
+    def cancel_task(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    def _end_task(self):
+        self._task = None
+        self.task_frame.pack_forget()
+        self.import_btn.config(state="disabled" if self.running else "normal")
+        self.export_btn.config(state="normal" if len(self.history) else "disabled")
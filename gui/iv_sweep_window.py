@@ -0,0 +1,164 @@
+# iv_sweep_window.py
+import queue
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from device.iv_sweep import COLUMNS, IVSweep, sweep_points
+
+POLL_MS = 50
+
+
+class IVSweepWindow(tk.Toplevel):
+    """
+    I-V curve tracer window: start / stop / step grid, optional current
+    compliance, live I(V) plot of the sweep table and CSV export. The
+    sweep runs on its own thread (device.iv_sweep.IVSweep); points come
+    back through a queue polled here.
+    """
+
+    def __init__(self, parent, controller, device, mm, restore=None):
+        super().__init__(parent)
+        self.controller = controller
+        self.mm = mm
+        self.restore = restore      # () -> (voltage, current) to put back afterwards
+        self.sweep = IVSweep(device)
+        self._queue = queue.Queue()
+        self._poll_id = None
+        self._started = 0.0
+
+        t = controller.translator.t
+        self.title(t("label_iv_sweep"))
+        self.geometry("720x560")
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        row = ttk.Frame(self)
+        row.pack(fill="x", padx=8, pady=(8, 2))
+        self.entries = {}
+        for key, default in (("start", "0"), ("stop", "5"), ("step", "0.1"),
+                             ("compliance", ""), ("settle", "2")):
+            ttk.Label(row, text=t(f"label_iv_{key}")).pack(side="left", padx=(6, 2))
+            entry = ttk.Entry(row, width=7)
+            entry.insert(0, default)
+            entry.pack(side="left")
+            self.entries[key] = entry
+
+        row = ttk.Frame(self)
+        row.pack(fill="x", padx=8, pady=2)
+        self.stop_at_compliance = tk.BooleanVar(value=True)
+        ttk.Checkbutton(row, text=t("checkbox_iv_stop_compliance"), variable=self.stop_at_compliance).pack(side="left")
+        self.start_btn = ttk.Button(row, text=t("button_iv_start"), command=self.start)
+        self.start_btn.trans_key = "button_iv_start"
+        self.start_btn.pack(side="left", padx=(12, 4))
+        self.stop_btn = ttk.Button(row, text=t("button_iv_stop"), command=self.sweep.stop, state="disabled")
+        self.stop_btn.trans_key = "button_iv_stop"
+        self.stop_btn.pack(side="left")
+        self.save_btn = ttk.Button(row, text=t("button_capture_save"), command=self.save, state="disabled")
+        self.save_btn.pack(side="left", padx=4)
+        self.status_label = ttk.Label(row, text="")
+        self.status_label.pack(side="left", padx=8)
+
+        self.fig = Figure()
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_xlabel(f"{t('label_voltage')} (V)")
+        self.ax.set_ylabel(f"{t('label_current')} (A)")
+        self.ax.grid(True)
+        (self.line,) = self.ax.plot([], [], marker=".", markersize=4)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=8, pady=6)
+
+    # ------------------ sweep ------------------
+    def start(self):
+        t = self.controller.translator.t
+        try:
+            points = sweep_points(float(self.entries["start"].get()), float(self.entries["stop"].get()),
+                                  float(self.entries["step"].get()))
+            text = self.entries["compliance"].get().strip()
+            compliance = float(text) if text else None
+            settle_max = max(0.0, float(self.entries["settle"].get()))
+            if points.min() < 0 or points.max() > self.mm.ovp_limit:
+                raise ValueError(f"Sweep leaves 0..{self.mm.ovp_limit} V")
+            if compliance is not None and not 0 < compliance <= self.mm.ocp_limit:
+                raise ValueError(f"Compliance outside 0..{self.mm.ocp_limit} A")
+        except ValueError as e:
+            messagebox.showerror(t("msg_error_title"), f"{t('msg_invalid_sweep')}\n{e}", parent=self)
+            return
+
+        self.line.set_data([], [])
+        self.canvas.draw_idle()
+        self._started = time.perf_counter()
+        self.sweep.start(
+            points, compliance=compliance, stop_at_compliance=self.stop_at_compliance.get(),
+            settle_max=settle_max, restore=self.restore() if self.restore else None,
+            on_point=lambda k, row: self._queue.put(("point", k)),
+            on_done=lambda error: self._queue.put(("done", error)),
+        )
+        self._total = len(points)
+        self.start_btn.config(state="disabled")
+        self.stop_btn.config(state="normal")
+        self.save_btn.config(state="disabled")
+        if self._poll_id is None:
+            self._poll_id = self.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        finished, error = False, None
+        while True:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "done":
+                finished, error = True, payload
+
+        # redraw once per poll with everything measured so far
+        rows = self.sweep.results
+        self.line.set_data(rows[:, 1], rows[:, 2])
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
+        self._update_status(rows, error)
+
+        if finished:
+            self.start_btn.config(state="normal")
+            self.stop_btn.config(state="disabled")
+            self.save_btn.config(state="normal" if len(rows) else "disabled")
+        else:
+            self._poll_id = self.after(POLL_MS, self._poll)
+
+    def _update_status(self, rows, error):
+        t = self.controller.translator.t
+        n = len(rows)
+        per_point = (time.perf_counter() - self._started) / n * 1000 if n else 0.0
+        text = f"{n}/{self._total} | {per_point:.1f} ms/{t('label_iv_point')}"
+        if self.sweep.compliance_hit:
+            text += f" | {t('label_iv_compliance_hit')}"
+        if error:
+            text += f" | {error}"
+        self.status_label.config(text=text, foreground="red" if error else "black")
+
+    def save(self):
+        t = self.controller.translator.t
+        path = filedialog.asksaveasfilename(
+            parent=self, defaultextension=".csv",
+            initialfile=f"iv_sweep_{time.strftime('%Y%m%d_%H%M%S')}.csv",
+            filetypes=[("CSV files", "*.csv")], title=t("dialog_save_csv_title"))
+        if not path:
+            return
+        try:
+            np.savetxt(path, self.sweep.results, delimiter=",", header=",".join(COLUMNS), comments="", fmt="%.6g")
+        except Exception as e:
+            messagebox.showerror(t("msg_export_failed_title"), f"{t('msg_export_failed_body')}\n{e}", parent=self)
+            return
+        messagebox.showinfo(t("msg_export_success_title"), f"{t('msg_export_success_body')}\n{path}", parent=self)
+
+    def close(self):
+        self.sweep.stop()
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.destroy()
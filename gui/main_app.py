@@ -1,21 +1,34 @@
+import importlib
 import tkinter as tk
 from ttkthemes import ThemedTk
 from PIL import Image, ImageTk, ImageOps
 import sys,os
 
-from gui.status_page import StatusPage
 from gui.measurement_manager import MeasurementManager
-from gui.config_page import ConfigPage
-from gui.control_page import ControlPage
-from gui.protection_page import ProtectionPage
-from gui.graph_page import GraphPage
-from gui.info_page import InfoPage
+from utils.settings_store import SettingsStore
 from utils.translation_utils import Translator
 
+# page name -> module; a page's module (and what it imports, e.g. matplotlib)
+# is loaded when the page is first built
+PAGE_MODULES = {
+    "ConfigPage": "gui.config_page",
+    "StatusPage": "gui.status_page",
+    "ControlPage": "gui.control_page",
+    "ProtectionPage": "gui.protection_page",
+    "GraphPage": "gui.graph_page",
+    "AnalysisPage": "gui.analysis_page",
+    "InfoPage": "gui.info_page",
+}
+# pages built in the background after the first paint; GraphPage first, it records the history
+WARMUP_ORDER = ("GraphPage", "ControlPage", "ProtectionPage", "StatusPage", "AnalysisPage", "InfoPage")
+WARMUP_DELAY_MS = 300
+
+
 class MainApp(ThemedTk):
     def __init__(self, device):
         super().__init__(theme="breeze")
         self.translator = Translator('en')  # Default language
+        self.settings = SettingsStore()      # loaded once, shared by all pages
         self.title(self.translator.t("app_title"))
         self.geometry("800x640")
         self.device = device
@@ -34,6 +47,7 @@ class MainApp(ThemedTk):
             ("ControlPage", "nav_control", "control.png"),
             ("ProtectionPage", "nav_protection", "protection.png"),
             ("GraphPage", "nav_logging", "graph.png"),
+            ("AnalysisPage", "nav_analysis", "graph.png"),
             ("InfoPage", "nav_about", "about.png")
         ]
         self.nav_buttons = {}
@@ -59,10 +73,11 @@ class MainApp(ThemedTk):
             print(f"[WARN] Could not load connection icons: {e}")
             self.icon_connected = self.icon_disconnected = self.icon_simulation = None
 
-        # Icon label
+        # Icon label (one is_connected() check: on hardware it is an *IDN? round trip)
+        connected = self.device.is_connected()
         self.connection_icon_label = tk.Label(
             status_frame,
-            image=self.icon_connected if self.device.is_connected() else self.icon_disconnected,
+            image=self.icon_connected if connected else self.icon_disconnected,
             bg="#e0e0e0"
         )
         self.connection_icon_label.pack()
@@ -70,10 +85,10 @@ class MainApp(ThemedTk):
         # Optional tooltip text under icon
         self.connection_text_label = tk.Label(
             status_frame,
-            text="Connected" if self.device.is_connected() else "Disconnected",
+            text="Connected" if connected else "Disconnected",
             font=("Helvetica", 9, "italic"),
             bg="#e0e0e0",
-            fg="#2ecc71" if self.device.is_connected() else "#e74c3c"
+            fg="#2ecc71" if connected else "#e74c3c"
         )
         self.connection_text_label.pack()
 
@@ -82,6 +97,7 @@ class MainApp(ThemedTk):
         container.pack(fill="both", expand=True)
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
+        self.container = container
 
         # ---------------- Measurement Manager ----------------
         self.mm = MeasurementManager(self, self.device)
@@ -96,17 +112,11 @@ class MainApp(ThemedTk):
 
         self.mm.subscribe_connection_status(connection_callback)
         # ---------------- Frames dictionary ----------------
+        # pages are built on first show_frame() (see get_page) or by the warm-up
         self.frames = {}
-        for PageClass in (ConfigPage, StatusPage, ControlPage, ProtectionPage, GraphPage, InfoPage):
-            page_name = PageClass.__name__
-            frame = PageClass(container, self, self.device, self.mm)
-            self.frames[page_name] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
-            self._update_widget_texts(frame)
 
-        # ----------- Initialize MM from ProtectionPage ---------
-        protection_page = self.frames["ProtectionPage"]
-        initial_limits = protection_page.get_initial_limits()  # <-- NEW
+        # ----------- Initialize MM from the protection defaults ---------
+        initial_limits = self.settings.get("protection")
         self.mm.set_ovp(initial_limits["ovp_enabled"], initial_limits["ovp_limit"])
         self.mm.set_ocp(initial_limits["ocp_enabled"], initial_limits["ocp_limit"])
 
@@ -126,17 +136,11 @@ class MainApp(ThemedTk):
         def set_active_page(name):
             self.active_page = name
             for page, btn in self.nav_buttons.items():
-                if page == name:
-                    btn.config(bg="#ffffff")  # Active
-                    if self.nav_icons[page]:
-                        btn.image = ImageTk.PhotoImage(self.nav_icons[page])
-                        btn.config(image=btn.image)
-                else:
-                    btn.config(bg="#e0e0e0")  # Inactive
-                    if self.nav_icons[page]:
-                        disabled_img = make_icon_disabled(self.nav_icons[page], opacity=0.3)
-                        btn.image = ImageTk.PhotoImage(disabled_img)
-                        btn.config(image=btn.image)
+                btn.config(bg="#ffffff" if page == name else "#e0e0e0")  # Active / inactive
+                if self.nav_icons[page]:
+                    # (active, dimmed) images are made once, in the loop below
+                    btn.image = self.nav_icons[page][0 if page == name else 1]
+                    btn.config(image=btn.image)
 
             self.show_frame(name)
 
@@ -148,7 +152,9 @@ class MainApp(ThemedTk):
                 print(f"[WARN] Could not load icon {filename}: {e}")
                 img = None
 
-            self.nav_icons[page_name] = img
+            self.nav_icons[page_name] = (
+                (ImageTk.PhotoImage(img), ImageTk.PhotoImage(make_icon_disabled(img, opacity=0.3))) if img else None
+            )
 
             btn_frame = tk.Frame(self.navar_frame, bg="#e0e0e0")
             btn_frame.pack(side="left", expand=True, fill="both")
@@ -166,10 +172,7 @@ class MainApp(ThemedTk):
 
             # Assign initial icon (disabled if not active)
             if img:
-                if page_name == "ConfigPage":  # initial active page
-                    tk_img = ImageTk.PhotoImage(img)
-                else:
-                    tk_img = ImageTk.PhotoImage(make_icon_disabled(img, opacity=0.3))
+                tk_img = self.nav_icons[page_name][0 if page_name == "ConfigPage" else 1]  # initial active page
                 btn.config(image=tk_img)
                 btn.image = tk_img  # keep reference
         
@@ -182,6 +185,33 @@ class MainApp(ThemedTk):
 
         # ---------------- Show initial page ----------------
         set_active_page("ConfigPage")
+        self.after(WARMUP_DELAY_MS, self._warm_up)
+
+    def get_page(self, page_name):
+        """The page, built (module imported, widgets created, texts translated) on first use."""
+        frame = self.frames.get(page_name)
+        if frame is None:
+            PageClass = getattr(importlib.import_module(PAGE_MODULES[page_name]), page_name)
+            frame = PageClass(self.container, self, self.device, self.mm)
+            self.frames[page_name] = frame
+            frame.grid(row=0, column=0, sticky="nsew")
+            self._update_widget_texts(frame)
+            if page_name != self.active_page:
+                frame.lower()   # built in the background: keep the visible page on top
+        return frame
+
+    def _warm_up(self):
+        """Build the next not yet built page, one per call, so the window stays responsive."""
+        for page_name in WARMUP_ORDER:
+            if page_name not in self.frames:
+                try:
+                    self.get_page(page_name)
+                except Exception as e:
+                    print(f"[ERROR] Could not build {page_name}: {e}")
+                    continue
+                self.after_idle(lambda: self.after(1, self._warm_up))
+                return
+
     def show_frame(self, page_name):
         # Call on_hide for all frames first
         for name, frame in self.frames.items():
@@ -189,7 +219,7 @@ class MainApp(ThemedTk):
                 frame.on_hide()
 
         # Raise the selected frame
-        frame = self.frames[page_name]
+        frame = self.get_page(page_name)
         frame.tkraise()
 
         # Call on_show for the selected frame
@@ -198,46 +228,37 @@ class MainApp(ThemedTk):
     def update_connection_status_icon(self, connected: bool, simulation: bool = False):
         """Update connection status icon and text in the nav bar."""
 
-        base_path = os.path.join(os.path.dirname(__file__), "..", "assets")
-
         # ✅ Force to simulation mode if simulation is active
         t = self.translator.t
 
         if self.simulation_active:
-            icon_file = "simulation.png"
+            icon = self.icon_simulation
             text = t("status_simulation")
             color = "#3498db"  # Blue
 
         # ✅ Strict priority: Simulation ONLY if simulation=True AND connected=True
         elif simulation and connected:
-            icon_file = "simulation.png"
+            icon = self.icon_simulation
             text = t("status_simulation")
             color = "#3498db"  # Blue
 
         elif connected:
-            icon_file = "connected.png"
+            icon = self.icon_connected
             text = t("status_connected")
             color = "#2ecc71"  # Green
 
         else:
-            icon_file = "disconnected.png"
+            icon = self.icon_disconnected
             text = t("status_disconnected")
             color = "#e74c3c"  # Red
 
-        icon_path = os.path.join(base_path, icon_file)
-
-        try:
-            img = Image.open(icon_path).resize((28, 28), Image.Resampling.LANCZOS)
-        except Exception as e:
-            print(f"[WARN] Could not load connection icon: {e}")
-            return
-
-        tk_img = ImageTk.PhotoImage(img)
-        self.connection_icon_label.config(image=tk_img)
-        self.connection_icon_label.image = tk_img
+        # icons were decoded and resized once, in __init__
+        if icon is not None:
+            self.connection_icon_label.config(image=icon)
+            self.connection_icon_label.image = icon
         self.connection_text_label.config(text=text, fg=color)
 
-        print(f"[DEBUG] Icon updated -> {text} ({icon_file})")
+        print(f"[DEBUG] Icon updated -> {text}")
 
     def update_nav_labels(self):
         for page_name, btn in self.nav_buttons.items():
@@ -263,6 +284,12 @@ class MainApp(ThemedTk):
             # Update text if trans_key exists
             if hasattr(widget, "trans_key"):
                 widget.config(text=self.translator.t(widget.trans_key))
+            # Comboboxes list translated choices under trans_values; keep the selection
+            if hasattr(widget, "trans_values"):
+                index = widget.current()
+                widget.config(values=[self.translator.t(key) for key in widget.trans_values])
+                if index >= 0:
+                    widget.current(index)
             # Recurse into nested frames, tabs, labelframes, etc.
             if widget.winfo_children():
                 self._update_widget_texts(widget)
@@ -276,11 +303,16 @@ class MainApp(ThemedTk):
     def on_close(self):
         """Properly stop threads and close the app."""
         print("[INFO] Closing application...")
+        self.settings.flush()
         try:
             # Stop measurement manager thread safely
             if hasattr(self, "mm") and self.mm.is_running:
                 self.mm.stop()
 
+            status_page = self.frames.get("StatusPage")
+            if status_page is not None and status_page.poller is not None:
+                status_page.poller.stop()
+
             # Disconnect device if needed
             if hasattr(self, "device") and self.device.is_connected():
                 try:
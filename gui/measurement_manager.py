@@ -1,4 +1,10 @@
 import tkinter as tk
+import time
+
+from device.status import decode_status
+from utils.energy_meter import EnergyMeter
+
+VERIFY_SHADOW_S = 30.0  # how often the device's state shadow is checked against the instrument
 
 class MeasurementManager:
     def __init__(self, root, device, interval=1000):
@@ -8,6 +14,8 @@ class MeasurementManager:
         self.subscribers = []                # measurement callbacks
         self.protection_subscribers = []     # protection event callbacks
         self.limit_callbacks = []            # new: callbacks for OVP/OCP changes
+        self.event_subscribers = []          # timeline events (setpoint changes, trips)
+        self.mode_subscribers = []           # regulation mode / fault changes
 
         # Latest measurement values
         self.latest_voltage = 0.0
@@ -15,6 +23,15 @@ class MeasurementManager:
         self.latest_power = 0.0
         self.running = False
         self._after_id = None  # keep track of scheduled callback
+        self._in_measure = False  # inside _measure(): it reschedules itself when done
+        self._shadow_checked = time.monotonic()
+
+        # Regulation mode ("CV", "CC", "OFF", None = unknown) and faults from the status registers
+        self.mode = None
+        self.faults = ()
+
+        # Energy (Wh) / charge (Ah) totals, integrated in the acquisition loop
+        self.energy = EnergyMeter()
 
         # --- Protection Settings ---
         self.ovp_enabled = False
@@ -61,14 +78,26 @@ class MeasurementManager:
         self.protection_tripped = None
 
     # ---------- Measurement Control ----------
+    def set_interval(self, interval):
+        """Change the polling interval (ms); takes effect immediately."""
+        self.interval = max(1, int(interval))
+        # called from a subscriber (e.g. a trigger capture finishing), _measure
+        # picks the new interval up when it reschedules; rescheduling here too
+        # would start a second loop
+        if self.running and not self._in_measure and self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = self.root.after(self.interval, self._measure)
+
     def start(self):
         if not self.running:
             self.running = True
-            self._measure()
+            if not self._in_measure:
+                self._measure()
 
     def stop(self):
         """Stop measurement loop safely."""
         self.running = False
+        self.energy.break_chain()  # the stopped time is not integrated
         if self._after_id is not None:
             try:
                 self.root.after_cancel(self._after_id)
@@ -84,35 +113,93 @@ class MeasurementManager:
     def subscribe_protection(self, callback):
         self.protection_subscribers.append(callback)
         
+    def subscribe_events(self, callback):
+        """callback(kind, timestamp, info) for setpoint changes, protection trips, ..."""
+        self.event_subscribers.append(callback)
+
+    def post_event(self, kind, timestamp=None, **info):
+        """Broadcast a timeline event, stamped with the wall-clock time (or `timestamp`)."""
+        ts = time.time() if timestamp is None else timestamp
+        for callback in self.event_subscribers:
+            try:
+                callback(kind, ts, info)
+            except Exception as e:
+                print(f"[WARN] Event callback failed: {e}")
+
+    def subscribe_mode(self, callback):
+        """callback(mode, faults), called now and whenever either changes."""
+        self.mode_subscribers.append(callback)
+        callback(self.mode, self.faults)
+
+    def _update_mode(self, mode, faults):
+        """Cache the decoded status; subscribers only hear about changes."""
+        if (mode, faults) == (self.mode, self.faults):
+            return
+        self.mode, self.faults = mode, faults
+        for callback in self.mode_subscribers:
+            try:
+                callback(mode, faults)
+            except Exception as e:
+                print(f"[WARN] Mode callback failed: {e}")
+
     def subscribe_connection_status(self, callback):
         self._connection_callback = callback
         self._last_connection_state = None  # track last state to avoid spamming
 
     # ---------- Main Measurement Loop ----------
     def _measure(self):
+        self._after_id = None
         if not self.running:
             return
-
-        # --- Check connection state and notify if changed ---
-        current_state = self.device.is_connected()
-        if hasattr(self, "_connection_callback") and current_state != getattr(self, "_last_connection_state", None):
-            try:
-                self._connection_callback(current_state)
-            except Exception as e:
-                print(f"[WARN] Connection callback failed: {e}")
-            self._last_connection_state = current_state
+        self._in_measure = True
+        try:
+            self._measure_once()
+        finally:
+            self._in_measure = False
+        # ✅ Store the after() ID so it can be canceled later (not if a subscriber stopped us)
+        if self.running:
+            self._after_id = self.root.after(self.interval, self._measure)
+
+    def _measure_once(self):
+        # --- Connection state ---
+        # While connected, the batched read below is the connection check (an
+        # exception means the device is gone); is_connected() costs an *IDN?
+        # round trip on hardware and is only spent on finding the device again.
+        was_connected = getattr(self, "_last_connection_state", None)
+        connected = bool(was_connected) or self.device.is_connected()
+        if connected and not was_connected:
+            # (re)connected: the instrument may have been power-cycled meanwhile
+            invalidate = getattr(self.device, "invalidate_shadow", None)
+            if invalidate:
+                invalidate()
 
         # --- Read measurements ---
-        if self.device.is_connected():
+        v, i, p = 0.0, 0.0, 0.0
+        if connected:
             try:
-                v = self.device.read_voltage()
-                i = self.device.read_current()
-                p = self.device.read_power()
+                # one locked round trip (with the status registers), so a
+                # sequencer step never lands between the reads
+                with self.device.io_lock:
+                    v, i, p, oper, ques = self.device.read_all_with_status()
+                self.energy.add(time.monotonic(), i, p)
+                self._update_mode(*decode_status(oper, ques))
+                self._verify_shadow()
             except Exception as e:
                 print(f"[WARN] Measurement failed: {e}")
                 v, i, p = 0.0, 0.0, 0.0
-        else:
-            v, i, p = 0.0, 0.0, 0.0
+                connected = False
+        if not connected:
+            self.energy.break_chain()
+            self._update_mode(None, ())
+
+        # --- Notify connection changes ---
+        if connected != was_connected:
+            if hasattr(self, "_connection_callback"):
+                try:
+                    self._connection_callback(connected)
+                except Exception as e:
+                    print(f"[WARN] Connection callback failed: {e}")
+            self._last_connection_state = connected
 
         self.latest_voltage = v
         self.latest_current = i
@@ -136,8 +223,19 @@ class MeasurementManager:
             except Exception as e:
                 print(f"[WARN] Measurement callback failed: {e}")
 
-        # ✅ Store the after() ID so it can be canceled later
-        self._after_id = self.root.after(self.interval, self._measure)
+    def _verify_shadow(self):
+        """Every VERIFY_SHADOW_S, drop shadowed settings changed behind the app's back (front panel)."""
+        verify = getattr(self.device, "verify_shadow", None)
+        if verify is None or time.monotonic() - self._shadow_checked < VERIFY_SHADOW_S:
+            return
+        self._shadow_checked = time.monotonic()
+        try:
+            with self.device.io_lock:
+                changed = verify()
+            if changed:
+                print(f"[INFO] Instrument settings changed externally: {', '.join(changed)}")
+        except Exception as e:
+            print(f"[WARN] Shadow check failed: {e}")
 
     # ---------- Protection Handling ----------
     def _handle_trip(self):
@@ -146,6 +244,8 @@ class MeasurementManager:
         except Exception as e:
             print(f"[ERROR] Could not disable output after protection trip: {e}")
 
+        self.post_event("protection", source=self.protection_tripped)
+
         for callback in self.protection_subscribers:
             try:
                 callback(self.protection_tripped)
@@ -0,0 +1,234 @@
+# overlay_panel.py
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from utils.background import BackgroundTask
+from utils.live_logger import format_hhmmss
+from utils.log_reader import LOG_FILETYPES
+from utils.session_overlay import CHANNELS, OverlaySeries, difference
+
+MAX_PARALLEL_LOADS = 2
+
+
+class OverlayPanel(ttk.LabelFrame):
+    """
+    Recorded sessions overlaid on the Graph page, each with its own time
+    offset, plus an optional difference series between two sources (the
+    live session or any overlay).
+
+    Files are read by background workers, at most MAX_PARALLEL_LOADS at a
+    time and only while the series is shown, so adding a dozen long runs
+    does not block the UI.
+    """
+
+    def __init__(self, parent, graph):
+        super().__init__(parent, text="")
+        self.trans_key = "label_overlays"
+        self.graph = graph
+        self.series = []
+        self._loads = {}   # OverlaySeries -> BackgroundTask
+        self._items = {}   # OverlaySeries -> tree item id
+
+        t = graph.controller.translator.t
+
+        self.tree = ttk.Treeview(self, columns=("offset", "span", "state"), show="tree headings", height=4)
+        self.tree.heading("#0", text=t("label_overlay_file"))
+        self.tree.heading("offset", text=t("label_overlay_offset"))
+        self.tree.heading("span", text=t("label_overlay_span"))
+        self.tree.heading("state", text=t("label_overlay_state"))
+        self.tree.column("#0", width=220)
+        for col in ("offset", "span", "state"):
+            self.tree.column(col, width=90, anchor="center")
+        self.tree.pack(side="left", fill="x", expand=True, padx=6, pady=4)
+        self.tree.bind("<<TreeviewSelect>>", lambda e: self._show_selected_offset())
+
+        controls = ttk.Frame(self)
+        controls.pack(side="left", fill="y", padx=6, pady=4)
+
+        row = ttk.Frame(controls)
+        row.pack(fill="x", pady=2)
+        for key, command in (("button_add_overlay", self.add_files),
+                             ("button_remove_overlay", self.remove_selected),
+                             ("button_toggle_overlay", self.toggle_selected)):
+            btn = ttk.Button(row, text="", command=command)
+            btn.trans_key = key
+            btn.pack(side="left", padx=2)
+
+        row = ttk.Frame(controls)
+        row.pack(fill="x", pady=2)
+        offset_label = ttk.Label(row, text="")
+        offset_label.trans_key = "label_overlay_offset"
+        offset_label.pack(side="left")
+        self.offset_entry = ttk.Entry(row, width=8)
+        self.offset_entry.pack(side="left", padx=4)
+        self.offset_entry.bind("<Return>", lambda e: self.apply_offset())
+        offset_btn = ttk.Button(row, text="", command=self.apply_offset)
+        offset_btn.trans_key = "button_apply_offset"
+        offset_btn.pack(side="left", padx=2)
+
+        # difference A - B of one channel
+        row = ttk.Frame(controls)
+        row.pack(fill="x", pady=2)
+        self.diff_var = tk.BooleanVar(value=False)
+        diff_cb = ttk.Checkbutton(row, text="", variable=self.diff_var, command=self.graph.force_full_redraw)
+        diff_cb.trans_key = "checkbox_difference"
+        diff_cb.pack(side="left")
+        self.diff_a_cb = ttk.Combobox(row, width=14, state="readonly")
+        self.diff_a_cb.pack(side="left", padx=2)
+        ttk.Label(row, text="−").pack(side="left")
+        self.diff_b_cb = ttk.Combobox(row, width=14, state="readonly")
+        self.diff_b_cb.pack(side="left", padx=2)
+        self.diff_channel_cb = ttk.Combobox(row, width=8, state="readonly",
+                                            values=[t(f"label_{c}") for c in CHANNELS])
+        self.diff_channel_cb.trans_values = [f"label_{c}" for c in CHANNELS]
+        self.diff_channel_cb.current(0)
+        self.diff_channel_cb.pack(side="left", padx=2)
+        for cb in (self.diff_a_cb, self.diff_b_cb, self.diff_channel_cb):
+            cb.bind("<<ComboboxSelected>>", lambda e: self.graph.force_full_redraw())
+        self._refresh_sources()
+
+    # ------------------ series management ------------------
+    def add_files(self):
+        paths = filedialog.askopenfilenames(
+            title=self.graph.controller.translator.t("dialog_open_csv_title"),
+            filetypes=LOG_FILETYPES
+        )
+        for path in paths:
+            series = OverlaySeries(path)
+            self.series.append(series)
+            self._items[series] = self.tree.insert("", "end", text=series.label)
+            self._refresh_row(series)
+        self._refresh_sources()
+        self._schedule_loads()
+
+    def _selected(self):
+        chosen = set(self.tree.selection())
+        return [s for s in self.series if self._items[s] in chosen]
+
+    def remove_selected(self):
+        for series in self._selected():
+            task = self._loads.pop(series, None)
+            if task is not None:
+                task.cancel()
+            self.tree.delete(self._items.pop(series))
+            self.series.remove(series)
+        self._refresh_sources()
+        self._schedule_loads()
+        self.graph.force_full_redraw()
+
+    def toggle_selected(self):
+        for series in self._selected():
+            series.visible = not series.visible
+            self._refresh_row(series)
+        self._schedule_loads()
+        self.graph.force_full_redraw()
+
+    def apply_offset(self):
+        try:
+            offset = float(self.offset_entry.get())
+        except ValueError:
+            messagebox.showerror(
+                self.graph.controller.translator.t("msg_error_title"),
+                self.graph.controller.translator.t("msg_invalid_offset")
+            )
+            return
+        for series in self._selected():
+            series.offset = offset
+            self._refresh_row(series)
+        self.graph.force_full_redraw()
+
+    def _show_selected_offset(self):
+        selected = self._selected()
+        if selected:
+            self.offset_entry.delete(0, "end")
+            self.offset_entry.insert(0, f"{selected[0].offset:g}")
+
+    def _refresh_row(self, series, progress=None):
+        t = self.graph.controller.translator.t
+        span = series.time_span()
+        if series.error:
+            state = t("label_overlay_error")
+        elif progress is not None:
+            state = f"{progress * 100:.0f} %"
+        elif not series.visible:
+            state = t("label_overlay_hidden")
+        elif series.loaded:
+            state = t("label_overlay_loaded")
+        else:
+            state = "…"
+        self.tree.item(self._items[series], values=(
+            f"{series.offset:g} s",
+            format_hhmmss(span[1] - span[0]) if span else "--",
+            state,
+        ))
+
+    def _refresh_sources(self):
+        """Fill the difference choosers with the live session and every overlay."""
+        names = [self.graph.controller.translator.t("label_live")] + [s.label for s in self.series]
+        for cb, default in ((self.diff_a_cb, 0), (self.diff_b_cb, min(1, len(names) - 1))):
+            index = cb.current()
+            cb.config(values=names)
+            cb.current(index if 0 <= index < len(names) else default)
+
+    # ------------------ lazy loading ------------------
+    def _schedule_loads(self):
+        for series in self.series:
+            if len(self._loads) >= MAX_PARALLEL_LOADS:
+                return
+            if series.visible and not series.loaded and not series.error and series not in self._loads:
+                self._start_load(series)
+
+    def _start_load(self, series):
+        def done(store):
+            self._loads.pop(series, None)
+            series.store = store
+            if series in self._items:
+                self._refresh_row(series)
+                self.graph.force_full_redraw()
+            self._schedule_loads()
+
+        def failed(e):
+            self._loads.pop(series, None)
+            series.error = str(e)
+            print(f"[WARN] Could not load overlay {series.path}: {e}")
+            if series in self._items:
+                self._refresh_row(series)
+            self._schedule_loads()
+
+        def progress(fraction, text):
+            if series in self._items:
+                self._refresh_row(series, progress=fraction)
+
+        self._loads[series] = BackgroundTask(
+            self, series.load, on_done=done, on_error=failed,
+            on_progress=progress, on_cancel=lambda _: self._schedule_loads()
+        ).start()
+
+    # ------------------ data for the graph ------------------
+    def visible_series(self):
+        return [s for s in self.series if s.visible and s.loaded]
+
+    def time_spans(self):
+        return [s.time_span() for s in self.visible_series() if s.time_span() is not None]
+
+    def _source(self, index):
+        # index 0 is the live session (its store has no offset)
+        return self.graph.history if index == 0 else self.series[index - 1]
+
+    def difference_data(self, t_min, t_max, max_points):
+        """
+        (channel index, label, t, y) of source A minus source B for the
+        chosen channel at screen resolution, or None when switched off.
+        """
+        a, b = self.diff_a_cb.current(), self.diff_b_cb.current()
+        if not self.diff_var.get() or a < 0 or b < 0 or a == b:
+            return None
+        channel = max(0, self.diff_channel_cb.current())
+        source_a, source_b = self._source(a), self._source(b)
+        if isinstance(source_a, OverlaySeries) and not source_a.loaded:
+            return None
+        if isinstance(source_b, OverlaySeries) and not source_b.loaded:
+            return None
+        t, y = difference(source_a, source_b, channel, t_min, t_max, max_points // 2)
+        label = f"Δ {self.diff_channel_cb.get()} ({self.diff_a_cb.get()} − {self.diff_b_cb.get()})"
+        return channel, label, t, y
@@ -1,10 +1,5 @@
 import tkinter as tk
 from tkinter import ttk
-import json
-import os
-
-DATA_FOLDER = "data"
-DEFAULTS_FILE = os.path.join(DATA_FOLDER,"protection_defaults.json")
 
 class ProtectionPage(ttk.Frame):
     def __init__(self, parent, controller, device, measurement_manager):
@@ -18,6 +13,7 @@ class ProtectionPage(ttk.Frame):
 
         # ---------- Load Defaults ----------
         self.load_defaults()
+        self.controller.settings.subscribe("protection", self._on_defaults_changed)
 
         # ---------- UI ----------
         ttk.Label(self, text="", font=("Arial", 16, "bold")).pack(pady=10)
@@ -72,30 +68,27 @@ class ProtectionPage(ttk.Frame):
 
     # ------------------- Defaults -------------------
     def load_defaults(self):
-        """Load OVP/OCP defaults from JSON file."""
-        if os.path.exists(DEFAULTS_FILE):
-            with open(DEFAULTS_FILE, "r") as f:
-                self.defaults = json.load(f)
-        else:
-            # fallback defaults
-            self.defaults = {
-                "ovp_enabled": True,
-                "ovp_limit": 20.0,
-                "ocp_enabled": True,
-                "ocp_limit": 2.0
-            }
+        """Load OVP/OCP defaults from the settings store."""
+        self.defaults = self.controller.settings.get("protection")
 
     def save_defaults(self):
-        """Save current OVP/OCP settings to JSON file."""
+        """Save current OVP/OCP settings to the settings store."""
         self.defaults = {
             "ovp_enabled": self.ovp_enabled.get(),
             "ovp_limit": self.ovp_var.get(),
             "ocp_enabled": self.ocp_enabled.get(),
             "ocp_limit": self.ocp_var.get()
         }
-        with open(DEFAULTS_FILE, "w") as f:
-            json.dump(self.defaults, f, indent=4)
+        self.controller.settings.update("protection", self.defaults)
         print("Protection settings saved.")
+
+    def _on_defaults_changed(self, data):
+        """Settings store subscriber: show and apply the stored limits."""
+        self.defaults = data
+        self.ovp_enabled.set(data["ovp_enabled"])
+        self.ovp_var.set(data["ovp_limit"])
+        self.ocp_enabled.set(data["ocp_enabled"])
+        self.ocp_var.set(data["ocp_limit"])
         self.update_protection()
 
     # ------------------- Protection Logic -------------------
@@ -0,0 +1,213 @@
+# scpi_console.py
+import collections
+import queue
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog
+
+from device.scpi_script import ScriptRunner, parse_script
+
+HISTORY_SIZE = 100
+POLL_MS = 50
+
+
+class ScpiConsole(tk.Toplevel):
+    """
+    SCPI console: free-form commands with Up/Down history, multi-line
+    scripts and named macros (the "scpi_macros" settings section).
+    Everything runs through device.scpi_script.ScriptRunner off the Tk
+    thread; each command is logged with its round-trip time.
+    """
+
+    def __init__(self, parent, controller, device, on_finished=None):
+        super().__init__(parent)
+        self.controller = controller
+        self.on_finished = on_finished   # () after every run, e.g. to refresh STB/ESR
+        self.runner = ScriptRunner(device)
+        self._queue = queue.Queue()
+        self._poll_id = None
+        self.history = collections.deque(maxlen=HISTORY_SIZE)
+        self._history_pos = 0
+        self.macros = controller.settings.get("scpi_macros")
+
+        t = controller.translator.t
+        self.title(t("label_scpi_console"))
+        self.geometry("640x560")
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        # --- output log ---
+        out_frame = ttk.Frame(self)
+        out_frame.pack(fill="both", expand=True, padx=8, pady=(8, 2))
+        self.output = tk.Text(out_frame, height=14, state="disabled", wrap="none", font=("Courier", 10))
+        scroll = ttk.Scrollbar(out_frame, command=self.output.yview)
+        self.output.config(yscrollcommand=scroll.set)
+        self.output.tag_configure("answer", foreground="blue")
+        self.output.tag_configure("error", foreground="red")
+        self.output.tag_configure("info", foreground="gray")
+        self.output.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+
+        # --- single command ---
+        row = ttk.Frame(self)
+        row.pack(fill="x", padx=8, pady=4)
+        self.cmd_entry = ttk.Entry(row)
+        self.cmd_entry.pack(side="left", fill="x", expand=True)
+        self.cmd_entry.bind("<Return>", lambda e: self.send_command())
+        self.cmd_entry.bind("<Up>", lambda e: self._recall(-1))
+        self.cmd_entry.bind("<Down>", lambda e: self._recall(1))
+        self.send_btn = ttk.Button(row, text=t("button_send"), command=self.send_command)
+        self.send_btn.pack(side="left", padx=(4, 0))
+
+        # --- script ---
+        script_frame = ttk.LabelFrame(self, text=t("label_scpi_script"))
+        script_frame.pack(fill="both", padx=8, pady=4)
+        self.script = tk.Text(script_frame, height=7, wrap="none", font=("Courier", 10))
+        self.script.pack(fill="both", expand=True, padx=4, pady=4)
+
+        row = ttk.Frame(script_frame)
+        row.pack(fill="x", padx=4, pady=(0, 4))
+        self.run_btn = ttk.Button(row, text=t("button_scpi_run"), command=self.run_script)
+        self.run_btn.trans_key = "button_scpi_run"
+        self.run_btn.pack(side="left")
+        self.stop_btn = ttk.Button(row, text=t("button_scpi_stop"), command=self.runner.stop, state="disabled")
+        self.stop_btn.trans_key = "button_scpi_stop"
+        self.stop_btn.pack(side="left", padx=4)
+
+        ttk.Label(row, text=t("label_macro")).pack(side="left", padx=(16, 2))
+        self.macro_var = tk.StringVar()
+        self.macro_combo = ttk.Combobox(row, textvariable=self.macro_var, width=16, state="readonly")
+        self.macro_combo.bind("<<ComboboxSelected>>", lambda e: self.load_macro())
+        self.macro_combo.pack(side="left")
+        run_macro_btn = ttk.Button(row, text=t("button_macro_run"), command=self.run_macro)
+        run_macro_btn.trans_key = "button_macro_run"
+        run_macro_btn.pack(side="left", padx=(4, 0))
+        ttk.Button(row, text=t("button_macro_save"), command=self.save_macro).pack(side="left", padx=4)
+        ttk.Button(row, text=t("button_macro_delete"), command=self.delete_macro).pack(side="left")
+        self._refresh_macro_list()
+
+        self.cmd_entry.focus_set()
+
+    # ------------------ running ------------------
+    def send_command(self):
+        cmd = self.cmd_entry.get().strip()
+        if not cmd:
+            return
+        if not self.history or self.history[-1] != cmd:
+            self.history.append(cmd)
+        self._history_pos = len(self.history)
+        self.cmd_entry.delete(0, "end")
+        self._start([cmd])
+
+    def run_script(self):
+        self._start(parse_script(self.script.get("1.0", "end")))
+
+    def _start(self, commands):
+        if not commands or self.runner.running:
+            return
+        self._count = len(commands)
+        self.runner.start(
+            commands,
+            on_result=lambda *result: self._queue.put(("result", result)),
+            on_done=lambda total: self._queue.put(("done", total)),
+        )
+        self.send_btn.config(state="disabled")
+        self.run_btn.config(state="disabled")
+        self.stop_btn.config(state="normal")
+        if self._poll_id is None:
+            self._poll_id = self.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        finished = False
+        while True:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "result":
+                self._log_result(*payload)
+            else:
+                finished = True
+                if self._count > 1:
+                    t = self.controller.translator.t
+                    self._append(f"-- {self._count} {t('label_scpi_commands')}, {payload * 1000:.1f} ms\n", "info")
+        if finished:
+            self.send_btn.config(state="normal")
+            self.run_btn.config(state="normal")
+            self.stop_btn.config(state="disabled")
+            if self.on_finished:
+                self.on_finished()
+        else:
+            self._poll_id = self.after(POLL_MS, self._poll)
+
+    def _log_result(self, index, cmd, answer, seconds, error):
+        self._append(f"> {cmd}", None)
+        self._append(f"   [{seconds * 1000:.2f} ms]\n", "info")
+        if error is not None:
+            self._append(f"! {error}\n", "error")
+        elif answer is not None:
+            self._append(f"< {answer}\n", "answer")
+
+    def _append(self, text, tag):
+        self.output.config(state="normal")
+        self.output.insert("end", text, tag or ())
+        self.output.see("end")
+        self.output.config(state="disabled")
+
+    def _recall(self, step):
+        if not self.history:
+            return "break"
+        self._history_pos = min(max(self._history_pos + step, 0), len(self.history))
+        self.cmd_entry.delete(0, "end")
+        if self._history_pos < len(self.history):
+            self.cmd_entry.insert(0, self.history[self._history_pos])
+        return "break"
+
+    # ------------------ macros ------------------
+    def _store_macros(self):
+        self.controller.settings.update("scpi_macros", self.macros, replace=True)
+        self._refresh_macro_list()
+
+    def _refresh_macro_list(self):
+        self.macro_combo.config(values=sorted(self.macros))
+
+    def load_macro(self):
+        name = self.macro_var.get()
+        if name in self.macros:
+            self.script.delete("1.0", "end")
+            self.script.insert("1.0", self.macros[name])
+
+    def run_macro(self):
+        name = self.macro_var.get()
+        if name in self.macros:
+            self._start(parse_script(self.macros[name]))
+
+    def save_macro(self):
+        t = self.controller.translator.t
+        text = self.script.get("1.0", "end").strip()
+        if not parse_script(text):
+            return
+        name = simpledialog.askstring(t("label_macro"), t("msg_macro_name"),
+                                      initialvalue=self.macro_var.get(), parent=self)
+        if not name:
+            return
+        self.macros[name.strip()] = text
+        self._store_macros()
+        self.macro_var.set(name.strip())
+
+    def delete_macro(self):
+        t = self.controller.translator.t
+        name = self.macro_var.get()
+        if name not in self.macros:
+            return
+        if not messagebox.askyesno(t("label_macro"), f"{t('msg_macro_delete')}\n{name}", parent=self):
+            return
+        del self.macros[name]
+        self._store_macros()
+        self.macro_var.set("")
+
+    def close(self):
+        self.runner.stop()
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.destroy()
@@ -0,0 +1,183 @@
+# sequencer_panel.py
+import os
+import queue
+from tkinter import ttk, filedialog, messagebox
+
+from device.sequencer import (Sequencer, load_waveform_csv, program_duration, ramp_program,
+                              staircase_program, step_program)
+
+PROGRAM_KINDS = ("step", "ramp", "staircase", "waveform")
+CHANNELS = ("voltage", "current")
+POLL_MS = 50
+
+
+class SequencerPanel(ttk.LabelFrame):
+    """
+    Controls for the setpoint sequencer on the Control page: step, ramp
+    and staircase programs from start / end / steps / time, or a waveform
+    table loaded from CSV. The sequencer thread reports steps through a
+    queue polled on the Tk thread; each step is posted as a "setpoint"
+    event stamped with the time it was written.
+
+    Parameters: step = start -> end, each held `time` s; ramp = start ->
+    end in `steps` increments over `time` s; staircase = `steps` stairs
+    from start to end, each held `time` s.
+    """
+
+    def __init__(self, parent, controller, device, mm, on_setpoint=None):
+        super().__init__(parent, text="")
+        self.trans_key = "label_sequencer"
+        self.controller = controller
+        self.mm = mm
+        self.on_setpoint = on_setpoint
+        self.sequencer = Sequencer(device)
+        self.waveform = None
+        self._queue = queue.Queue()
+        self._poll_id = None
+        self._total = 0
+
+        t = controller.translator.t
+
+        row = ttk.Frame(self)
+        row.pack(fill="x", padx=6, pady=(4, 2))
+        self.kind_cb = ttk.Combobox(row, state="readonly", width=12,
+                                    values=[t(f"label_program_{k}") for k in PROGRAM_KINDS])
+        self.kind_cb.trans_values = [f"label_program_{k}" for k in PROGRAM_KINDS]
+        self.kind_cb.current(0)
+        self.kind_cb.pack(side="left")
+        self.channel_cb = ttk.Combobox(row, state="readonly", width=9, values=[t(f"label_{c}") for c in CHANNELS])
+        self.channel_cb.trans_values = [f"label_{c}" for c in CHANNELS]
+        self.channel_cb.current(0)
+        self.channel_cb.pack(side="left", padx=4)
+        load_btn = ttk.Button(row, text="", command=self.load_waveform)
+        load_btn.trans_key = "button_load_waveform"
+        load_btn.pack(side="left")
+        self.waveform_label = ttk.Label(row, text="", foreground="gray")
+        self.waveform_label.pack(side="left", padx=4)
+
+        row = ttk.Frame(self)
+        row.pack(fill="x", padx=6, pady=2)
+        self.entries = {}
+        for key, default in (("start", "0"), ("end", "5"), ("steps", "5"), ("time", "1"), ("repeat", "1")):
+            lbl = ttk.Label(row, text="")
+            lbl.trans_key = f"label_seq_{key}"
+            lbl.pack(side="left", padx=(4, 2))
+            entry = ttk.Entry(row, width=6)
+            entry.insert(0, default)
+            entry.pack(side="left")
+            self.entries[key] = entry
+
+        row = ttk.Frame(self)
+        row.pack(fill="x", padx=6, pady=(2, 4))
+        self.start_btn = ttk.Button(row, text="", command=self.start)
+        self.start_btn.trans_key = "button_seq_start"
+        self.start_btn.pack(side="left")
+        self.stop_btn = ttk.Button(row, text="", command=self.sequencer.stop, state="disabled")
+        self.stop_btn.trans_key = "button_seq_stop"
+        self.stop_btn.pack(side="left", padx=4)
+        self.status_label = ttk.Label(row, text="")
+        self.status_label.pack(side="left", padx=6)
+
+    # ------------------ program ------------------
+    def load_waveform(self):
+        t = self.controller.translator.t
+        path = filedialog.askopenfilename(title=t("button_load_waveform"), filetypes=[("CSV files", "*.csv")])
+        if not path:
+            return
+        try:
+            self.waveform = load_waveform_csv(path)
+        except Exception as e:
+            messagebox.showerror(t("msg_error_title"), f"{t('msg_invalid_waveform')}\n{e}")
+            return
+        self.waveform_label.config(text=f"{os.path.basename(path)} ({len(self.waveform)})")
+        self.kind_cb.current(PROGRAM_KINDS.index("waveform"))
+
+    def _build_program(self):
+        kind = PROGRAM_KINDS[self.kind_cb.current()]
+        channel = CHANNELS[self.channel_cb.current()]
+        if kind == "waveform":
+            if not self.waveform:
+                raise ValueError("No waveform loaded")
+            return self.waveform
+        start = float(self.entries["start"].get())
+        end = float(self.entries["end"].get())
+        steps = max(1, int(self.entries["steps"].get()))
+        seconds = float(self.entries["time"].get())
+        if seconds <= 0:
+            raise ValueError("Time must be positive")
+        if kind == "step":
+            return step_program([start, end], seconds, channel)
+        if kind == "ramp":
+            return ramp_program(start, end, seconds, seconds / steps, channel)
+        return staircase_program(start, (end - start) / steps, steps, seconds, channel)
+
+    def _check_limits(self, program):
+        """Refuse programs that exceed the OVP / OCP limits."""
+        for step in program:
+            if step.voltage is not None and not 0 <= step.voltage <= self.mm.ovp_limit:
+                raise ValueError(f"{step.voltage} V is outside 0..{self.mm.ovp_limit} V")
+            if step.current is not None and not 0 <= step.current <= self.mm.ocp_limit:
+                raise ValueError(f"{step.current} A is outside 0..{self.mm.ocp_limit} A")
+
+    # ------------------ run ------------------
+    def start(self):
+        t = self.controller.translator.t
+        try:
+            program = self._build_program()
+            self._check_limits(program)
+            repeat = max(1, int(self.entries["repeat"].get()))
+        except ValueError as e:
+            messagebox.showerror(t("msg_error_title"), f"{t('msg_invalid_program')}\n{e}")
+            return
+
+        self._total = len(program) * repeat
+        self.sequencer.start(
+            program, repeat,
+            on_step=lambda *args: self._queue.put(("step", args)),
+            on_done=lambda error: self._queue.put(("done", error)),
+        )
+        self.mm.post_event("sequence", state="start", steps=len(program), repeat=repeat,
+                           duration=program_duration(program) * repeat)
+        self.start_btn.config(state="disabled")
+        self.stop_btn.config(state="normal")
+        self.status_label.config(text=t("label_seq_running"), foreground="orange")
+        if self._poll_id is None:
+            self._poll_id = self.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        t = self.controller.translator.t
+        last = None
+        while True:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "step":
+                index, wall_time, error, step = payload
+                info = {k: v for k, v in (("voltage", step.voltage), ("current", step.current)) if v is not None}
+                self.mm.post_event("setpoint", timestamp=wall_time, source="sequencer", **info)
+                if self.on_setpoint:
+                    self.on_setpoint(step.voltage, step.current)
+                last = (index, error)
+            else:
+                self._finish(payload)
+                return
+
+        if last is not None:
+            index, error = last
+            self.status_label.config(
+                text=f"{t('label_seq_step')} {index + 1}/{self._total} | {error * 1000:+.2f} ms",
+                foreground="orange")
+        self._poll_id = self.after(POLL_MS, self._poll)
+
+    def _finish(self, error):
+        t = self.controller.translator.t
+        summary = self.sequencer.timing_summary()
+        self.mm.post_event("sequence", state="error" if error else "end", **summary)
+        self.start_btn.config(state="normal")
+        self.stop_btn.config(state="disabled")
+        text = (f"{t('label_seq_done')}: {summary['steps']} | "
+                f"{t('label_seq_timing')} {summary['mean_ms']:.2f} / {summary['max_ms']:.2f} ms")
+        self.status_label.config(text=f"{text} | {error}" if error else text,
+                                 foreground="red" if error else "green")
@@ -1,6 +1,12 @@
+import collections
+import queue
+import time
 import tkinter as tk
 from tkinter import ttk
 
+from device.status_poller import StatusPoller
+from gui.scpi_console import ScpiConsole
+
 STB_BITS = [
     ("Bit 7", "OPE", "Standard Operation Summary"),
     ("Bit 6", "RQS", "Request Service"),
@@ -23,11 +29,36 @@ ESR_BITS = [
     ("Bit 0", "OPC", "Operation Complete")
 ]
 
+POLL_INTERVALS = ("0.25", "0.5", "1", "2", "5")  # seconds
+DRAIN_MS = 100          # how often the Tk side picks up poller results
+HISTORY_ROWS = 200      # register transitions kept in the history table
+
+
+def bit_table(bits):
+    """
+    Lookup table value -> tuple of per-row bit states (in the row order of
+    `bits`) for every byte value, so decoding a register is one index.
+    """
+    numbers = [int(bit[0].split()[1]) for bit in bits]
+    return [tuple(bool(value >> n & 1) for n in numbers) for value in range(256)]
+
+
+STB_TABLE = bit_table(STB_BITS)
+ESR_TABLE = bit_table(ESR_BITS)
+
 class StatusPage(tk.Frame):
     def __init__(self, parent, controller, device=None, mm=None):
         super().__init__(parent)
         self.controller = controller
         self.device = device
+        self._shown = {}      # register -> value currently shown in its table
+        self._last_stb = None  # last STB read from the device (not simulated)
+        self.history = collections.deque(maxlen=HISTORY_ROWS)  # (time, register, old, new)
+        self._history_items = collections.deque()
+        self._queue = queue.Queue()
+        self._console = None
+        self._visible = False   # the poller only runs while the page is shown
+        self.poller = StatusPoller(device, lambda *result: self._queue.put(result)) if device is not None else None
 
         # --- STB Table ---
         stb_frame = ttk.LabelFrame(self, text="STB Status")
@@ -41,6 +72,8 @@ class StatusPage(tk.Frame):
         for bit in STB_BITS:
             item_id = self.stb_tree.insert("", "end", values=(bit[0], bit[1], bit[2], "OFF"))
             self.stb_items.append(item_id)
+        self.stb_tree.tag_configure("alert", background="red")
+        self.stb_tree.tag_configure("normal", background="green")
 
         # --- ESR Table ---
         esr_frame = ttk.LabelFrame(self, text="ESR Status")
@@ -54,6 +87,36 @@ class StatusPage(tk.Frame):
         for bit in ESR_BITS:
             item_id = self.esr_tree.insert("", "end", values=(bit[0], bit[1], bit[2], "OFF"))
             self.esr_items.append(item_id)
+        self.esr_tree.tag_configure("alert", background="red")
+        self.esr_tree.tag_configure("normal", background="green")
+
+        # --- Register history (transitions and error queue entries) ---
+        history_frame = ttk.LabelFrame(self, text="")
+        history_frame.trans_key = "label_status_history"
+        history_frame.pack(padx=10, pady=5, fill="both", expand=True)
+        self.history_tree = ttk.Treeview(history_frame, columns=("Time", "Register", "Value", "Change"),
+                                         show="headings", height=6)
+        for col, width in (("Time", 100), ("Register", 80), ("Value", 80), ("Change", 340)):
+            self.history_tree.heading(col, text=col)
+            self.history_tree.column(col, width=width)
+        self.history_tree.tag_configure("error", foreground="red")
+        self.history_tree.pack(padx=5, pady=5, fill="both", expand=True)
+
+        # --- Background polling ---
+        poll_frame = ttk.Frame(self)
+        poll_frame.pack(pady=(5, 0))
+        self.poll_enabled = tk.BooleanVar(value=self.poller is not None)
+        poll_check = ttk.Checkbutton(poll_frame, text="", variable=self.poll_enabled, command=self._on_poll_toggle)
+        poll_check.trans_key = "checkbox_status_poll"
+        poll_check.pack(side="left", padx=5)
+        interval_label = ttk.Label(poll_frame, text="")
+        interval_label.trans_key = "label_poll_interval"
+        interval_label.pack(side="left", padx=(10, 2))
+        self.interval_var = tk.StringVar(value="1")
+        interval_combo = ttk.Combobox(poll_frame, textvariable=self.interval_var, values=POLL_INTERVALS,
+                                      width=5, state="readonly")
+        interval_combo.bind("<<ComboboxSelected>>", self._on_interval_selected)
+        interval_combo.pack(side="left")
 
         # --- Buttons Row Frame ---
         buttons_frame = ttk.Frame(self)
@@ -73,23 +136,89 @@ class StatusPage(tk.Frame):
 
         # Init with simulated values
         self.refresh_status(simulate=True)
+        self.after(DRAIN_MS, self._drain)
+
+    def on_show(self):
+        self._visible = True
+        self._on_poll_toggle()
 
-    # --- Bit parsing ---
-    def parse_bits(self, value, bits):
-        tmp_value = value
-        status = []
-        for bit in bits:
-            power = 2 ** int(bit[0].split()[1])
-            bit_set, tmp_value = divmod(tmp_value, power)
-            status.append((bit[0], bit[1], bit[2], bool(bit_set)))
-        return status
-
-    def update_table(self, tree, status_list, item_ids):
-        for item_id, (_, _, _, bit_set) in zip(item_ids, status_list):
-            tree.set(item_id, "Status", "ON" if bit_set else "OFF")
-            tree.item(item_id, tags=("alert" if bit_set else "normal",))
-        tree.tag_configure("alert", background="red")
-        tree.tag_configure("normal", background="green")
+    def on_hide(self):
+        # *ESR? clears the register: nobody reads it behind the user's back
+        self._visible = False
+        if self.poller is not None:
+            self.poller.stop()
+
+    # --- Table updates ---
+    def update_table(self, register, value):
+        """Show `value` in the register's table, touching only rows whose bit changed."""
+        if register == "STB":
+            tree, item_ids, table = self.stb_tree, self.stb_items, STB_TABLE
+        else:
+            tree, item_ids, table = self.esr_tree, self.esr_items, ESR_TABLE
+        old = self._shown.get(register)
+        if old == value:
+            return
+        new_bits = table[value & 0xFF]
+        old_bits = table[old & 0xFF] if old is not None else (None,) * len(new_bits)
+        for item_id, was_set, bit_set in zip(item_ids, old_bits, new_bits):
+            if was_set != bit_set:
+                tree.set(item_id, "Status", "ON" if bit_set else "OFF")
+                tree.item(item_id, tags=("alert" if bit_set else "normal",))
+        self._shown[register] = value
+
+    def _add_history(self, t, register, value, change, tags=()):
+        stamp = time.strftime("%H:%M:%S", time.localtime(t)) + f".{int(t % 1 * 1000):03d}"
+        self._history_items.append(self.history_tree.insert("", "end", values=(stamp, register, value, change),
+                                                            tags=tags))
+        if len(self._history_items) > HISTORY_ROWS:
+            self.history_tree.delete(self._history_items.popleft())
+        self.history_tree.see(self._history_items[-1])
+
+    def record(self, t, stb, esr, errors=()):
+        """Log one device reading in the history, then update the tables."""
+        # STB is a condition register: log transitions
+        old = self._last_stb
+        if old is not None and old != stb:
+            self.history.append((t, "STB", old, stb))
+            change = " ".join(("+" if now else "-") + bit[1]
+                              for bit, was, now in zip(STB_BITS, STB_TABLE[old & 0xFF], STB_TABLE[stb & 0xFF])
+                              if was != now)
+            self._add_history(t, "STB", f"0x{stb:02X}", change)
+        self._last_stb = stb
+        # ESR is cleared by reading it: every non-zero value is a new set of events
+        if esr:
+            self.history.append((t, "ESR", 0, esr))
+            change = " ".join(bit[1] for bit, now in zip(ESR_BITS, ESR_TABLE[esr & 0xFF]) if now)
+            self._add_history(t, "ESR", f"0x{esr:02X}", change)
+        for code, message in errors:
+            self.history.append((t, "ERR", code, message))
+            self._add_history(t, "ERR", code, message, tags=("error",))
+        self.update_table("STB", stb)
+        self.update_table("ESR", esr)
+
+    # --- Background polling ---
+    def _on_poll_toggle(self):
+        if self.poller is None:
+            return
+        if self.poll_enabled.get() and self._visible:
+            self.poller.set_interval(self.interval_var.get())
+            self.poller.start()
+        else:
+            self.poller.stop()
+
+    def _on_interval_selected(self, event=None):
+        if self.poller is not None:
+            self.poller.set_interval(self.interval_var.get())
+
+    def _drain(self):
+        """Apply poller results; only rows whose bits changed are touched."""
+        while True:
+            try:
+                t, stb, esr, errors = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self.record(t, stb, esr, errors)
+        self.after(DRAIN_MS, self._drain)
 
     # --- Refresh handler ---
     def refresh_status(self, simulate=False):
@@ -97,12 +226,15 @@ class StatusPage(tk.Frame):
             # simulated example
             stb_value = 0b10101010
             esr_value = 0b01010101
-        else:
-            stb_value = int(self.device.query("*STB?"))
-            esr_value = int(self.device.query("*ESR?"))
-
-        self.update_table(self.stb_tree, self.parse_bits(stb_value, STB_BITS), self.stb_items)
-        self.update_table(self.esr_tree, self.parse_bits(esr_value, ESR_BITS), self.esr_items)
+            self.update_table("STB", stb_value)
+            self.update_table("ESR", esr_value)
+            return
+        try:
+            stb_value, esr_value = self.device.read_status_bytes()
+        except Exception as e:
+            print(f"[WARN] Could not read status registers: {e}")
+            return
+        self.record(time.time(), stb_value, esr_value)
 
     # --- Clear / Reset handlers ---
     def clear_device(self):
@@ -119,61 +251,14 @@ class StatusPage(tk.Frame):
         self.refresh_status(simulate=self.device is None or not getattr(self.device, "is_connected", lambda: False)())
 
    
-    # --- Test Page ---
+    # --- SCPI console ---
     def open_test_popup(self):
-        popup = tk.Toplevel(self)
-        popup.title("SCPI Command Test")
-        popup.geometry("400x300")
-        popup.transient(self)
-
-        # --- SCPI Commands Dropdown ---
-        cmd_frame = ttk.LabelFrame(popup, text="Select SCPI Command", padding=10)
-        cmd_frame.pack(fill="x", padx=10, pady=10)
-
-        commands = [
-            "*IDN?",       # Standard Device ID query
-            ":VOLT 5",     # Set voltage to 5V
-            ":CURR 1",     # Set current to 1A
-            ":MEAS:VOLT?", # Measure voltage
-            ":FAKE?"       # Non-existent command to test error response
-        ]
-
-        self.selected_cmd = tk.StringVar(value=commands[0])
-        cmd_dropdown = ttk.OptionMenu(cmd_frame, self.selected_cmd, commands[0], *commands)
-        cmd_dropdown.pack(side="left", padx=5)
-
-        # --- Send Button ---
-        send_btn = ttk.Button(cmd_frame, text="Send Command", command=self.send_test_command)
-        send_btn.pack(side="left", padx=5)
-
-        # --- Feedback Label ---
-        self.cmd_feedback = tk.Label(popup, text="", fg="blue")
-        self.cmd_feedback.pack(pady=10)
-
-    def send_test_command(self):
-        cmd = self.selected_cmd.get()
-        self.cmd_feedback.config(text=f"Sending: {cmd}")
-        print(f"Sending command: {cmd}")
-
-        if self.device is not None and getattr(self.device, "is_connected", lambda: False)():
-            try:
-                resp = self.device.query(cmd)  # šalje komandu uređaju
-                self.cmd_feedback.config(text=f"Response: {resp}")
-            except Exception as e:
-                self.cmd_feedback.config(text=f"Device Error: {e}")
-                print(f"Device responded with error: {e}")
-
-            # Nakon svake komande, osvježavamo STB/ESR tabele sa stvarnim vrijednostima
-            stb_value = int(self.device.query("*STB?"))
-            esr_value = int(self.device.query("*ESR?"))
-        else:
-            # Ako uređaj nije spojen, simuliramo STB/ESR vrijednosti za test
-            import random
-            stb_value = random.randint(0, 255)
-            esr_value = random.randint(0, 255)
-            self.cmd_feedback.config(text=f"Simulated STB/ESR updated")
-            print(f"Simulated STB: {stb_value}, ESR: {esr_value}")
-
-        self.update_table(self.stb_tree, self.parse_bits(stb_value, STB_BITS), self.stb_items)
-        self.update_table(self.esr_tree, self.parse_bits(esr_value, ESR_BITS), self.esr_items)
+        if self._console is not None and self._console.winfo_exists():
+            self._console.lift()
+            return
+        self._console = ScpiConsole(self, self.controller, self.device, on_finished=self._on_console_run)
 
+    def _on_console_run(self):
+        # with polling on, the poller picks up the new STB/ESR by itself
+        if self.poller is None or not (self.poll_enabled.get() and self._visible):
+            self.refresh_status()
@@ -0,0 +1,195 @@
+# strip_chart.py
+import tkinter as tk
+from collections import deque
+
+LANE_COLORS = ("#1f77b4", "#ff7f0e", "#2ca02c")
+LANE_TITLE_PX = 16   # room for the lane title above the trace
+LANE_BOTTOM_PX = 6
+MAX_SEGMENTS = 200   # past this many per-frame items, merge them with a rebuild
+
+
+class StripChart(tk.Canvas):
+    """
+    Scrolling strip chart drawn directly on a Tk Canvas (live view at high
+    sample rates; matplotlib stays in use for the static views).
+
+    Voltage, current and power get one lane each. New samples are drawn as
+    one short polyline per lane and frame, and everything already on
+    screen is shifted left with a single Canvas.move() on a shared tag;
+    segments that scrolled out are deleted. Pushed samples are collected
+    and drawn at most once per `frame_ms`, so the cost per frame does not
+    depend on how much is on screen.
+
+    Event markers come from `markers(t_min, t_max)` -> [(t, colour)] on a
+    rebuild and from add_marker() while live.
+
+    A full rebuild from `source(window, points)` -> (t, v, i, p) happens
+    only on resize, window or scale changes, when a value leaves its
+    lane's range and every MAX_SEGMENTS frames (to merge the small items).
+    """
+
+    def __init__(self, parent, source, titles, window=60.0, frame_ms=20, markers=None, **kwargs):
+        super().__init__(parent, background="white", highlightthickness=0, **kwargs)
+        self.source = source
+        self.markers = markers
+        self.titles = list(titles)     # lane titles, e.g. "Voltage (V)"
+        self.window = window           # seconds shown across the full width
+        self.frame_ms = frame_ms
+        self.fixed_ranges = None       # [(lo, hi)] * 3 for manual scaling
+
+        self._ranges = [None, None, None]
+        self._pending = []             # (t, v, i, p) pushed since the last frame
+        self._last = None              # newest drawn sample
+        self._segments = deque()       # (t_end, item ids) oldest first
+        self._frame_id = None
+
+        self.bind("<Configure>", lambda e: self.rebuild())
+
+    # ---------- public ----------
+    def push(self, t, v, i, p):
+        """Queue one sample; it is drawn with the next frame."""
+        self._pending.append((t, v, i, p))
+        if self._frame_id is None:
+            self._frame_id = self.after(self.frame_ms, self._frame)
+
+    def add_marker(self, t, color):
+        """Vertical marker at sample time t; it scrolls with the traces."""
+        if self._last is None:
+            return
+        width = self.winfo_width()
+        x = width - (self._last[0] - t) * width / self.window
+        item = self.create_line(x, 0, x, self.winfo_height(), fill=color, dash=(3, 3), tags="trace")
+        self._segments.append((max(t, self._last[0]), [item]))
+
+    def set_window(self, seconds, rebuild=True):
+        """Seconds shown across the full width; rebuild=False leaves the redraw to the caller."""
+        if seconds != self.window:
+            self.window = seconds
+            if rebuild:
+                self.rebuild()
+
+    def set_fixed_ranges(self, ranges, rebuild=True):
+        """[(lo, hi)] * 3 for manual scaling, None to fit each lane to its data."""
+        if ranges != self.fixed_ranges:
+            self.fixed_ranges = ranges
+            if rebuild:
+                self.rebuild()
+
+    def rebuild(self):
+        """Redraw everything from the data source."""
+        self._pending.clear()
+        if self._frame_id is not None:
+            self.after_cancel(self._frame_id)
+            self._frame_id = None
+        self.delete("all")
+        self._segments.clear()
+        self._last = None
+
+        width, height = self.winfo_width(), self.winfo_height()
+        if width < 10 or height < 10:
+            return
+        t, *values = self.source(self.window, 2 * width)
+        if len(t) == 0:
+            self._ranges = list(self.fixed_ranges or [None, None, None])
+            self._draw_grid()
+            return
+
+        t_end = float(t[-1])
+        self._ranges = list(self.fixed_ranges or [self._fit(y) for y in values])
+        self._draw_grid()
+
+        scale = width / self.window
+        xs = (width - (t_end - t) * scale).tolist()
+        items = []
+        for lane, y in enumerate(values):
+            ys = [self._y(lane, value) for value in y.tolist()]
+            coords = [c for xy in zip(xs, ys) for c in xy]
+            if len(coords) >= 4:
+                items.append(self.create_line(coords, fill=LANE_COLORS[lane], tags="trace"))
+        if self.markers is not None:
+            for t_mark, color in self.markers(t_end - self.window, t_end):
+                x = width - (t_end - t_mark) * scale
+                items.append(self.create_line(x, 0, x, height, fill=color, dash=(3, 3), tags="trace"))
+        self._segments.append((t_end, items))
+        self._last = (t_end, *(float(y[-1]) for y in values))
+
+    # ---------- drawing ----------
+    def _frame(self):
+        self._frame_id = None
+        if not self._pending:
+            return
+        samples, self._pending = self._pending, []
+
+        if self._last is None or (self.fixed_ranges is None and self._out_of_range(samples)):
+            self.rebuild()
+            return
+
+        width = self.winfo_width()
+        scale = width / self.window
+        t_end = samples[-1][0]
+        self.move("trace", -(t_end - self._last[0]) * scale, 0)
+
+        points = [self._last] + samples
+        xs = [width - (t_end - s[0]) * scale for s in points]
+        items = []
+        for lane in range(3):
+            coords = []
+            for x, s in zip(xs, points):
+                coords += (x, self._y(lane, s[lane + 1]))
+            items.append(self.create_line(coords, fill=LANE_COLORS[lane], tags="trace"))
+        self._segments.append((t_end, items))
+        self._last = samples[-1]
+
+        # drop segments that scrolled out on the left
+        while self._segments and self._segments[0][0] < t_end - self.window:
+            for item in self._segments.popleft()[1]:
+                self.delete(item)
+        # keep move() cheap: many small items are merged into one polyline per lane
+        if len(self._segments) > MAX_SEGMENTS:
+            self.rebuild()
+
+    def _out_of_range(self, samples):
+        for lane in range(3):
+            lo, hi = self._ranges[lane] or (0.0, 0.0)
+            if lo == hi:
+                return True
+            for s in samples:
+                if not lo <= s[lane + 1] <= hi:
+                    return True
+        return False
+
+    def _fit(self, y):
+        lo, hi = float(y.min()), float(y.max())
+        pad = (hi - lo) * 0.1 if hi != lo else 0.5
+        return lo - pad, hi + pad
+
+    def _lane_box(self, lane):
+        lane_h = self.winfo_height() / 3
+        top = lane * lane_h + LANE_TITLE_PX
+        return top, (lane + 1) * lane_h - LANE_BOTTOM_PX
+
+    def _y(self, lane, value):
+        top, bottom = self._lane_box(lane)
+        lo, hi = self._ranges[lane]
+        if hi == lo:
+            return (top + bottom) / 2
+        return bottom - (value - lo) / (hi - lo) * (bottom - top)
+
+    def _draw_grid(self):
+        width = self.winfo_width()
+        for lane, title in enumerate(self.titles):
+            top, bottom = self._lane_box(lane)
+            self.create_rectangle(0, top, width - 1, bottom, outline="#cccccc")
+            self.create_text(4, top - 2, text=title, anchor="sw", fill=LANE_COLORS[lane])
+            if self._ranges[lane] is not None:
+                lo, hi = self._ranges[lane]
+                self.create_text(width - 4, top + 1, text=f"{hi:.4g}", anchor="ne", fill="gray")
+                self.create_text(width - 4, bottom - 1, text=f"{lo:.4g}", anchor="se", fill="gray")
+
+        # static time grid, relative to the newest sample
+        for k in range(1, 4):
+            x = width * k / 4
+            self.create_line(x, 0, x, self.winfo_height(), fill="#eeeeee")
+            self.create_text(x + 2, self.winfo_height() - 1,
+                             text=f"-{self.window * (4 - k) / 4:g} s", anchor="sw", fill="gray")
+        self.tag_lower("all")
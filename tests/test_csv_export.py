@@ -0,0 +1,27 @@
+import numpy as np
+
+from utils.csv_export import _fixed, format_rows
+
+
+def _as_text(matrix):
+    return [row[row != 0].tobytes().decode("ascii") for row in matrix]
+
+
+def test_fixed_matches_fstring():
+    rng = np.random.default_rng(3)
+    x = np.concatenate([
+        rng.normal(0, 10, 20_000),
+        rng.integers(-10**6, 10**6, 5_000) / 1e6 + 5e-7,    # ties at the 6th decimal
+        [0.0, -0.0, -1e-7, -0.0001, 0.0005, 2.675, 1.0000005, 0.125, -0.5e-6, 999999.9999995],
+    ])
+    for decimals in (3, 6):
+        assert _as_text(_fixed(x, decimals)) == [f"{value:.{decimals}f}" for value in x.tolist()]
+
+
+def test_format_rows_matches_fallback():
+    t = np.array([0.0, 1.0005, 3661.25])
+    v = np.array([5.0, -0.0000001, 12.3456785])
+    rows = format_rows(t, v, v, v).decode("ascii").splitlines()
+    assert rows[1] == "00:00:01,1.000,-0.000000,-0.000000,-0.000000"
+    assert format_rows(t, v, v, np.array([1e13, 0, 0])).decode("ascii").splitlines()[0].endswith(
+        f",{1e13:.6f}")
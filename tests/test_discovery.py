@@ -0,0 +1,17 @@
+from device import discovery
+
+
+def test_resource_name_matches_listed_ports():
+    assert discovery.resource_name("COM3") == "ASRL3::INSTR"
+    assert discovery.resource_name("ASRL3::INSTR") == "ASRL3::INSTR"
+    assert discovery.resource_name("/dev/ttyUSB0") == "ASRL/dev/ttyUSB0::INSTR"
+
+
+def test_port_in_use_is_not_probed(monkeypatch):
+    monkeypatch.setattr(discovery, "list_ports", lambda max_age: ["ASRL3::INSTR", "ASRL4::INSTR"])
+    probed = []
+    monkeypatch.setattr(discovery, "probe", lambda address, baud_rates: probed.append(address))
+    discovery.invalidate()
+    found = discovery.discover(skip={"COM3"})
+    assert probed == ["ASRL4::INSTR"]
+    assert found == {"ASRL3::INSTR": None, "ASRL4::INSTR": None}
@@ -0,0 +1,16 @@
+import numpy as np
+
+from utils.csv_import import iter_csv_chunks
+from utils.live_logger import LiveLogger
+
+
+def test_live_csv_keeps_sub_second_times(tmp_path):
+    path = tmp_path / "run.csv"
+    logger = LiveLogger(str(path), batch_size=10)
+    for k in range(50):
+        logger.log(100 + k * 0.1, 5.0, 0.5, 2.5)   # 10 Hz
+    logger.close()
+    t = np.concatenate([chunk[0] for chunk in iter_csv_chunks(str(path))])
+    assert len(t) == 50
+    assert np.all(np.diff(t) > 0)
+    assert np.allclose(t, 100 + np.arange(50) * 0.1)
@@ -0,0 +1,54 @@
+import threading
+
+from gui.measurement_manager import MeasurementManager
+
+
+class FakeRoot:
+    def after(self, ms, callback):
+        return None
+
+    def after_cancel(self, after_id):
+        pass
+
+
+class FakeDevice:
+    def __init__(self):
+        self.io_lock = threading.RLock()
+        self.online = True
+        self.idn_queries = 0
+        self.reads = 0
+        self.shadow_invalidated = 0
+
+    def is_connected(self):
+        self.idn_queries += 1
+        return self.online
+
+    def read_all_with_status(self):
+        self.reads += 1
+        if not self.online:
+            raise RuntimeError("timeout")
+        return 5.0, 0.5, 2.5, 0, 0
+
+    def invalidate_shadow(self):
+        self.shadow_invalidated += 1
+
+
+def test_connected_polls_are_one_round_trip():
+    device = FakeDevice()
+    mm = MeasurementManager(FakeRoot(), device)
+    states = []
+    mm.subscribe_connection_status(states.append)
+    for _ in range(5):
+        mm._measure_once()
+    assert (device.idn_queries, device.reads) == (1, 5)
+    assert mm.latest_voltage == 5.0
+
+    device.online = False
+    mm._measure_once()          # the failed read marks the device disconnected
+    mm._measure_once()          # then only *IDN? looks for it
+    assert (device.idn_queries, device.reads) == (2, 6)
+
+    device.online = True
+    mm._measure_once()
+    assert states == [True, False, True]
+    assert device.shadow_invalidated == 2
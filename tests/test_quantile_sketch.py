@@ -0,0 +1,28 @@
+import numpy as np
+
+from utils.quantile_sketch import QuantileRollup, QuantileSketch
+
+
+def test_tail_quantiles_within_relative_error():
+    rng = np.random.default_rng(1)
+    values = np.concatenate([rng.normal(5.0, 0.01, 200_000), rng.lognormal(0, 2, 50_000)])
+    sketch = QuantileSketch()
+    sketch.extend(values[:100_000])
+    for x in values[100_000:101_000]:
+        sketch.add(x)
+    other = QuantileSketch()
+    other.extend(values[101_000:])
+    sketch.merge(other)
+    for q in (0.5, 0.99, 0.999):
+        exact = np.quantile(values, q, method="lower")
+        assert abs(sketch.quantile(q) - exact) <= 0.0011 * abs(exact)
+
+
+def test_rollup_buckets_stay_bounded():
+    rollup = QuantileRollup(bucket_seconds=1.0, max_buckets=8)
+    t = np.arange(0, 1000, 0.5)
+    rollup.extend(t, np.full(len(t), 5.0), np.full(len(t), 0.5), np.full(len(t), 2.5))
+    assert len(rollup.buckets) <= 8
+    assert sum(b["voltage"].n for b in rollup.buckets.values()) == len(t)
+    restored = QuantileRollup.from_dict(rollup.to_dict())
+    assert restored.quantiles("current") == rollup.quantiles("current")
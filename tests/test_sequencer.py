@@ -0,0 +1,17 @@
+from device.sequencer import Step, ramp_program, schedule, step_program
+
+
+def test_repeated_ramp_writes_each_deadline_once():
+    program = ramp_program(0.0, 2.0, duration=2.0, interval=1.0)
+    writes = [(offset, step.voltage) for _, offset, step in schedule(program, repeat=2)]
+    # the first ramp's last step (2 V at 2 s) gives way to the second ramp's start
+    assert writes == [(0.0, 0.0), (1.0, 1.0), (2.0, 0.0), (3.0, 1.0), (4.0, 2.0)]
+
+
+def test_merged_steps_keep_both_channels():
+    program = [Step(0.0, 1.0, None), Step(0.0, None, 0.5), Step(1.0, None, None)]
+    assert [(i, o, s) for i, o, s in schedule(program)] == [
+        (1, 0.0, Step(0.0, 1.0, 0.5)), (2, 1.0, Step(1.0, None, None))]
+    # the end marker of a step program does not swallow the next run's first level
+    steps = list(schedule(step_program([0.0, 5.0], 1.0), repeat=2))
+    assert [s.voltage for _, _, s in steps] == [0.0, 5.0, 0.0, 5.0, None]
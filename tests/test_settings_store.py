@@ -0,0 +1,15 @@
+import json
+
+from utils.settings_store import SettingsStore
+
+
+def test_update_notifies_subscribers_and_saves(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)   # no legacy files from the working directory
+    store = SettingsStore(str(tmp_path / "data"))
+    seen = []
+    store.subscribe("protection", seen.append)
+    store.update("protection", ovp_limit="12.5")
+    assert seen == [dict(store.get("protection"), ovp_limit=12.5)]
+    store.flush()
+    with open(store.path("protection")) as f:
+        assert json.load(f)["ovp_limit"] == 12.5
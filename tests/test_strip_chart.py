@@ -0,0 +1,23 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from gui.strip_chart import StripChart
+
+
+def test_fit_pads_the_data_range():
+    assert StripChart._fit(None, np.array([1.0, 3.0])) == (0.8, 3.2)
+    # a flat trace still gets a usable range around its value
+    assert StripChart._fit(None, np.array([5.0, 5.0])) == (4.5, 5.5)
+
+
+def test_out_of_range():
+    chart = SimpleNamespace(_ranges=[(0.0, 10.0), (0.0, 1.0), (0.0, 10.0)])
+    inside = [(0.0, 5.0, 0.5, 2.5), (0.1, 9.9, 0.9, 8.9)]
+    assert not StripChart._out_of_range(chart, inside)
+    assert StripChart._out_of_range(chart, inside + [(0.2, 5.0, 1.5, 7.5)])
+    # a lane without a range yet (or a collapsed one) forces a rebuild
+    chart._ranges[2] = None
+    assert StripChart._out_of_range(chart, inside)
+    chart._ranges[2] = (3.0, 3.0)
+    assert StripChart._out_of_range(chart, inside)
@@ -0,0 +1,42 @@
+import numpy as np
+
+from utils.csv_import import iter_csv_chunks
+from utils.live_logger import LiveLogger
+from utils.session_format import read_session
+
+
+def _write_log(path, fmt, n=200):
+    logger = LiveLogger(str(path), batch_size=10, flush_interval=60, fmt=fmt, compress=True)
+    for k in range(n):
+        logger.log(k * 0.1, 5.0, 0.5, 2.5)
+    logger.close()
+
+
+def _truncate(path, cut):
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) - cut])
+
+
+def test_truncated_csv_gz_keeps_decoded_rows(tmp_path):
+    path = tmp_path / "run.csv.gz"
+    _write_log(path, "csv")
+    _truncate(path, 40)
+    t = np.concatenate([chunk[0] for chunk in iter_csv_chunks(str(path))])
+    assert 0 < len(t) < 200
+    assert np.all(np.diff(t) >= 0)
+
+
+def test_truncated_session_gz_keeps_complete_blocks(tmp_path):
+    path = tmp_path / "run.axs.gz"
+    _write_log(path, "binary")
+    _truncate(path, 40)
+    _, columns = read_session(str(path))
+    assert 0 < len(columns["time"]) < 200
+    assert len(columns["time"]) % 10 == 0   # only whole batches survive
+
+
+def test_complete_gz_reads_everything(tmp_path):
+    path = tmp_path / "run.axs.gz"
+    _write_log(path, "binary")
+    _, columns = read_session(str(path))
+    assert len(columns["time"]) == 200
@@ -0,0 +1,114 @@
+# utils/autoscale.py
+import math
+from collections import deque
+
+import numpy as np
+
+CHANNELS = ("voltage", "current", "power")
+
+
+class WindowExtrema:
+    """
+    Min and max of the samples in the last `window` seconds, amortised O(1)
+    per sample with monotonic deques. window=None tracks the whole session
+    with two scalars (a deque would keep every sample of a ramp).
+    """
+
+    def __init__(self, window=None):
+        self.window = window
+        self._lo = deque()   # increasing values -> front is the minimum
+        self._hi = deque()   # decreasing values -> front is the maximum
+        self._min = math.inf
+        self._max = -math.inf
+
+    def add(self, t, x):
+        if self.window is None:
+            self._min = min(self._min, x)
+            self._max = max(self._max, x)
+            return
+        while self._lo and self._lo[-1][1] >= x:
+            self._lo.pop()
+        self._lo.append((t, x))
+        while self._hi and self._hi[-1][1] <= x:
+            self._hi.pop()
+        self._hi.append((t, x))
+        t_min = t - self.window
+        while self._lo[0][0] < t_min:
+            self._lo.popleft()
+        while self._hi[0][0] < t_min:
+            self._hi.popleft()
+
+    def extrema(self):
+        """(min, max), or None before the first sample."""
+        if self.window is None:
+            return (self._min, self._max) if self._min <= self._max else None
+        return (self._lo[0][1], self._hi[0][1]) if self._lo else None
+
+
+class AutoScaler:
+    """
+    Y-axis limits for the live graph from sliding-window extrema.
+
+    Each band ("voltage", "current", "power" and "combined" = V and I on
+    one axis) holds limits with `headroom` padding. Limits change only
+    when a sample leaves them or the data shrinks below `shrink` of their
+    span, so most samples leave the axes (and the layout) alone. add()
+    reports whether any band changed.
+    """
+
+    def __init__(self, window=None, headroom=0.1, shrink=0.5):
+        self.headroom = headroom
+        self.shrink = shrink
+        self.set_window(window)
+
+    def set_window(self, window, samples=None):
+        """Change the window (s, None = session); `samples` (t, v, i, p) arrays refill it."""
+        self.window = window
+        self._extrema = {c: WindowExtrema(window) for c in CHANNELS}
+        self._bands = {}
+        if samples is None or not len(samples[0]):
+            return
+        if window is None:
+            # only the extremes matter: seed them directly
+            for c, values in zip(CHANNELS, samples[1:]):
+                self._extrema[c].add(None, float(np.min(values)))
+                self._extrema[c].add(None, float(np.max(values)))
+        else:
+            t = samples[0].tolist()
+            for c, values in zip(CHANNELS, samples[1:]):
+                extrema = self._extrema[c]
+                for ts, x in zip(t, values.tolist()):
+                    extrema.add(ts, x)
+        self._update_bands()
+
+    def clear(self):
+        self.set_window(self.window)
+
+    def add(self, t, v, i, p):
+        for c, x in zip(CHANNELS, (v, i, p)):
+            self._extrema[c].add(t, x)
+        return self._update_bands()
+
+    def limits(self, band):
+        """(low, high) axis limits of a band, or None without data."""
+        return self._bands.get(band)
+
+    def _update_bands(self):
+        ranges = {c: self._extrema[c].extrema() for c in CHANNELS}
+        if ranges["voltage"] is None:
+            return False
+        ranges["combined"] = (min(ranges["voltage"][0], ranges["current"][0]),
+                              max(ranges["voltage"][1], ranges["current"][1]))
+        changed = False
+        for band, (lo, hi) in ranges.items():
+            current = self._bands.get(band)
+            target = self._padded(lo, hi)
+            if (current is None or lo < current[0] or hi > current[1]
+                    or target[1] - target[0] < self.shrink * (current[1] - current[0])):
+                self._bands[band] = target
+                changed = True
+        return changed
+
+    def _padded(self, lo, hi):
+        pad = (hi - lo) * self.headroom if hi != lo else 0.5
+        return lo - pad, hi + pad
@@ -0,0 +1,98 @@
+# utils/background.py
+import queue
+import threading
+
+
+class TaskCancelled(Exception):
+    """Raised inside a worker function to stop after cancel()."""
+
+
+class BackgroundTask:
+    """
+    Run fn(task) in a worker thread and deliver its outcome on the Tk thread.
+
+    The worker reports with task.progress(fraction, text) and should call
+    task.check_cancelled() between chunks of work. The callbacks
+    (on_progress, on_done, on_error, on_cancel) always run on the Tk thread
+    via widget.after(), so they may touch widgets directly.
+    """
+
+    def __init__(self, widget, fn, on_done=None, on_error=None,
+                 on_progress=None, on_cancel=None, poll_ms=100):
+        self.widget = widget
+        self.fn = fn
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.poll_ms = poll_ms
+
+        self._queue = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = None
+        self._finished = False
+
+    # ---------- Tk side ----------
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="BackgroundTask", daemon=True)
+        self._thread.start()
+        self.widget.after(self.poll_ms, self._poll)
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def running(self):
+        return not self._finished
+
+    def _poll(self):
+        latest_progress = None
+        outcome = None
+        while True:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                latest_progress = payload
+            else:
+                outcome = (kind, payload)
+
+        # only the most recent progress matters
+        if latest_progress is not None and self.on_progress:
+            self.on_progress(*latest_progress)
+
+        if outcome is None:
+            self.widget.after(self.poll_ms, self._poll)
+            return
+
+        self._finished = True
+        kind, payload = outcome
+        callback = {"done": self.on_done, "error": self.on_error, "cancelled": self.on_cancel}[kind]
+        if callback:
+            callback(payload)
+        elif kind == "error":
+            print(f"[ERROR] Background task failed: {payload}")
+
+    # ---------- Worker side ----------
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise TaskCancelled()
+
+    def progress(self, fraction, text=""):
+        self._queue.put(("progress", (fraction, text)))
+
+    def _run(self):
+        try:
+            result = self.fn(self)
+        except TaskCancelled:
+            self._queue.put(("cancelled", None))
+        except Exception as e:
+            self._queue.put(("error", e))
+        else:
+            self._queue.put(("cancelled", None) if self.cancelled else ("done", result))
@@ -0,0 +1,120 @@
+# utils/csv_export.py
+import numpy as np
+
+from utils.event_log import format_event_line
+from utils.live_logger import format_hhmmss
+
+EXPORT_HEADER = "Time (HH:MM:SS),Time (s),Voltage (V),Current (A),Power (W)\r\n"
+
+_ZERO = ord("0")
+_PAD = 0  # placeholder byte, stripped before writing
+MAX_FIXED = 1e12  # larger values would overflow the int64 digits of _fixed()
+
+
+def _digits(values, width):
+    """(n, width) uint8 matrix of the zero-padded decimal digits of non-negative ints."""
+    values = values.copy()
+    out = np.empty((len(values), width), dtype=np.uint8)
+    for col in range(width - 1, -1, -1):
+        out[:, col] = values % 10 + _ZERO
+        values //= 10
+    return out
+
+
+def _strip_leading_zeros(digits, keep):
+    """Replace leading zeros with _PAD, keeping at least `keep` digits."""
+    lead = np.cumsum(digits != _ZERO, axis=1) == 0
+    lead[:, digits.shape[1] - keep:] = False
+    digits[lead] = _PAD
+    return digits
+
+
+def _int_width(values, minimum):
+    top = int(values.max()) if len(values) else 0
+    return max(minimum, len(str(top)))
+
+
+def _fixed(x, decimals):
+    """
+    Vectorised f"{x:.{decimals}f}" as a padded byte matrix, for finite |x| < MAX_FIXED.
+
+    Rounding the scaled product can differ from the f-string (which rounds
+    the exact binary value) only when the product lies within rounding
+    error of a tie; those few values are rounded by Python itself.
+    """
+    scale = 10 ** decimals
+    product = np.abs(x) * scale
+    scaled = np.rint(product)
+    near_tie = np.flatnonzero(np.abs(np.abs(product - scaled) - 0.5) <= product * 1e-12)
+    scaled = scaled.astype(np.int64)
+    for k in near_tie.tolist():
+        scaled[k] = int(f"{abs(x[k]):.{decimals}f}".replace(".", ""))
+    int_part = scaled // scale
+    frac_part = scaled % scale
+
+    # signbit: -0.0 and small negatives rounding to zero keep their "-", as in the f-string
+    sign = np.where(np.signbit(x), ord("-"), _PAD).astype(np.uint8)[:, None]
+    int_digits = _strip_leading_zeros(_digits(int_part, _int_width(int_part, 1)), keep=1)
+    dot = np.full((len(x), 1), ord("."), dtype=np.uint8)
+    return np.hstack([sign, int_digits, dot, _digits(frac_part, decimals)])
+
+
+def _hhmmss(t):
+    secs = np.floor(t).astype(np.int64)
+    hours = secs // 3600
+    colon = np.full((len(t), 1), ord(":"), dtype=np.uint8)
+    return np.hstack([
+        _strip_leading_zeros(_digits(hours, _int_width(hours, 2)), keep=2), colon,
+        _digits((secs % 3600) // 60, 2), colon,
+        _digits(secs % 60, 2),
+    ])
+
+
+def format_rows(t, v, i, p):
+    """
+    Format samples as export CSV rows (HH:MM:SS, seconds, V, I, P) without
+    a per-row Python loop. Each field is rendered into a fixed-width byte
+    matrix; padding bytes are then dropped in one pass.
+    """
+    t, v, i, p = (np.asarray(c, dtype=float) for c in (t, v, i, p))
+    if not len(t):
+        return b""
+    if (not all(np.isfinite(c).all() and (np.abs(c) < MAX_FIXED).all() for c in (t, v, i, p))
+            or (t < 0).any()):
+        # rare (NaN/inf/huge values/negative time) - fall back to plain formatting
+        return "".join(
+            f"{format_hhmmss(tt)},{tt:.3f},{vv:.6f},{ii:.6f},{pp:.6f}\r\n"
+            for tt, vv, ii, pp in zip(t.tolist(), v.tolist(), i.tolist(), p.tolist())
+        ).encode("ascii")
+
+    comma = np.full((len(t), 1), ord(","), dtype=np.uint8)
+    newline = np.tile(np.frombuffer(b"\r\n", dtype=np.uint8), (len(t), 1))
+    rows = np.hstack([
+        _hhmmss(t), comma, _fixed(t, 3), comma,
+        _fixed(v, 6), comma, _fixed(i, 6), comma, _fixed(p, 6), newline,
+    ])
+    flat = rows.ravel()
+    return flat[flat != _PAD].tobytes()
+
+
+def write_csv(path, t, v, i, p, header_lines=(), task=None, chunk_rows=200_000, events=()):
+    """
+    Write an export CSV. `header_lines` are written first as '# ' comments,
+    followed by `events` ((t, kind, info) tuples) as event comment lines.
+    When `task` (a BackgroundTask) is given, progress is reported per chunk
+    and cancellation is honoured between chunks.
+    """
+    n = len(t)
+    with open(path, "wb") as f:
+        for line in header_lines:
+            f.write(f"# {line}\r\n".encode("utf-8"))
+        for event in events:
+            f.write((format_event_line(*event) + "\r\n").encode("utf-8"))
+        f.write(EXPORT_HEADER.encode("ascii"))
+        for start in range(0, n, chunk_rows):
+            if task is not None:
+                task.check_cancelled()
+            end = min(n, start + chunk_rows)
+            f.write(format_rows(t[start:end], v[start:end], i[start:end], p[start:end]))
+            if task is not None:
+                task.progress(end / n, f"{end}/{n}")
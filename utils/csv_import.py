@@ -0,0 +1,95 @@
+# utils/csv_import.py
+import csv
+import io
+import os
+
+import numpy as np
+
+from utils.event_log import parse_event_line
+from utils.gzip_reader import open_gzip
+
+TIME_HMS = "Time (HH:MM:SS)"
+TIME_S = "Time (s)"
+VALUE_COLUMNS = ("Voltage (V)", "Current (A)", "Power (W)")
+
+
+def _column_layout(header):
+    """
+    Map the CSV header to column positions in a row where every ':' has
+    been turned into ','. HH:MM:SS cells therefore span three columns.
+    Returns (time_cols, value_cols); time_cols has one entry for a seconds
+    column or three for HH, MM, SS.
+    """
+    positions = {}
+    pos = 0
+    for name in header:
+        name = name.strip()
+        positions[name] = pos
+        pos += 3 if name == TIME_HMS else 1
+
+    missing = [c for c in VALUE_COLUMNS if c not in positions]
+    if missing or (TIME_S not in positions and TIME_HMS not in positions):
+        raise ValueError(f"Missing CSV columns: {', '.join(missing) or 'time'}")
+
+    if TIME_S in positions:
+        time_cols = (positions[TIME_S],)
+    else:
+        start = positions[TIME_HMS]
+        time_cols = (start, start + 1, start + 2)
+    return time_cols, tuple(positions[c] for c in VALUE_COLUMNS)
+
+
+def _collect_events(lines, events):
+    for line in lines:
+        if line.startswith(b"#"):
+            event = parse_event_line(line)
+            if event is not None:
+                events.append(event)
+
+
+def iter_csv_chunks(path, chunk_bytes=4 * 1024 * 1024, events=None):
+    """
+    Stream a logged CSV file (optionally .csv.gz) in chunks of roughly
+    `chunk_bytes`.
+
+    Each chunk is parsed in one vectorised np.loadtxt call instead of row
+    by row. Yields (t, v, i, p, fraction) where the first four are NumPy
+    arrays and fraction is the share of the file consumed so far. Lines
+    starting with '#' are treated as comments; when `events` is a list,
+    event comment lines (see utils.event_log) are parsed into it.
+    A .gz log cut off by a crash is read up to where it ends.
+    """
+    size = max(1, os.path.getsize(path))
+    with open(path, "rb") as raw:
+        # progress follows the on-disk position, also for compressed files
+        f, gz = open_gzip(raw) if path.lower().endswith(".gz") else (raw, None)
+        header_line = f.readline()
+        while header_line.startswith(b"#"):
+            if events is not None:
+                _collect_events([header_line], events)
+            header_line = f.readline()
+        header = next(csv.reader([header_line.decode("utf-8-sig")]), [])
+        time_cols, value_cols = _column_layout(header)
+        usecols = time_cols + value_cols
+
+        while True:
+            lines = f.readlines(chunk_bytes)
+            if gz is not None and gz.truncated and lines and not lines[-1].endswith(b"\n"):
+                print(f"[WARN] {path} is truncated, incomplete last row ignored")
+                lines.pop()
+            if not lines:
+                break
+            chunk = b"".join(lines)
+            if events is not None and b"#" in chunk:
+                _collect_events(lines, events)
+            text = chunk.decode("utf-8").replace(":", ",")
+            data = np.loadtxt(io.StringIO(text), delimiter=",", usecols=usecols, ndmin=2)
+            if data.shape[0] == 0:
+                continue
+
+            if len(time_cols) == 3:
+                t = data[:, 0] * 3600 + data[:, 1] * 60 + data[:, 2]
+            else:
+                t = data[:, 0]
+            n_t = len(time_cols)
+            yield (t, data[:, n_t], data[:, n_t + 1], data[:, n_t + 2], raw.tell() / size)
@@ -0,0 +1,70 @@
+# utils/energy_meter.py
+import threading
+
+
+class EnergyMeter:
+    """
+    Trapezoidal energy (Wh) and charge (Ah) accumulator.
+
+    Each sample adds the area between it and the previous one, using the
+    real sample timestamps (seconds, monotonic), so an irregular polling
+    interval does not bias the totals. pause() stops accumulating;
+    resume() and break_chain() make the next sample a fresh start, so
+    gaps (stopped acquisition, read errors) are never integrated.
+    Thread-safe; samples come from the acquisition path.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.energy_wh = 0.0
+        self.charge_ah = 0.0
+        self.elapsed = 0.0    # integrated time (s)
+        self.paused = False
+        self._prev = None     # (t, i, p) of the previous sample
+
+    def add(self, t, i, p):
+        with self._lock:
+            if self.paused:
+                return
+            if self._prev is not None:
+                t0, i0, p0 = self._prev
+                dt = t - t0
+                if dt > 0:
+                    self.energy_wh += (p0 + p) * 0.5 * dt / 3600.0
+                    self.charge_ah += (i0 + i) * 0.5 * dt / 3600.0
+                    self.elapsed += dt
+            self._prev = (t, i, p)
+
+    def break_chain(self):
+        """Forget the previous sample (the gap up to the next one is not counted)."""
+        with self._lock:
+            self._prev = None
+
+    def pause(self):
+        with self._lock:
+            self.paused = True
+            self._prev = None
+
+    def resume(self):
+        with self._lock:
+            self.paused = False
+            self._prev = None
+
+    def reset(self):
+        """Zero the totals; the paused state is kept."""
+        with self._lock:
+            self.energy_wh = 0.0
+            self.charge_ah = 0.0
+            self.elapsed = 0.0
+            self._prev = None
+
+    def snapshot(self):
+        """(energy Wh, charge Ah, elapsed s) read consistently."""
+        with self._lock:
+            return self.energy_wh, self.charge_ah, self.elapsed
+
+    def format(self):
+        """One-line display text, e.g. '1.2345 Wh | 0.1029 Ah | 01:02:03'."""
+        wh, ah, elapsed = self.snapshot()
+        hours, rest = divmod(int(elapsed), 3600)
+        return f"{wh:.4f} Wh | {ah:.4f} Ah | {hours:02d}:{rest // 60:02d}:{rest % 60:02d}"
@@ -0,0 +1,87 @@
+# utils/event_log.py
+import bisect
+import json
+import threading
+
+# prefix of an event stored as a comment line in CSV logs / exports:
+#   # event,<time s>,<kind>,<JSON info>
+EVENT_PREFIX = "# event,"
+
+# marker colour per event kind (graph and strip chart)
+EVENT_COLORS = {
+    "protection": "red",
+    "setpoint": "purple",
+    "output": "black",
+    "sequence": "teal",
+}
+
+
+def format_event_line(t, kind, info):
+    """One CSV comment line (without line ending) describing an event."""
+    return f"{EVENT_PREFIX}{t:.3f},{kind},{json.dumps(info, separators=(',', ':'))}"
+
+
+def parse_event_line(line):
+    """(t, kind, info) from a line written by format_event_line(), or None."""
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", "replace")
+    line = line.strip()
+    if not line.startswith(EVENT_PREFIX):
+        return None
+    try:
+        t, kind, info = line[len(EVENT_PREFIX):].split(",", 2)
+        return float(t), kind, json.loads(info)
+    except ValueError:
+        print(f"[WARN] Ignoring malformed event line: {line[:80]}")
+        return None
+
+
+class EventLog:
+    """
+    Time-ordered index of session events (protection trips, setpoint
+    changes, output toggles).
+
+    Events are kept sorted by time in parallel lists, so any time range
+    is found with two bisects in O(log n). Events normally arrive in time
+    order and are appended; out-of-order inserts (e.g. on import) fall
+    back to insort. Thread-safe, like HistoryStore.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._times = []
+        self._events = []   # (t, kind, info), same order as _times
+
+    def __len__(self):
+        return len(self._times)
+
+    def add(self, t, kind, info=None):
+        event = (float(t), kind, dict(info or {}))
+        with self._lock:
+            if not self._times or event[0] >= self._times[-1]:
+                self._times.append(event[0])
+                self._events.append(event)
+            else:
+                k = bisect.bisect_right(self._times, event[0])
+                self._times.insert(k, event[0])
+                self._events.insert(k, event)
+
+    def extend(self, events):
+        for t, kind, info in events:
+            self.add(t, kind, info)
+
+    def clear(self):
+        with self._lock:
+            self._times = []
+            self._events = []
+
+    def range(self, t_min, t_max):
+        """Events with t_min <= t <= t_max, oldest first."""
+        with self._lock:
+            lo = bisect.bisect_left(self._times, t_min)
+            hi = bisect.bisect_right(self._times, t_max)
+            return self._events[lo:hi]
+
+    def all(self):
+        with self._lock:
+            return list(self._events)
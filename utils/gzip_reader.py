@@ -0,0 +1,66 @@
+# utils/gzip_reader.py
+import io
+import zlib
+
+_CHUNK = 64 * 1024
+
+
+class TolerantGzipReader(io.RawIOBase):
+    """
+    Read-only gzip stream that, unlike gzip.GzipFile, accepts a file cut
+    off before the end-of-stream trailer (a live log after a crash): it
+    returns everything that could be decoded and sets `truncated`
+    instead of raising EOFError. Concatenated members are read in order.
+
+    Wrap it in io.BufferedReader for readline() / readlines().
+    """
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.truncated = False
+        self._decomp = zlib.decompressobj(31)
+        self._pending = b""
+        self._eof = False
+
+    def readable(self):
+        return True
+
+    def close(self):
+        if not self.closed:
+            self.fileobj.close()
+        super().close()
+
+    def readinto(self, buf):
+        while not self._pending and not self._eof:
+            self._fill()
+        n = min(len(buf), len(self._pending))
+        buf[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def _fill(self):
+        data = self._decomp.unused_data or self.fileobj.read(_CHUNK)
+        if self._decomp.eof:
+            # one member finished: the rest (if any) is the next member
+            if not data:
+                self._eof = True
+                return
+            self._decomp = zlib.decompressobj(31)
+        if not data:
+            self._pending = self._decomp.flush()
+            self.truncated = True
+            self._eof = True
+            return
+        try:
+            self._pending = self._decomp.decompress(data)
+        except zlib.error as e:
+            # corrupt tail: keep what was decoded before it
+            print(f"[WARN] Compressed data damaged, reading stopped: {e}")
+            self.truncated = True
+            self._eof = True
+
+
+def open_gzip(fileobj):
+    """(buffered reader, TolerantGzipReader) for a gzip'ed binary file object."""
+    raw = TolerantGzipReader(fileobj)
+    return io.BufferedReader(raw), raw
@@ -0,0 +1,203 @@
+# utils/history_store.py
+import threading
+
+import numpy as np
+
+# Row layout of the decimation levels
+_T_FIRST, _T_LAST = 0, 1
+_LEVEL_ROWS = 8  # t_first, t_last, v_min, v_max, i_min, i_max, p_min, p_max
+
+
+class _Columns:
+    """Column-appendable 2-D float64 buffer with amortised O(1) growth."""
+
+    def __init__(self, rows, capacity=1024):
+        self._buf = np.empty((rows, capacity))
+        self.n = 0
+
+    def _reserve(self, need):
+        cap = self._buf.shape[1]
+        if need > cap:
+            new = np.empty((self._buf.shape[0], max(need, 2 * cap)))
+            new[:, :self.n] = self._buf[:, :self.n]
+            self._buf = new
+
+    def append_column(self, values):
+        self._reserve(self.n + 1)
+        self._buf[:, self.n] = values
+        self.n += 1
+
+    def extend(self, block):
+        m = block.shape[1]
+        self._reserve(self.n + m)
+        self._buf[:, self.n:self.n + m] = block
+        self.n += m
+
+    def view(self):
+        return self._buf[:, :self.n]
+
+
+class HistoryStore:
+    """
+    Append-only in-memory archive of a session with a min/max decimation pyramid.
+
+    Level 0 holds every raw sample (time, voltage, current, power). Level k
+    holds, for each run of fanout**k samples, the first/last timestamp and
+    the min/max of each channel. Levels are brought up to date lazily on
+    query, so append() stays O(1) and building the pyramid costs O(n) in
+    total. query() returns a time range at roughly screen resolution
+    without touching every sample in it.
+
+    Timestamps must be non-decreasing. All methods are thread-safe, so a
+    worker can fill a store while the Tk thread reads it.
+    """
+
+    def __init__(self, fanout=8):
+        self.fanout = fanout
+        self._lock = threading.Lock()
+        self._raw = _Columns(4)
+        self._levels = []
+
+    def __len__(self):
+        return self._raw.n
+
+    # ---------- Writing ----------
+    def append(self, t, v, i, p):
+        with self._lock:
+            self._raw.append_column((t, v, i, p))
+
+    def extend(self, t, v, i, p):
+        block = np.vstack([np.asarray(c, dtype=float) for c in (t, v, i, p)])
+        with self._lock:
+            self._raw.extend(block)
+
+    def clear(self):
+        with self._lock:
+            self._raw = _Columns(4)
+            self._levels = []
+
+    # ---------- Reading ----------
+    def time_span(self):
+        """(first, last) timestamp, or None when empty."""
+        with self._lock:
+            if not self._raw.n:
+                return None
+            t = self._raw.view()[0]
+            return float(t[0]), float(t[-1])
+
+    def tail(self, count):
+        """Copy of the last `count` raw samples as (t, v, i, p) arrays."""
+        with self._lock:
+            block = self._raw.view()[:, -count:].copy() if count > 0 else np.empty((4, 0))
+        return tuple(block)
+
+    def snapshot(self):
+        """Copy of every raw sample as (t, v, i, p) arrays."""
+        with self._lock:
+            block = self._raw.view().copy()
+        return tuple(block)
+
+    def range(self, t_min, t_max):
+        """Copy of the raw samples with t_min <= t <= t_max as (t, v, i, p) arrays."""
+        with self._lock:
+            raw = self._raw.view()
+            lo = int(np.searchsorted(raw[0], t_min, side="left"))
+            hi = int(np.searchsorted(raw[0], t_max, side="right"))
+            block = raw[:, lo:hi].copy()
+        return tuple(block)
+
+    def interp(self, t):
+        """(v, i, p) linearly interpolated from the raw samples at times t."""
+        t = np.asarray(t, dtype=float)
+        with self._lock:
+            raw = self._raw.view()
+            if not raw.shape[1]:
+                return tuple(np.full((3, len(t)), np.nan))
+            return tuple(np.interp(t, raw[0], raw[k]) for k in (1, 2, 3))
+
+    def query(self, t_min, t_max, max_points):
+        """
+        Samples with t_min <= t <= t_max as (t, v, i, p) arrays, decimated
+        to about `max_points` points. Decimated buckets contribute two
+        points (min and max) so spikes survive.
+        """
+        with self._lock:
+            self._update_levels()
+            t = self._raw.view()[0]
+            lo = int(np.searchsorted(t, t_min, side="left"))
+            hi = int(np.searchsorted(t, t_max, side="right"))
+            count = hi - lo
+
+            level = 0
+            while (level < len(self._levels)
+                   and count > max(2, max_points) // 2 * self.fanout ** level):
+                level += 1
+
+            parts = []
+            self._collect(lo, hi, level, parts)
+
+        if not parts:
+            return tuple(np.empty((4, 0)))
+        return tuple(parts[0] if len(parts) == 1 else np.concatenate(parts, axis=1))
+
+    # ---------- Pyramid ----------
+    def _update_levels(self):
+        f = self.fanout
+        below = self._raw.view()
+        level_idx = 0
+        while True:
+            complete = below.shape[1] // f
+            if complete == 0:
+                return
+            if level_idx == len(self._levels):
+                self._levels.append(_Columns(_LEVEL_ROWS))
+            level = self._levels[level_idx]
+
+            done = level.n
+            if complete > done:
+                chunk = below[:, done * f:complete * f]
+                m = complete - done
+                block = np.empty((_LEVEL_ROWS, m))
+                if level_idx == 0:
+                    grouped = chunk.reshape(4, m, f)
+                    block[_T_FIRST] = grouped[0, :, 0]
+                    block[_T_LAST] = grouped[0, :, -1]
+                    block[2::2] = grouped[1:].min(axis=2)
+                    block[3::2] = grouped[1:].max(axis=2)
+                else:
+                    grouped = chunk.reshape(_LEVEL_ROWS, m, f)
+                    block[_T_FIRST] = grouped[_T_FIRST, :, 0]
+                    block[_T_LAST] = grouped[_T_LAST, :, -1]
+                    block[2::2] = grouped[2::2].min(axis=2)
+                    block[3::2] = grouped[3::2].max(axis=2)
+                level.extend(block)
+
+            below = level.view()
+            level_idx += 1
+
+    def _collect(self, lo, hi, level, out):
+        """Append (4, n) blocks covering raw indices [lo, hi) at `level` to out."""
+        if lo >= hi:
+            return
+        if level == 0:
+            out.append(self._raw.view()[:, lo:hi].copy())
+            return
+
+        size = self.fanout ** level
+        b_lo = -(-lo // size)
+        b_hi = hi // size
+        if b_lo >= b_hi:
+            self._collect(lo, hi, level - 1, out)
+            return
+
+        self._collect(lo, b_lo * size, level - 1, out)
+
+        buckets = self._levels[level - 1].view()[:, b_lo:b_hi]
+        block = np.empty((4, 2 * (b_hi - b_lo)))
+        block[0, 0::2] = buckets[_T_FIRST]
+        block[0, 1::2] = buckets[_T_LAST]
+        block[1:, 0::2] = buckets[2::2]
+        block[1:, 1::2] = buckets[3::2]
+        out.append(block)
+
+        self._collect(b_hi * size, hi, level - 1, out)
@@ -0,0 +1,348 @@
+# utils/live_logger.py
+import csv
+import io
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+
+from utils.event_log import format_event_line
+from utils.session_format import encode_block, encode_events, encode_header
+
+# Durability levels for the live logger:
+#   "buffered" - rows are collected in memory and handed to the OS in 64 KiB chunks
+#   "flush"    - every batch is handed to the OS (survives an app crash)
+#   "fsync"    - every batch is handed to the OS and fsync'ed (survives a power loss)
+DURABILITY_LEVELS = ("buffered", "flush", "fsync")
+LOG_FORMATS = ("csv", "binary")
+BUFFERED_CHUNK_BYTES = 64 * 1024
+
+# same columns as csv_export.EXPORT_HEADER; "Time (s)" keeps sub-second timestamps
+CSV_HEADER = ["Time (HH:MM:SS)", "Time (s)", "Voltage (V)", "Current (A)", "Power (W)"]
+MANIFEST_SUFFIX = ".manifest.json"
+
+_STOP = object()
+_EVENT = object()  # first element of queued event items
+_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def format_hhmmss(seconds):
+    """Convert seconds to HH:MM:SS string (zero-padded)."""
+    s = int(seconds)
+    return f"{s // 3600:02d}:{(s % 3600) // 60:02d}:{s % 60:02d}"
+
+
+def _split_ext(path):
+    """'run.csv.gz' -> ('run', '.csv'); the .gz suffix is handled separately."""
+    if path.lower().endswith(".gz"):
+        path = path[:-3]
+    return os.path.splitext(path)
+
+
+def manifest_path_for(path):
+    return _split_ext(path)[0] + MANIFEST_SUFFIX
+
+
+def read_manifest(path):
+    """Return the segment paths of a rotated log, in recording order."""
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    return [os.path.join(base, seg["file"]) for seg in manifest.get("segments", [])]
+
+
+class LiveLogger:
+    """
+    Background writer for live measurement logging (CSV or .axs binary).
+
+    Samples are pushed with log() from the Tk thread (never blocks) and
+    written by a worker thread in batches. A batch is written when it
+    reaches `batch_size` rows or when `flush_interval` seconds have passed.
+    Bytes the OS did not accept stay in memory and are retried on the next
+    flush, so a stalled disk shows up as a growing backlog instead of
+    silently lost rows.
+
+    With compress=True the stream is gzip'ed on the fly (sync-flushed per
+    batch unless durability is "buffered", so a crash loses at most the
+    last batch). With rotate_bytes / rotate_seconds the log is split into
+    numbered, self-contained segments listed in a JSON manifest next to
+    them; importing the manifest reopens the run as one session.
+    """
+
+    def __init__(self, path, batch_size=50, flush_interval=1.0, durability="flush",
+                 fmt="csv", metadata=None, compress=False, rotate_bytes=None, rotate_seconds=None):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level: {durability}")
+        if fmt not in LOG_FORMATS:
+            raise ValueError(f"Unknown log format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.metadata = metadata
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.compress = compress
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.manifest_path = manifest_path_for(path) if (rotate_bytes or rotate_seconds) else None
+
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.last_error = None
+        self.segments = []        # manifest entries, one per segment
+
+        self._queue = queue.Queue()
+        self._batch_rows = 0      # rows taken from the queue, not yet encoded
+        self._unwritten = bytearray()
+        self._unwritten_rows = 0  # rows encoded in _unwritten
+        self._compressor = None
+
+        # first segment opens synchronously so the caller can report a bad path
+        path = self._segment_path(1)
+        self._start_segment(os.open(path, _OPEN_FLAGS, 0o644), path)
+        self._drain()
+
+        self._thread = threading.Thread(target=self._run, name="LiveLogger", daemon=True)
+        self._thread.start()
+
+    # ---------- Producer side (Tk thread) ----------
+    def log(self, ts, v, i, p):
+        """Queue one sample for writing."""
+        self._queue.put((ts, v, i, p))
+
+    def log_event(self, ts, kind, info=None):
+        """Queue an event; it is written in order with the samples."""
+        self._queue.put((_EVENT, ts, kind, dict(info or {})))
+
+    def backlog(self):
+        """Number of samples accepted but not yet handed to the OS."""
+        return self._queue.qsize() + self._batch_rows + self._unwritten_rows
+
+    def status(self):
+        return {
+            "written": self.rows_written,
+            "backlog": self.backlog(),
+            "dropped": self.rows_dropped,
+            "error": self.last_error,
+            "segments": len(self.segments),
+        }
+
+    @property
+    def closed(self):
+        return not self._thread.is_alive()
+
+    def close(self, wait=True, timeout=5.0):
+        """Write everything still queued and close the file.
+
+        With wait=False the worker finishes in the background; poll
+        `closed` / status() to follow it.
+        """
+        self._queue.put(_STOP)
+        if not wait:
+            return
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"[WARN] Live logger did not finish within {timeout:.0f} s, backlog {self.backlog()}")
+
+    # ---------- Worker side ----------
+    def _run(self):
+        batch = []
+        last_flush = time.monotonic()
+        stopping = False
+
+        while not stopping:
+            wait = self.flush_interval - (time.monotonic() - last_flush)
+            try:
+                item = self._queue.get(timeout=max(0.0, wait))
+            except queue.Empty:
+                item = None
+
+            # drain whatever is already queued, up to one batch
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            self._batch_rows = len(batch)
+
+            due = time.monotonic() - last_flush >= self.flush_interval
+            if stopping or due or len(batch) >= self.batch_size:
+                if batch:
+                    self._emit(self._encode_batch(batch))
+                    self._track_rows(batch)
+                    batch = []
+                    self._batch_rows = 0
+                if self._unwritten:
+                    self._flush(force=stopping)
+                if not stopping and self._rotation_due():
+                    self._rotate()
+                last_flush = time.monotonic()
+
+        self._close_segment()
+        self._write_manifest()
+
+    def _encode_batch(self, batch):
+        # runs of samples / events, in queue order
+        out = []
+        run = []
+        for item in batch + [None]:
+            is_event = item is not None and item[0] is _EVENT
+            if run and (item is None or is_event != (run[0][0] is _EVENT)):
+                out.append(self._encode_events(run) if run[0][0] is _EVENT else self._encode_rows(run))
+                run = []
+            if item is not None:
+                run.append(item)
+        return b"".join(out)
+
+    def _encode_rows(self, rows):
+        if self.fmt == "binary":
+            return encode_block(rows)
+        return self._encode_csv(
+            [format_hhmmss(ts), f"{ts:.3f}", f"{v:.6f}", f"{i:.6f}", f"{p:.6f}"] for ts, v, i, p in rows
+        )
+
+    def _encode_events(self, items):
+        events = [item[1:] for item in items]
+        if self.fmt == "binary":
+            return encode_events(events)
+        return "".join(format_event_line(*e) + "\r\n" for e in events).encode("utf-8")
+
+    def _encode_csv(self, rows):
+        out = io.StringIO()
+        csv.writer(out).writerows(rows)
+        return out.getvalue().encode("utf-8")
+
+    def _emit(self, data):
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self._unwritten += data
+
+    def _flush(self, force=False):
+        """Hand buffered bytes to the OS according to the durability level."""
+        if self.durability == "buffered" and not force and len(self._unwritten) < BUFFERED_CHUNK_BYTES:
+            return
+        if self._compressor is not None and (self.durability != "buffered" or force):
+            # sync flush keeps everything written so far decompressible
+            self._unwritten += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        try:
+            self._drain()
+            if self.durability == "fsync":
+                os.fsync(self._fd)
+        except OSError as e:
+            if self.last_error is None:
+                print(f"[ERROR] Live log write failed: {e}")
+            self.last_error = str(e)
+            return
+
+        self.rows_written += self._unwritten_rows
+        self._unwritten_rows = 0
+        self.last_error = None
+
+    def _drain(self):
+        while self._unwritten:
+            n = os.write(self._fd, self._unwritten)
+            del self._unwritten[:n]
+            self.segments[-1]["bytes"] += n
+
+    # ---------- Segments ----------
+    def _segment_path(self, index):
+        stem, ext = _split_ext(self.path)
+        path = f"{stem}.{index:03d}{ext}" if self.manifest_path else stem + ext
+        return path + ".gz" if self.compress else path
+
+    def _start_segment(self, fd, path):
+        self._fd = fd
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if self.compress else None
+        self._segment_started = time.monotonic()
+        self.segments.append({
+            "file": os.path.basename(path), "rows": 0,
+            "t_first": None, "t_last": None, "bytes": 0, "complete": False,
+        })
+
+        # every segment is self-contained (own header)
+        if self.fmt == "binary":
+            meta = dict(self.metadata or {})
+            meta["segment"] = len(self.segments)
+            self._emit(encode_header(meta))
+        else:
+            self._emit(self._encode_csv([CSV_HEADER]))
+        self._write_manifest()
+
+    def _close_segment(self):
+        if self._compressor is not None:
+            self._unwritten += self._compressor.flush()
+            self._compressor = None
+        try:
+            self._drain()
+            if self.durability == "fsync":
+                os.fsync(self._fd)
+            self.rows_written += self._unwritten_rows
+            self._unwritten_rows = 0
+        except OSError as e:
+            self.last_error = str(e)
+            self.rows_dropped += self._unwritten_rows
+            self._unwritten_rows = 0
+            print(f"[ERROR] Could not finish live log segment {self.segments[-1]['file']}: {e}")
+        try:
+            os.close(self._fd)
+        except OSError as e:
+            print(f"[WARN] Could not close live log segment {self.segments[-1]['file']}: {e}")
+        self.segments[-1]["complete"] = not self._unwritten
+        self._unwritten.clear()
+
+    def _track_rows(self, batch):
+        rows = [item for item in batch if item[0] is not _EVENT]
+        if not rows:
+            return
+        seg = self.segments[-1]
+        if seg["t_first"] is None:
+            seg["t_first"] = rows[0][0]
+        seg["t_last"] = rows[-1][0]
+        seg["rows"] += len(rows)
+        self._unwritten_rows += len(rows)
+
+    def _rotation_due(self):
+        # only rotate once the current segment is fully on disk
+        if not self.manifest_path or self._unwritten or not self.segments[-1]["rows"]:
+            return False
+        if self.rotate_bytes and self.segments[-1]["bytes"] >= self.rotate_bytes:
+            return True
+        return bool(self.rotate_seconds) and time.monotonic() - self._segment_started >= self.rotate_seconds
+
+    def _rotate(self):
+        path = self._segment_path(len(self.segments) + 1)
+        try:
+            fd = os.open(path, _OPEN_FLAGS, 0o644)
+        except OSError as e:
+            # keep writing to the current segment and retry on the next flush
+            self.last_error = str(e)
+            print(f"[ERROR] Could not open next live log segment: {e}")
+            return
+        self._close_segment()
+        self._start_segment(fd, path)
+        self._flush()
+
+    def _write_manifest(self):
+        if not self.manifest_path:
+            return
+        manifest = {
+            "format": self.fmt,
+            "compressed": self.compress,
+            "metadata": self.metadata or {},
+            "segments": self.segments,
+        }
+        tmp = self.manifest_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp, self.manifest_path)
+        except OSError as e:
+            print(f"[WARN] Could not update log manifest {self.manifest_path}: {e}")
@@ -0,0 +1,37 @@
+# utils/log_reader.py
+from utils.csv_import import iter_csv_chunks
+from utils.live_logger import MANIFEST_SUFFIX, read_manifest
+from utils.session_format import SESSION_EXT, is_session_file, read_session
+
+# file dialog filter covering everything iter_log_chunks can read
+LOG_FILETYPES = [
+    ("Logs / sessions", f"*.csv *.csv.gz *{SESSION_EXT} *{SESSION_EXT}.gz *{MANIFEST_SUFFIX}"),
+    ("CSV files", "*.csv *.csv.gz"),
+    ("AX session files", f"*{SESSION_EXT} *{SESSION_EXT}.gz"),
+    ("Rotated log manifests", f"*{MANIFEST_SUFFIX}"),
+]
+
+
+def _iter_single(path, events):
+    if is_session_file(path):
+        _, columns = read_session(path, events=events)
+        yield columns["time"], columns["voltage"], columns["current"], columns["power"], 1.0
+    else:
+        yield from iter_csv_chunks(path, events=events)
+
+
+def iter_log_chunks(path, events=None):
+    """
+    Yield (t, v, i, p, fraction) chunks from a CSV, .axs (optionally .gz)
+    or a rotated-log manifest. Segments of a manifest are read in order,
+    so a rotated run comes back as one continuous session. When `events`
+    is a list, the recorded events are appended to it as (t, kind, info).
+    """
+    if not path.lower().endswith(MANIFEST_SUFFIX):
+        yield from _iter_single(path, events)
+        return
+
+    segments = read_manifest(path)
+    for index, segment in enumerate(segments):
+        for t, v, i, p, fraction in _iter_single(segment, events):
+            yield t, v, i, p, (index + fraction) / len(segments)
@@ -0,0 +1,277 @@
+# utils/quantile_sketch.py
+import math
+
+import numpy as np
+
+CHANNELS = ("voltage", "current", "power")
+DEFAULT_QUANTILES = (0.5, 0.99, 0.999)
+
+
+class QuantileSketch:
+    """
+    Relative-error streaming quantile sketch of one channel (DDSketch).
+
+    Each value is counted in a logarithmic bin ceil(log_gamma |x|), with
+    gamma = (1 + alpha) / (1 - alpha); values below `min_value` in size
+    count as zero. Counts are exact, so the rank of a quantile is exact
+    and the returned value is within `alpha` (0.1 %) of the true value,
+    p99.9 included. Memory grows with the range of the data, not with the
+    sample count: a store keeps at most `max_bins` bins and, beyond
+    that, folds its smallest magnitudes together, which only affects
+    quantiles among the values closest to zero. Sketches with the same
+    alpha merge exactly.
+    """
+
+    def __init__(self, alpha=0.001, max_bins=2048, min_value=1e-9):
+        self.alpha = alpha
+        self.max_bins = max_bins
+        self.min_value = min_value
+        self._log_gamma = math.log((1 + alpha) / (1 - alpha))
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.zero = 0
+        self._pos = {}   # bin index -> count, for x > 0
+        self._neg = {}   # bin index of |x| -> count, for x < 0
+
+    def __len__(self):
+        return self.n
+
+    def _index(self, magnitude):
+        return int(math.ceil(math.log(magnitude) / self._log_gamma))
+
+    def _value(self, index):
+        # midpoint (in relative terms) of bin `index`
+        return 2 * math.exp(index * self._log_gamma) / (1 + math.exp(self._log_gamma))
+
+    def _collapse(self, store):
+        if len(store) <= self.max_bins:
+            return
+        keys = sorted(store)
+        excess = keys[:len(keys) - self.max_bins + 1]
+        store[excess[-1]] = sum(store.pop(k) for k in excess[:-1]) + store[excess[-1]]
+
+    # ---------- updates ----------
+    def add(self, x):
+        x = float(x)
+        self.n += 1
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        if abs(x) < self.min_value:
+            self.zero += 1
+            return
+        store = self._pos if x > 0 else self._neg
+        k = self._index(abs(x))
+        store[k] = store.get(k, 0) + 1
+        if len(store) > self.max_bins:
+            self._collapse(store)
+
+    def extend(self, values):
+        """Add a whole array (imports); equivalent to add() per value."""
+        values = np.asarray(values, dtype=float)
+        if not len(values):
+            return
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        small = np.abs(values) < self.min_value
+        self.zero += int(small.sum())
+        for store, part in ((self._pos, values[~small & (values > 0)]), (self._neg, -values[~small & (values < 0)])):
+            if not len(part):
+                continue
+            index, counts = np.unique(np.ceil(np.log(part) / self._log_gamma).astype(np.int64), return_counts=True)
+            for k, c in zip(index.tolist(), counts.tolist()):
+                store[k] = store.get(k, 0) + c
+            self._collapse(store)
+
+    def merge(self, other):
+        """Fold another sketch (same alpha) into this one."""
+        if other.alpha != self.alpha:
+            raise ValueError(f"Cannot merge sketches with alpha={self.alpha} and alpha={other.alpha}")
+        for store, theirs in ((self._pos, other._pos), (self._neg, other._neg)):
+            for k, c in theirs.items():
+                store[k] = store.get(k, 0) + c
+            self._collapse(store)
+        self.zero += other.zero
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    # ---------- queries ----------
+    def quantiles(self, qs=DEFAULT_QUANTILES):
+        """Estimated values at the quantiles qs (0..1); NaN while empty."""
+        if not self.n:
+            return [math.nan for _ in qs]
+        # bins in value order: most negative first
+        bins = [(-self._value(k), c) for k, c in sorted(self._neg.items(), reverse=True)]
+        if self.zero:
+            bins.append((0.0, self.zero))
+        bins += [(self._value(k), c) for k, c in sorted(self._pos.items())]
+        values = np.array([b[0] for b in bins])
+        cum = np.cumsum([b[1] for b in bins])
+        result = []
+        for q in qs:
+            if q <= 0:
+                result.append(self.min)
+            elif q >= 1:
+                result.append(self.max)
+            else:
+                k = int(np.searchsorted(cum, q * (self.n - 1), side="right"))
+                x = float(values[min(k, len(values) - 1)])
+                result.append(min(max(x, self.min), self.max))
+        return result
+
+    def quantile(self, q):
+        return self.quantiles((q,))[0]
+
+    # ---------- serialisation ----------
+    def to_dict(self):
+        """JSON-serialisable state (for .axs metadata)."""
+        return {
+            "alpha": self.alpha, "n": self.n, "min": self.min, "max": self.max, "zero": self.zero,
+            "pos": {str(k): c for k, c in self._pos.items()},
+            "neg": {str(k): c for k, c in self._neg.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(alpha=float(data["alpha"]))
+        sketch.n = int(data["n"])
+        sketch.min = float(data["min"])
+        sketch.max = float(data["max"])
+        sketch.zero = int(data["zero"])
+        sketch._pos = {int(k): int(c) for k, c in data["pos"].items()}
+        sketch._neg = {int(k): int(c) for k, c in data["neg"].items()}
+        return sketch
+
+
+class QuantileRollup:
+    """
+    Quantile sketches of V, I and P for a whole session and per rollup
+    bucket of `bucket_seconds` (session-relative time).
+
+    At most `max_buckets` buckets are kept: beyond that the bucket length
+    doubles and neighbouring buckets merge, so a run of any length keeps
+    a bounded rollup (and .axs header). Rollups (of other sessions or
+    devices) merge bucket by bucket.
+    """
+
+    def __init__(self, bucket_seconds=3600.0, alpha=0.001, max_buckets=48):
+        self.base_seconds = float(bucket_seconds)
+        self.bucket_seconds = float(bucket_seconds)   # grows when buckets are merged
+        self.alpha = alpha
+        self.max_buckets = max_buckets
+        self.session = {c: QuantileSketch(alpha) for c in CHANNELS}
+        self.buckets = {}   # bucket index -> {channel: QuantileSketch}
+
+    def __len__(self):
+        return self.session["voltage"].n
+
+    def _bucket(self, index):
+        bucket = self.buckets.get(index)
+        if bucket is None:
+            bucket = self.buckets[index] = {c: QuantileSketch(self.alpha) for c in CHANNELS}
+            if len(self.buckets) > self.max_buckets:
+                self._coarsen()
+                return self._bucket(index // 2)
+        return bucket
+
+    def _coarsen(self):
+        """Double the bucket length, merging pairs of buckets."""
+        old, self.buckets = self.buckets, {}
+        self.bucket_seconds *= 2
+        for index in sorted(old):
+            target = self.buckets.setdefault(index // 2, {c: QuantileSketch(self.alpha) for c in CHANNELS})
+            for c in CHANNELS:
+                target[c].merge(old[index][c])
+
+    def add(self, t, v, i, p):
+        bucket = self._bucket(int(t // self.bucket_seconds))
+        for c, x in zip(CHANNELS, (v, i, p)):
+            self.session[c].add(x)
+            bucket[c].add(x)
+
+    def extend(self, t, v, i, p):
+        """Fold whole arrays in (imports); t must be non-decreasing."""
+        t = np.asarray(t, dtype=float)
+        if not len(t):
+            return
+        for c, values in zip(CHANNELS, (v, i, p)):
+            self.session[c].extend(values)
+        index = np.floor(t / self.bucket_seconds).astype(np.int64)
+        starts = np.flatnonzero(np.diff(index)) + 1
+        bounds = np.concatenate(([0], starts, [len(t)]))
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            # current bucket length: it may have doubled while extending
+            bucket = self._bucket(int(t[lo] // self.bucket_seconds))
+            for c, values in zip(CHANNELS, (v, i, p)):
+                bucket[c].extend(values[lo:hi])
+
+    def clear(self):
+        self.__init__(self.base_seconds, self.alpha, self.max_buckets)
+
+    def merge(self, other):
+        """Fold another rollup in; bucket lengths must be the same up to a power of two."""
+        while self.bucket_seconds < other.bucket_seconds:
+            self._coarsen()
+        ratio = self.bucket_seconds / other.bucket_seconds
+        if ratio != 2 ** round(math.log2(ratio)):
+            raise ValueError("Cannot merge rollups with unrelated bucket lengths")
+        for c in CHANNELS:
+            self.session[c].merge(other.session[c])
+        for index, sketches in sorted(other.buckets.items()):
+            bucket = self._bucket(int(index * other.bucket_seconds // self.bucket_seconds))
+            for c in CHANNELS:
+                bucket[c].merge(sketches[c])
+
+    def quantiles(self, channel, qs=DEFAULT_QUANTILES, t_min=None, t_max=None):
+        """
+        Quantiles of a channel for the session, or for the buckets
+        overlapping [t_min, t_max] (bucket resolution).
+        """
+        if t_min is None and t_max is None:
+            return self.session[channel].quantiles(qs)
+        lo = -math.inf if t_min is None else t_min // self.bucket_seconds
+        hi = math.inf if t_max is None else t_max // self.bucket_seconds
+        merged = QuantileSketch(self.alpha)
+        for index, sketches in self.buckets.items():
+            if lo <= index <= hi:
+                merged.merge(sketches[channel])
+        return merged.quantiles(qs)
+
+    def bucket_table(self, channel, qs=DEFAULT_QUANTILES):
+        """[(bucket start s, samples, [quantiles])] oldest first."""
+        return [
+            (index * self.bucket_seconds, self.buckets[index][channel].n, self.buckets[index][channel].quantiles(qs))
+            for index in sorted(self.buckets)
+        ]
+
+    def header_lines(self, qs=DEFAULT_QUANTILES):
+        """Session quantiles as export header lines (one per channel)."""
+        lines = []
+        for c in CHANNELS:
+            values = self.session[c].quantiles(qs)
+            parts = " ".join(f"p{q * 100:g}={x:.6g}" for q, x in zip(qs, values))
+            lines.append(f"quantiles {c}: n={self.session[c].n} {parts}")
+        return lines
+
+    def to_dict(self):
+        return {
+            "bucket_seconds": self.bucket_seconds,
+            "alpha": self.alpha,
+            "session": {c: s.to_dict() for c, s in self.session.items()},
+            "buckets": {str(index): {c: s.to_dict() for c, s in sketches.items()}
+                        for index, sketches in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        rollup = cls(data["bucket_seconds"], data["alpha"])
+        rollup.session = {c: QuantileSketch.from_dict(data["session"][c]) for c in CHANNELS}
+        rollup.buckets = {
+            int(index): {c: QuantileSketch.from_dict(sketches[c]) for c in CHANNELS}
+            for index, sketches in data["buckets"].items()
+        }
+        return rollup
@@ -0,0 +1,122 @@
+# utils/range_loader.py
+import math
+import queue
+import threading
+from collections import OrderedDict
+
+
+class RangeLoader:
+    """
+    Fetch decimated time ranges from a HistoryStore off the Tk thread.
+
+    Only the newest request matters: while the worker is busy, a newer
+    request replaces the pending one, so a fast drag never queues up
+    stale work. Ranges are snapped to a power-of-two grid of the bucket
+    width, and results for ranges that lie entirely in the recorded past
+    (the store is append-only) are kept in a small LRU cache, so panning
+    or zooming back is answered without touching the store.
+
+    Callbacks run on the Tk thread with the (t, v, i, p) arrays.
+    """
+
+    def __init__(self, widget, cache_size=64, poll_ms=15):
+        self.widget = widget
+        self.cache_size = cache_size
+        self.poll_ms = poll_ms
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._results = queue.Queue()
+        self._pending = None      # newest request not yet picked up by the worker
+        self._seq = 0             # id of the newest request
+        self._generation = 0      # bumped by clear(); older results are not cached
+        self._poll_id = None
+        self._thread = None
+
+    # ---------- Tk side ----------
+    def request(self, store, t_min, t_max, max_points, callback):
+        """Deliver store.query() for the range to callback(data), from cache if possible."""
+        self._seq += 1
+        t_min, t_max = self._snap(t_min, t_max, max_points)
+        key = (self._generation, id(store), t_min, t_max, max_points)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self._stop_polling()
+            callback(cached)
+            return
+
+        with self._lock:
+            self._pending = (self._seq, key, store, t_min, t_max, max_points, callback)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="RangeLoader", daemon=True)
+            self._thread.start()
+        self._wakeup.set()
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+
+    def clear(self):
+        """Forget cached ranges and drop outstanding requests (store replaced or cleared)."""
+        self._seq += 1
+        self._generation += 1
+        self._cache.clear()
+        with self._lock:
+            self._pending = None
+        self._stop_polling()
+
+    def _stop_polling(self):
+        if self._poll_id is not None:
+            self.widget.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    def _snap(self, t_min, t_max, max_points):
+        span = t_max - t_min
+        if span <= 0 or max_points <= 0:
+            return t_min, t_max
+        step = 2.0 ** math.floor(math.log2(span / max_points))
+        return math.floor(t_min / step) * step, math.ceil(t_max / step) * step
+
+    def _poll(self):
+        self._poll_id = None
+        delivered = None
+        while True:
+            try:
+                seq, key, data, cacheable, callback = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if data is not None and cacheable and key[0] == self._generation:
+                self._cache[key] = data
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            if seq == self._seq:
+                delivered = (callback, data)
+
+        if delivered is None:
+            # the newest request is still pending or being queried
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+            return
+        callback, data = delivered
+        if data is not None:
+            callback(data)
+
+    # ---------- Worker side ----------
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                job, self._pending = self._pending, None
+            if job is None:
+                continue
+            seq, key, store, t_min, t_max, max_points, callback = job
+            try:
+                span = store.time_span()
+                data = store.query(t_min, t_max, max_points)
+            except Exception as e:
+                print(f"[WARN] Could not load plot range: {e}")
+                data, span = None, None
+            # only the recorded past is immutable, so only that is cached
+            cacheable = span is not None and t_max < span[1]
+            self._results.put((seq, key, data, cacheable, callback))
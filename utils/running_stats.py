@@ -0,0 +1,178 @@
+# utils/running_stats.py
+import math
+from collections import deque
+
+import numpy as np
+
+CHANNELS = ("voltage", "current", "power")
+
+
+class RunningStats:
+    """
+    Streaming mean / std / min / max / RMS / peak-to-peak of one channel.
+
+    add() is O(1) (Welford's update); extend() folds a whole NumPy array in
+    with Chan's parallel formula, so imports do not loop per sample.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=float)
+        if not len(values):
+            return
+        n_b = len(values)
+        mean_b = float(values.mean())
+        m2_b = float(((values - mean_b) ** 2).sum())
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.n * n_b / n
+        self.n = n
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def summary(self):
+        """dict with n, mean, std, min, max, rms and p2p (zeros while empty)."""
+        if not self.n:
+            return dict(n=0, mean=0.0, std=0.0, min=0.0, max=0.0, rms=0.0, p2p=0.0)
+        var = max(self.m2 / self.n, 0.0)
+        return dict(
+            n=self.n, mean=self.mean, std=math.sqrt(var),
+            min=self.min, max=self.max,
+            rms=math.sqrt(var + self.mean * self.mean),
+            p2p=self.max - self.min,
+        )
+
+
+class WindowStats:
+    """
+    The same statistics over the last `window` seconds.
+
+    Samples leaving the window are removed from the Welford sums (reverse
+    update), and min / max come from monotonic deques, so every sample
+    costs amortised O(1) regardless of the window length.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self._samples = deque()   # (t, x) inside the window
+        self._lo = deque()        # increasing values -> front is the minimum
+        self._hi = deque()        # decreasing values -> front is the maximum
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, t, x):
+        self._samples.append((t, x))
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+        while self._lo and self._lo[-1][1] >= x:
+            self._lo.pop()
+        self._lo.append((t, x))
+        while self._hi and self._hi[-1][1] <= x:
+            self._hi.pop()
+        self._hi.append((t, x))
+
+        self._evict(t - self.window)
+
+    def _evict(self, t_min):
+        while self._samples and self._samples[0][0] < t_min:
+            _, x = self._samples.popleft()
+            if self.n == 1:
+                self.n, self.mean, self.m2 = 0, 0.0, 0.0
+            else:
+                old_mean = self.mean
+                self.n -= 1
+                self.mean -= (x - old_mean) / self.n
+                self.m2 -= (x - old_mean) * (x - self.mean)
+        while self._lo and self._lo[0][0] < t_min:
+            self._lo.popleft()
+        while self._hi and self._hi[0][0] < t_min:
+            self._hi.popleft()
+
+    def summary(self):
+        if not self.n:
+            return dict(n=0, mean=0.0, std=0.0, min=0.0, max=0.0, rms=0.0, p2p=0.0)
+        var = max(self.m2 / self.n, 0.0)
+        lo, hi = self._lo[0][1], self._hi[0][1]
+        return dict(
+            n=self.n, mean=self.mean, std=math.sqrt(var),
+            min=lo, max=hi,
+            rms=math.sqrt(var + self.mean * self.mean),
+            p2p=hi - lo,
+        )
+
+
+class SessionStats:
+    """
+    Session-wide and sliding-window statistics for V, I and P.
+
+    window=None means the window is the whole session.
+    """
+
+    def __init__(self, window=None):
+        self.session = {c: RunningStats() for c in CHANNELS}
+        self.window = None
+        self.windowed = None
+        self.set_window(window)
+
+    def set_window(self, window, samples=None):
+        """Change the window length (s); `samples` (t, v, i, p) arrays refill it."""
+        self.window = window
+        if window is None:
+            self.windowed = None
+            return
+        self.windowed = {c: WindowStats(window) for c in CHANNELS}
+        if samples is not None:
+            t = samples[0].tolist()
+            for c, values in zip(CHANNELS, samples[1:]):
+                stats = self.windowed[c]
+                for ts, x in zip(t, values.tolist()):
+                    stats.add(ts, x)
+
+    def add(self, t, v, i, p):
+        for c, x in zip(CHANNELS, (v, i, p)):
+            self.session[c].add(x)
+            if self.windowed is not None:
+                self.windowed[c].add(t, x)
+
+    def extend(self, t, v, i, p):
+        """Fold whole arrays into the session statistics (import)."""
+        for c, values in zip(CHANNELS, (v, i, p)):
+            self.session[c].extend(values)
+
+    def clear(self):
+        self.__init__(self.window)
+
+    def summary(self, windowed=False):
+        source = self.windowed if windowed and self.windowed is not None else self.session
+        return {c: source[c].summary() for c in CHANNELS}
+
+    def header_lines(self):
+        """Session statistics as export header lines (one per channel)."""
+        lines = []
+        for c, s in self.summary().items():
+            lines.append(
+                f"stats {c}: n={s['n']} mean={s['mean']:.6g} std={s['std']:.6g} min={s['min']:.6g} "
+                f"max={s['max']:.6g} rms={s['rms']:.6g} p2p={s['p2p']:.6g}"
+            )
+        return lines
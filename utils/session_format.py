@@ -0,0 +1,173 @@
+# utils/session_format.py
+"""
+Native binary session format (.axs).
+
+Layout (all integers little-endian):
+
+    magic        8 bytes   b"AXSESS\\x00" + version byte
+    header_len   uint32
+    header       header_len bytes of UTF-8 JSON (metadata, setpoints, columns)
+    blocks...    repeated until EOF:
+        block_type  uint32   (BLOCK_SAMPLES or BLOCK_EVENTS)
+        count       uint32   BLOCK_SAMPLES: number of rows in the block
+                             BLOCK_EVENTS: payload length in bytes
+        payload     BLOCK_SAMPLES: count * len(COLUMNS) float64, column-major
+                    BLOCK_EVENTS: UTF-8 JSON list of [time, kind, info]
+
+Column-major blocks let the reader hand each column to NumPy without any
+per-row parsing. A torn last block (e.g. after a crash during live
+logging) is skipped; live logs write small blocks, so little is lost.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+from utils.gzip_reader import open_gzip
+
+SESSION_EXT = ".axs"
+MAGIC = b"AXSESS\x00"
+VERSION = 1
+
+COLUMNS = ("time", "voltage", "current", "power")
+BLOCK_SAMPLES = 1
+BLOCK_EVENTS = 2
+
+_DTYPE = np.dtype("<f8")
+_HEADER_LEN = struct.Struct("<I")
+_BLOCK_HEAD = struct.Struct("<II")
+
+
+class SessionFormatError(ValueError):
+    """Raised when a file is not a valid .axs session."""
+
+
+def is_session_file(path):
+    """True for .axs and gzip-compressed .axs.gz files."""
+    path = path.lower()
+    return path.endswith(SESSION_EXT) or path.endswith(SESSION_EXT + ".gz")
+
+
+def _open_raw(path):
+    if not path.lower().endswith(".gz"):
+        return open(path, "rb")
+    # a compressed live log cut off by a crash has no gzip trailer; read what is there
+    return open_gzip(open(path, "rb"))[0]
+
+
+# ---------- Encoding ----------
+def encode_header(metadata=None):
+    meta = dict(metadata or {})
+    meta.setdefault("columns", list(COLUMNS))
+    payload = json.dumps(meta).encode("utf-8")
+    return MAGIC + bytes([VERSION]) + _HEADER_LEN.pack(len(payload)) + payload
+
+
+def encode_block(rows):
+    """Encode an (n, 4) array-like of [time, v, i, p] rows as one sample block."""
+    arr = np.asarray(rows, dtype=_DTYPE).reshape(-1, len(COLUMNS))
+    return _BLOCK_HEAD.pack(BLOCK_SAMPLES, len(arr)) + np.ascontiguousarray(arr.T).tobytes()
+
+
+def encode_columns(t, v, i, p):
+    """Encode four equal-length 1-D arrays as one sample block."""
+    cols = np.vstack([np.asarray(c, dtype=_DTYPE) for c in (t, v, i, p)])
+    return _BLOCK_HEAD.pack(BLOCK_SAMPLES, cols.shape[1]) + cols.tobytes()
+
+
+def encode_events(events):
+    """Encode (time, kind, info) tuples as one event block."""
+    payload = json.dumps([list(e) for e in events]).encode("utf-8")
+    return _BLOCK_HEAD.pack(BLOCK_EVENTS, len(payload)) + payload
+
+
+def write_session(path, t, v, i, p, metadata=None, events=()):
+    """Write a whole session in one sample block (plus one event block if any)."""
+    with open(path, "wb") as f:
+        f.write(encode_header(metadata))
+        f.write(encode_columns(t, v, i, p))
+        if events:
+            f.write(encode_events(events))
+
+
+# ---------- Decoding ----------
+def _parse_header(buf):
+    if len(buf) < len(MAGIC) + 1 + _HEADER_LEN.size or bytes(buf[:len(MAGIC)]) != MAGIC:
+        raise SessionFormatError("Not an AX session file")
+    version = buf[len(MAGIC)]
+    if version > VERSION:
+        raise SessionFormatError(f"Unsupported session version {version}")
+    pos = len(MAGIC) + 1
+    (header_len,) = _HEADER_LEN.unpack_from(buf, pos)
+    pos += _HEADER_LEN.size
+    try:
+        metadata = json.loads(bytes(buf[pos:pos + header_len]).decode("utf-8"))
+    except ValueError as e:
+        raise SessionFormatError(f"Corrupt session header: {e}")
+    return metadata, pos + header_len
+
+
+def read_header(path):
+    """Read only the metadata of a session (cheap, used for lazy loading)."""
+    with _open_raw(path) as f:
+        head = f.read(len(MAGIC) + 1 + _HEADER_LEN.size)
+        if len(head) < len(MAGIC) + 1 + _HEADER_LEN.size:
+            raise SessionFormatError("Not an AX session file")
+        (header_len,) = _HEADER_LEN.unpack_from(head, len(MAGIC) + 1)
+        metadata, _ = _parse_header(head + f.read(header_len))
+    return metadata
+
+
+def read_session(path, events=None):
+    """
+    Load a session file.
+    Returns (metadata, columns) where columns maps each name in COLUMNS to
+    a float64 NumPy array. When `events` is a list, the session's events
+    are appended to it as (time, kind, info) tuples.
+    """
+    # read into a bytearray so the returned arrays are writable
+    if path.lower().endswith(".gz"):
+        with _open_raw(path) as f:
+            raw = bytearray(f.read())
+    else:
+        raw = bytearray(os.path.getsize(path))
+        with open(path, "rb") as f:
+            f.readinto(raw)
+    buf = memoryview(raw)
+
+    metadata, pos = _parse_header(buf)
+    ncols = len(COLUMNS)
+    row_bytes = ncols * _DTYPE.itemsize
+    parts = []
+
+    while pos + _BLOCK_HEAD.size <= len(buf):
+        block_type, count = _BLOCK_HEAD.unpack_from(buf, pos)
+        pos += _BLOCK_HEAD.size
+        if block_type == BLOCK_EVENTS:
+            if pos + count > len(buf):
+                print(f"[WARN] Session {path}: truncated event block ignored")
+                break
+            if events is not None:
+                try:
+                    events.extend((t, kind, info) for t, kind, info in json.loads(bytes(buf[pos:pos + count])))
+                except ValueError as e:
+                    print(f"[WARN] Session {path}: corrupt event block ignored ({e})")
+            pos += count
+            continue
+        if block_type != BLOCK_SAMPLES:
+            raise SessionFormatError(f"Unknown block type {block_type}")
+        size = count * row_bytes
+        if pos + size > len(buf):
+            # torn block: a column-major block is only usable if complete
+            print(f"[WARN] Session {path}: truncated last block ignored")
+            break
+        parts.append(np.frombuffer(buf, dtype=_DTYPE, count=count * ncols, offset=pos).reshape(ncols, count))
+        pos += size
+
+    if parts:
+        data = parts[0] if len(parts) == 1 else np.concatenate(parts, axis=1)
+    else:
+        data = np.empty((ncols, 0), dtype=_DTYPE)
+    return metadata, {name: data[k] for k, name in enumerate(COLUMNS)}
+
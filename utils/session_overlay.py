@@ -0,0 +1,89 @@
+# utils/session_overlay.py
+import os
+
+import numpy as np
+
+from utils.history_store import HistoryStore
+from utils.log_reader import iter_log_chunks
+from utils.session_format import is_session_file, read_header
+
+CHANNELS = ("voltage", "current", "power")
+
+
+class OverlaySeries:
+    """
+    A recorded session drawn on top of the live graph.
+
+    The file is not read when the series is created; load() fills the
+    series' own HistoryStore (normally from a worker), so every series is
+    decimated independently and hidden series cost nothing. `offset` (s)
+    shifts the series on the shared time axis; query() and time_span()
+    work in shifted time.
+    """
+
+    def __init__(self, path, offset=0.0):
+        self.path = path
+        self.label = os.path.basename(path)
+        self.offset = offset
+        self.visible = True
+        self.metadata = {}
+        self.store = None
+        self.error = None
+
+        if is_session_file(path):
+            # cheap: only the JSON header is read here
+            try:
+                self.metadata = read_header(path)
+            except Exception as e:
+                print(f"[WARN] Could not read session header of {path}: {e}")
+
+    @property
+    def loaded(self):
+        return self.store is not None
+
+    def load(self, task=None):
+        """Read the whole file into a fresh HistoryStore (worker side)."""
+        store = HistoryStore()
+        for t, v, c, p, fraction in iter_log_chunks(self.path):
+            if task is not None:
+                task.check_cancelled()
+                task.progress(fraction)
+            store.extend(t, v, c, p)
+        return store
+
+    def time_span(self):
+        """(first, last) in shifted time, or None while not loaded / empty."""
+        span = self.store.time_span() if self.store is not None else None
+        if span is None:
+            return None
+        return span[0] + self.offset, span[1] + self.offset
+
+    def query(self, t_min, t_max, max_points):
+        """Decimated (t, v, i, p) of the shifted range [t_min, t_max]."""
+        if self.store is None:
+            return tuple(np.empty((4, 0)))
+        t, v, c, p = self.store.query(t_min - self.offset, t_max - self.offset, max_points)
+        return t + self.offset, v, c, p
+
+    def interp(self, t):
+        """(v, i, p) at shifted times t, interpolated from the raw samples."""
+        return self.store.interp(np.asarray(t, dtype=float) - self.offset)
+
+
+def difference(a, b, channel, t_min, t_max, points):
+    """
+    Channel `channel` (0=V, 1=I, 2=P) of source A minus source B on a
+    uniform grid of `points` times over the overlap of both sources and
+    [t_min, t_max]. Sources are HistoryStore or OverlaySeries objects;
+    both are interpolated from their raw samples, so decimation does not
+    distort the difference.
+    """
+    span_a, span_b = a.time_span(), b.time_span()
+    if span_a is None or span_b is None:
+        return np.empty(0), np.empty(0)
+    lo = max(t_min, span_a[0], span_b[0])
+    hi = min(t_max, span_a[1], span_b[1])
+    if hi <= lo:
+        return np.empty(0), np.empty(0)
+    t = np.linspace(lo, hi, max(2, points))
+    return t, a.interp(t)[channel] - b.interp(t)[channel]
@@ -0,0 +1,174 @@
+# utils/settings_store.py
+import copy
+import json
+import os
+import threading
+
+# settings live next to the package, whatever the working directory is
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# section -> (file name, defaults); the defaults also fix each value's type
+SECTIONS = {
+    "config": ("config.json", {
+        "address": "",
+        "baud_rate": 19200,
+        "timeout": 5000,
+        "parity": "NONE",
+        "stop_bits": 1.0,
+        "data_bits": 8,
+        "simulation_mode": False,
+    }),
+    "presets": ("presets.json", {
+        "voltage_presets": [3.3, 5.0, 9.0, 12.0, 24.0],
+        "current_presets": [0.1, 0.5, 1.0, 2.0, 3.0],
+    }),
+    "protection": ("protection_defaults.json", {
+        "ovp_enabled": True,
+        "ovp_limit": 20.0,
+        "ocp_enabled": True,
+        "ocp_limit": 2.0,
+    }),
+    "scpi_macros": ("scpi_macros.json", {}),
+}
+
+SAVE_DELAY = 0.5  # s; changes within this time are written together
+
+
+def _legacy_paths(file_name):
+    """Where earlier versions kept a settings file (relative to the working directory, or above the package)."""
+    return (
+        os.path.join(os.path.abspath("data"), file_name),
+        os.path.join(os.path.dirname(os.path.dirname(DATA_DIR)), "data", file_name),
+    )
+
+
+def _typed(defaults, data):
+    """Defaults overlaid with `data`, each value coerced to the type of its default."""
+    if not defaults:
+        return dict(data)   # free-form section (e.g. macros)
+    result = copy.deepcopy(defaults)
+    for key, value in data.items():
+        default = defaults.get(key)
+        try:
+            if isinstance(default, bool):
+                value = value if isinstance(value, bool) else str(value).lower() in ("1", "true", "on", "yes")
+            elif isinstance(default, (int, float)):
+                value = type(default)(value)
+            elif isinstance(default, list):
+                value = list(value)
+        except (TypeError, ValueError):
+            print(f"[WARN] Ignoring invalid setting {key}={value!r}")
+            continue
+        result[key] = value
+    return result
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temporary file and rename it over `path`: a crash never leaves half a file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class SettingsStore:
+    """
+    All persistent settings (connection config, presets, protection
+    defaults, SCPI macros) in memory.
+
+    Every section is read once, at construction; files found only at an
+    old location are migrated into DATA_DIR. get() returns copies typed
+    after SECTIONS; update() changes memory at once, notifies the
+    section's subscribers (on the calling thread) and writes the file
+    SAVE_DELAY s later: one atomic write-and-rename per burst of changes.
+    Thread-safe; call flush() before exiting.
+    """
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self._lock = threading.RLock()
+        self._data = {}
+        self._dirty = set()
+        self._subscribers = {}
+        self._timer = None
+        os.makedirs(data_dir, exist_ok=True)
+        for section in SECTIONS:
+            self._data[section] = self._load(section)
+        if self._dirty:
+            self.flush()
+
+    def path(self, section):
+        return os.path.join(self.data_dir, SECTIONS[section][0])
+
+    def _load(self, section):
+        file_name, defaults = SECTIONS[section]
+        path = self.path(section)
+        candidates = [path] + [p for p in _legacy_paths(file_name) if p != path]
+        for candidate in candidates:
+            if not os.path.exists(candidate):
+                continue
+            try:
+                with open(candidate, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[WARN] Could not read {candidate}: {e}")
+                continue
+            if candidate != path:
+                print(f"[INFO] Migrating {candidate} to {path}")
+                self._dirty.add(section)
+            return _typed(defaults, data)
+        self._dirty.add(section)  # write the defaults, so there is a file to edit
+        return copy.deepcopy(defaults)
+
+    # ---------- access ----------
+    def get(self, section, key=None):
+        """A copy of the whole section, or one value of it."""
+        with self._lock:
+            if key is None:
+                return copy.deepcopy(self._data[section])
+            return copy.deepcopy(self._data[section].get(key))
+
+    def update(self, section, values=None, replace=False, **kwargs):
+        """
+        Merge `values` / keyword values into a section (or replace the
+        section's content with `replace`), notify subscribers and
+        schedule the save.
+        """
+        values = dict(values or {}, **kwargs)
+        with self._lock:
+            data = {} if replace else self._data[section]
+            self._data[section] = _typed(SECTIONS[section][1], dict(data, **values))
+            self._dirty.add(section)
+            snapshot = copy.deepcopy(self._data[section])
+            if self._timer is None:
+                self._timer = threading.Timer(SAVE_DELAY, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            subscribers = list(self._subscribers.get(section, ()))
+        for callback in subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"[WARN] Settings subscriber failed: {e}")
+
+    def subscribe(self, section, callback):
+        """callback(section data) after every update() of the section."""
+        with self._lock:
+            self._subscribers.setdefault(section, []).append(callback)
+
+    # ---------- persistence ----------
+    def flush(self):
+        """Write all changed sections now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            dirty, self._dirty = self._dirty, set()
+            for section in dirty:
+                try:
+                    write_json_atomic(self.path(section), self._data[section])
+                except OSError as e:
+                    print(f"[ERROR] Could not save {self.path(section)}: {e}")
+                    self._dirty.add(section)
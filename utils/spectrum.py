@@ -0,0 +1,95 @@
+# utils/spectrum.py
+from collections import OrderedDict
+
+import numpy as np
+
+MIN_SAMPLES = 16
+SEGMENT_LENGTHS = (64, 128, 256, 512, 1024, 2048, 4096)
+
+
+def resample_uniform(t, y):
+    """
+    (dt, y) on a uniform time grid. Polling jitter makes the sample
+    spacing uneven; the FFT needs it constant, so the samples are
+    linearly interpolated at the median spacing.
+    """
+    t = np.asarray(t, dtype=float)
+    y = np.asarray(y, dtype=float)
+    dt = float(np.median(np.diff(t)))
+    if dt <= 0:
+        raise ValueError("Sample times are not increasing")
+    grid = t[0] + dt * np.arange(int((t[-1] - t[0]) / dt) + 1)
+    return dt, np.interp(grid, t, y)
+
+
+def analyze(t, y, nperseg=256):
+    """
+    Ripple and noise figures of one channel over a time window.
+
+    Returns a dict with:
+      fs, samples, mean        - sample rate (Hz), uniform samples, DC level
+      rms_ripple, p2p_ripple   - RMS and peak-to-peak after removing the linear trend
+      dominant_freq            - frequency (Hz) of the largest PSD bin above DC
+      freqs, psd               - Welch PSD (Hann window, 50 % overlap), units^2/Hz
+      spec_times, spectrogram  - segment centre times and per-segment PSD rows
+    Everything is vectorised; call it from a worker for long windows.
+    """
+    if len(t) < MIN_SAMPLES:
+        raise ValueError(f"At least {MIN_SAMPLES} samples are needed, got {len(t)}")
+    dt, y = resample_uniform(t, y)
+    fs = 1.0 / dt
+    n = len(y)
+
+    x = np.arange(n)
+    slope, offset = np.polyfit(x, y, 1)
+    residual = y - (slope * x + offset)
+
+    nperseg = int(min(nperseg, n))
+    step = max(1, nperseg // 2)
+    window = np.hanning(nperseg)
+    segments = np.lib.stride_tricks.sliding_window_view(y, nperseg)[::step]
+    segments = segments - segments.mean(axis=1, keepdims=True)
+    spectra = np.abs(np.fft.rfft(segments * window, axis=1)) ** 2 / (fs * np.sum(window ** 2))
+    # one-sided: double everything except DC (and Nyquist for even lengths)
+    spectra[:, 1:] *= 2
+    if nperseg % 2 == 0:
+        spectra[:, -1] /= 2
+    freqs = np.fft.rfftfreq(nperseg, dt)
+    psd = spectra.mean(axis=0)
+
+    dominant = int(np.argmax(psd[1:])) + 1 if len(psd) > 1 else 0
+    return {
+        "fs": fs,
+        "samples": n,
+        "mean": float(y.mean()),
+        "rms_ripple": float(np.sqrt(np.mean(residual ** 2))),
+        "p2p_ripple": float(np.ptp(residual)),
+        "dominant_freq": float(freqs[dominant]),
+        "freqs": freqs,
+        "psd": psd,
+        "spec_times": float(t[0]) + (np.arange(len(segments)) * step + nperseg / 2) * dt,
+        "spectrogram": spectra,
+    }
+
+
+class SpectrumCache:
+    """Small LRU of analyze() results keyed by (source, channel, window, nperseg)."""
+
+    def __init__(self, size=16):
+        self.size = size
+        self._items = OrderedDict()
+
+    def get(self, key):
+        result = self._items.get(key)
+        if result is not None:
+            self._items.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self._items[key] = result
+        self._items.move_to_end(key)
+        while len(self._items) > self.size:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
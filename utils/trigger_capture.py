@@ -0,0 +1,176 @@
+# utils/trigger_capture.py
+import time
+from collections import deque
+
+import numpy as np
+
+# Trigger conditions:
+#   "level"      - channel crosses `level` on the chosen edge
+#   "slope"      - |d(channel)/dt| reaches `level` (units per second)
+#   "setpoint"   - a setpoint is written (MeasurementManager event)
+#   "protection" - OVP / OCP trips (MeasurementManager event)
+TRIGGER_KINDS = ("level", "slope", "setpoint", "protection")
+EDGES = ("rising", "falling", "either")
+CHANNELS = ("voltage", "current", "power")
+
+# capture states
+IDLE, ARMED, TRIGGERED = "idle", "armed", "triggered"
+
+
+class Capture:
+    """A frozen pre/post-trigger window. Times are seconds relative to the trigger."""
+
+    def __init__(self, t, v, i, p, trigger_time, reason):
+        self.t = t
+        self.v = v
+        self.i = i
+        self.p = p
+        self.trigger_time = trigger_time  # wall-clock time of the trigger
+        self.reason = reason
+
+    def metadata(self):
+        return {
+            "format": "ax6003p-capture",
+            "trigger": self.reason,
+            "trigger_time": self.trigger_time,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.trigger_time)),
+            "samples": len(self.t),
+        }
+
+
+class TriggerCapture:
+    """
+    Oscilloscope-style capture on top of MeasurementManager.
+
+    While armed, measurements are polled every `interval_ms` (the fastest
+    rate the device keeps up with) and kept in a pre-trigger ring buffer of
+    `pre_seconds`. When the trigger condition fires, sampling continues
+    for `post_seconds` and the pre/post window is frozen into a Capture
+    handed to on_capture(). In single mode the capture then stops and the
+    previous polling interval is restored; otherwise it re-arms.
+
+    Create it once per MeasurementManager (it subscribes for good) and
+    change settings with configure() while idle.
+    """
+
+    def __init__(self, mm, on_capture=None, on_state=None):
+        self.mm = mm
+        self.on_capture = on_capture
+        self.on_state = on_state
+
+        self.kind = "level"
+        self.channel = "current"
+        self.level = 0.0
+        self.edge = "rising"
+        self.pre_seconds = 2.0
+        self.post_seconds = 5.0
+        self.interval_ms = 20
+        self.single = True
+
+        self.state = IDLE
+        self._ring = deque()
+        self._post = []
+        self._prev = None           # previous (t, v, i, p) for edges and slopes
+        self._trigger = None        # (wall time, reason) of the pending capture
+        self._saved_interval = None
+
+        mm.subscribe(self._on_sample)
+        mm.subscribe_events(self._on_event)
+
+    def configure(self, **settings):
+        for name, value in settings.items():
+            if not hasattr(self, name) or name.startswith("_"):
+                raise AttributeError(f"Unknown trigger setting: {name}")
+            setattr(self, name, value)
+        if self.kind not in TRIGGER_KINDS:
+            raise ValueError(f"Unknown trigger kind: {self.kind}")
+        if self.edge not in EDGES:
+            raise ValueError(f"Unknown trigger edge: {self.edge}")
+        if self.channel not in CHANNELS:
+            raise ValueError(f"Unknown channel: {self.channel}")
+
+    # ---------- control ----------
+    def arm(self):
+        self._ring = deque(maxlen=max(2, int(self.pre_seconds * 1000 / self.interval_ms) + 1))
+        self._post = []
+        self._prev = None
+        self._trigger = None
+        if self._saved_interval is None:
+            self._saved_interval = self.mm.interval
+            self.mm.set_interval(self.interval_ms)
+        self._set_state(ARMED)
+
+    def stop(self):
+        if self._saved_interval is not None:
+            self.mm.set_interval(self._saved_interval)
+            self._saved_interval = None
+        self._set_state(IDLE)
+
+    def _set_state(self, state):
+        self.state = state
+        if self.on_state:
+            self.on_state(state)
+
+    # ---------- MeasurementManager callbacks ----------
+    def _on_sample(self, v, i, p):
+        if self.state == IDLE:
+            return
+        sample = (time.time(), v, i, p)
+
+        if self.state == ARMED:
+            self._ring.append(sample)
+            reason = self._check(sample)
+            self._prev = sample
+            if reason:
+                self._fire(sample[0], reason)
+            return
+
+        self._post.append(sample)
+        if sample[0] - self._trigger[0] >= self.post_seconds:
+            self._finish()
+
+    def _on_event(self, kind, ts, info):
+        if self.state == ARMED and kind == self.kind:
+            detail = ", ".join(f"{k}={v}" for k, v in info.items())
+            self._fire(ts, f"{kind} ({detail})" if detail else kind)
+
+    def _check(self, sample):
+        """Reason string when a sample-based condition fires, else None."""
+        if self._prev is None or self.kind not in ("level", "slope"):
+            return None
+        k = CHANNELS.index(self.channel) + 1
+        prev, cur = self._prev[k], sample[k]
+
+        if self.kind == "slope":
+            dt = sample[0] - self._prev[0]
+            if dt > 0 and abs(cur - prev) / dt >= self.level:
+                return f"d{self.channel}/dt {(cur - prev) / dt:+.4g}/s"
+            return None
+
+        rising = prev < self.level <= cur
+        falling = prev > self.level >= cur
+        if (self.edge == "rising" and rising) or (self.edge == "falling" and falling) \
+                or (self.edge == "either" and (rising or falling)):
+            return f"{self.channel} {'rising' if rising else 'falling'} through {self.level:g}"
+        return None
+
+    def _fire(self, ts, reason):
+        self._trigger = (ts, reason)
+        self._post = []
+        self._set_state(TRIGGERED)
+        if self.post_seconds <= 0:
+            self._finish()
+
+    def _finish(self):
+        ts, reason = self._trigger
+        # the ring is sized for interval_ms; with a slower device it spans more than pre_seconds
+        samples = [s for s in self._ring if s[0] >= ts - self.pre_seconds] + self._post
+        data = np.array(samples, dtype=float).reshape(-1, 4).T
+        capture = Capture(data[0] - ts, data[1], data[2], data[3], ts, reason)
+
+        if self.single:
+            self.stop()
+        else:
+            self.arm()
+        if self.on_capture:
+            self.on_capture(capture)